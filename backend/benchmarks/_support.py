@@ -0,0 +1,235 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database, so DATABASE_URL has to be
+pointed at it before anything under ``src`` creates the engine.
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+def use_temp_database(name: str = "bench.db", llm_cache: bool = False) -> str:
+    """Point the app at a fresh SQLite file (and LLM response cache) and return its path"""
+    directory = tempfile.mkdtemp(prefix="healthsight-bench-")
+    path = os.path.join(directory, name)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["LLM_CACHE_PATH"] = os.path.join(directory, "llm_cache.db")
+    # Latency benchmarks must reach the (fake) model on every call
+    os.environ["LLM_CACHE_ENABLED"] = "true" if llm_cache else "false"
+    return path
+
+
+@contextmanager
+def timer(results: dict, key: str):
+    """Record elapsed wall time (seconds) of the block into results[key]"""
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def print_table(headers: list, rows: list):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def fake_llm(latency: float = 0.2, response: str = "Synthetic benchmark completion."):
+    """Chat model that answers after a fixed delay, standing in for OpenAI"""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    class SlowFakeChatModel(FakeListChatModel):
+        def _call(self, *args, **kwargs):
+            time.sleep(latency)
+            return super()._call(*args, **kwargs)
+
+    return SlowFakeChatModel(responses=[response])
+
+
+UNITS = ["Cardiology", "Orthopedics", "Pulmonology", "General Medicine", "Oncology", "Neurology"]
+DIAGNOSES = ["Heart Failure", "COPD Exacerbation", "Pneumonia", "Hip Fracture", "Stroke", "Sepsis"]
+INCIDENT_CATEGORIES = ["Falls", "Medication Error", "Pressure Injury", "Infection", "Other"]
+DQ_TYPES = ["Invalid", "Missing", "Duplicate", "Stale"]
+SEVERITIES = ["Low", "Medium", "High"]
+NARRATIVE = (
+    "Admitted with an acute exacerbation of a chronic condition. Multiple comorbidities including diabetes "
+    "and renal insufficiency; medication regimen adjusted during stay. Requires close monitoring, follow-up "
+    "within 7 days and care coordination with primary care to reduce the risk of 30-day readmission."
+)
+
+
+def bulk_seed(episodes: int, incidents: int = 0, issues: int = 0, batch_size: int = 50_000, seed: int = 42):
+    """Fill the benchmark database with random rows using plain executemany batches"""
+    from datetime import datetime, timedelta
+    import numpy as np
+    from src.db import engine, init_db
+    from src.utils.risk import risk_level_for_score
+
+    init_db()
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+
+    def dates(n, max_days):
+        return [now - timedelta(seconds=int(s)) for s in rng.integers(0, max_days * 86400, n)]
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        for start in range(0, episodes, batch_size):
+            n = min(batch_size, episodes - start)
+            admit = dates(n, 180)
+            los = np.round(rng.uniform(1, 15, n), 1)
+            discharged = rng.random(n) > 0.2
+            rows = [
+                (
+                    f"EP{start + i + 1:06d}", f"P{start + i + 1:05d}", "Bench Patient",
+                    UNITS[u], admit[i],
+                    admit[i] + timedelta(days=int(los[i])) if discharged[i] else None,
+                    float(los[i]) if discharged[i] else None,
+                    DIAGNOSES[d], bool(r), float(s), risk_level_for_score(s), NARRATIVE, NARRATIVE, NARRATIVE,
+                )
+                for i, (u, d, r, s) in enumerate(zip(
+                    rng.integers(0, len(UNITS), n), rng.integers(0, len(DIAGNOSES), n),
+                    rng.random(n) < 0.15, np.round(rng.uniform(0.1, 0.95, n), 3),
+                ))
+            ]
+            cur.executemany(
+                "INSERT INTO patient_episodes (episode_id, patient_id, patient_name, unit, admit_date, "
+                "discharge_date, length_of_stay, primary_diagnosis, readmitted_30d, readmission_risk_score, risk_level, "
+                "summary, risk_explanation, next_best_action) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        for start in range(0, incidents, batch_size):
+            n = min(batch_size, incidents - start)
+            when = dates(n, 60)
+            cur.executemany(
+                "INSERT INTO safety_incidents (incident_id, date, unit, category, severity, status, description) "
+                "VALUES (?, ?, ?, ?, ?, 'Active', 'Benchmark incident')",
+                [
+                    (f"SI{start + i + 1:06d}", when[i], UNITS[u], INCIDENT_CATEGORIES[c], SEVERITIES[v])
+                    for i, (u, c, v) in enumerate(zip(
+                        rng.integers(0, len(UNITS), n), rng.integers(0, len(INCIDENT_CATEGORIES), n),
+                        rng.integers(0, len(SEVERITIES), n),
+                    ))
+                ],
+            )
+        for start in range(0, issues, batch_size):
+            n = min(batch_size, issues - start)
+            when = dates(n, 120)
+            cur.executemany(
+                "INSERT INTO data_quality_issues (record_type, record_id, unit, issue_type, field, severity, "
+                "description, last_updated) VALUES ('episode', ?, ?, ?, 'LOS', ?, 'Benchmark issue', ?)",
+                [
+                    (f"EP{int(r):06d}", UNITS[u], DQ_TYPES[t], SEVERITIES[v], when[i])
+                    for i, (r, u, t, v) in enumerate(zip(
+                        rng.integers(1, max(episodes, 1) + 1, n), rng.integers(0, len(UNITS), n),
+                        rng.integers(0, len(DQ_TYPES), n), rng.integers(0, len(SEVERITIES), n),
+                    ))
+                ],
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+    from src.analytics.rollups import rebuild_rollups
+    rebuild_rollups()
+
+
+@contextmanager
+def count_queries(engine, results: dict, key: str):
+    """Record how many SQL statements the block sends into results[key]"""
+    from sqlalchemy import event
+
+    counter = {"n": 0}
+
+    def on_execute(*_args):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        results[key] = counter["n"]
+
+
+def start_mock_openai(latency: float = 0.0, response: str = "Synthetic benchmark completion.", token_latency: float = 0.0) -> dict:
+    """
+    Serve a minimal OpenAI-compatible /v1/chat/completions endpoint on localhost.
+
+    Streaming requests get the first word after ``latency`` seconds and each
+    further word ``token_latency`` later, as chunked SSE like the real API.
+    Non-streaming requests get the whole response once the last word would
+    have been produced.
+
+    Returns a dict with the server's ``base_url`` and a ``connections`` set of
+    client (host, port) pairs seen, which counts the TCP connections opened.
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    connections = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            connections.add(self.client_address)
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(latency)
+            if request.get("stream"):
+                try:
+                    self._stream()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client went away mid-stream
+                return
+            time.sleep(token_latency * (len(response.split(" ")) - 1))
+            body = json.dumps({
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "benchmark",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": response}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            words = response.split(" ")
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(token_latency)
+                chunk = {
+                    "id": "chatcmpl-benchmark",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": "benchmark",
+                    "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def _write_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return {"base_url": f"http://127.0.0.1:{server.server_port}/v1", "connections": connections, "server": server}
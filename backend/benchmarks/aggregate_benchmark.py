@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare the per-KPI count queries with the single-pass aggregation layer.
+
+Usage (from the backend directory):
+    python -m benchmarks.aggregate_benchmark --episodes 1000000
+
+Times one dashboard render (/overview-metrics, /risk-distribution and
+/quality/incidents/summary) both ways and reports SQL round trips. The
+aggregation layer computes each table's KPIs in one query and every panel is
+built from those results, so a render takes three round trips.
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from ._support import use_temp_database, bulk_seed, count_queries, timer, print_table
+
+use_temp_database()
+
+from sqlalchemy import func, and_, or_  # noqa: E402
+
+from src.db import SessionLocal, engine  # noqa: E402
+from src.models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue  # noqa: E402
+from src.analytics.kpis import episode_kpis, incident_kpis, data_quality_kpis  # noqa: E402
+
+
+def legacy_render(db):
+    """The query pattern the three endpoints used before the aggregation layer"""
+    since = datetime.now() - timedelta(days=30)
+    score = PatientEpisode.readmission_risk_score
+    # /overview-metrics
+    db.query(PatientEpisode).filter(PatientEpisode.discharge_date.isnot(None)).count()
+    db.query(PatientEpisode).filter(and_(PatientEpisode.discharge_date.isnot(None), PatientEpisode.readmitted_30d == True)).count()
+    db.query(func.avg(PatientEpisode.length_of_stay)).filter(PatientEpisode.length_of_stay.isnot(None)).scalar()
+    db.query(SafetyIncident).filter(SafetyIncident.date >= since).count()
+    db.query(DataQualityIssue).count()
+    db.query(DataQualityIssue).filter(DataQualityIssue.severity == "High").count()
+    # /risk-distribution
+    db.query(PatientEpisode).count()
+    db.query(PatientEpisode).filter(score >= 0.7).count()
+    db.query(PatientEpisode).filter(and_(score >= 0.4, score < 0.7)).count()
+    db.query(PatientEpisode).filter(or_(score < 0.4, score.is_(None))).count()
+    # /quality/incidents/summary
+    db.query(SafetyIncident).filter(and_(SafetyIncident.category == "Falls", SafetyIncident.date >= since)).count()
+    db.query(SafetyIncident).filter(and_(SafetyIncident.category == "Medication Error", SafetyIncident.date >= since)).count()
+    db.query(SafetyIncident).filter(SafetyIncident.date >= since).count()
+    db.query(SafetyIncident.category, func.count(SafetyIncident.id)).filter(SafetyIncident.date >= since).group_by(SafetyIncident.category).all()
+
+
+def aggregated_render(db):
+    """One query per table; the three panels are formatted from the shared results, as /pages/overview does"""
+    episodes = episode_kpis(db)  # /overview-metrics cards and /risk-distribution
+    incidents = incident_kpis(db)  # /overview-metrics card and /quality/incidents/summary
+    dq = data_quality_kpis(db)  # /overview-metrics cards
+    return episodes, incidents, dq
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Seeding {args.episodes:,} episodes...")
+    bulk_seed(args.episodes, incidents=args.episodes // 5, issues=args.episodes // 3)
+
+    rows = []
+    db = SessionLocal()
+    try:
+        for name, render in (("per-KPI counts", legacy_render), ("single-pass aggregates", aggregated_render)):
+            results = {}
+            render(db)  # warm the page cache
+            with count_queries(engine, results, "queries"), timer(results, "seconds"):
+                for _ in range(args.repeat):
+                    render(db)
+            rows.append([
+                name,
+                results["queries"] // args.repeat,
+                f"{results['seconds'] / args.repeat * 1000:.0f}",
+            ])
+    finally:
+        db.close()
+    print_table(["strategy", "round trips", "ms per render"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Compare the SQL rollup and in-memory columnar engines behind the dashboard aggregates.
+
+Usage (from the backend directory):
+    python -m benchmarks.analytics_engine_benchmark --episodes 10000000
+
+Generates the dataset with src.etl.synthetic_bulk, then times one render of
+the aggregate endpoints (/overview-metrics, /risk-distribution,
+/health-trends, /data-quality/metrics and /quality/incidents/summary) with
+each engine. The column store's one-off build time is reported separately.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from ._support import use_temp_database, timer, print_table
+
+use_temp_database()
+
+from src.db import SessionLocal, init_db  # noqa: E402
+from src.analytics import kpis, columnar  # noqa: E402
+from src.etl.synthetic_bulk import iter_chunks, load_database  # noqa: E402
+
+
+def render(engine, db):
+    since = datetime.now() - timedelta(days=180)
+    # /overview-metrics
+    engine.episode_kpis(db)
+    engine.incident_kpis(db)
+    engine.data_quality_kpis(db)
+    # /risk-distribution
+    engine.episode_kpis(db)
+    # /health-trends
+    engine.monthly_trends(db, since)
+    # /data-quality/metrics
+    engine.data_quality_kpis(db)
+    # /quality/incidents/summary
+    engine.incident_kpis(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    print(f"Generating {args.episodes:,} episodes...")
+    start = time.perf_counter()
+    load_database(iter_chunks(args.episodes, seed=42))
+    print(f"  {time.perf_counter() - start:.0f}s")
+
+    db = SessionLocal()
+    rows = []
+    try:
+        render(columnar, db)  # build the column store
+        rows.append(["columnar build", f"{columnar.column_store.last_build_seconds * 1000:.0f}"])
+        for name, engine in (("sql (rollups)", kpis), ("columnar", columnar)):
+            results = {}
+            render(engine, db)  # warm the page cache
+            with timer(results, "seconds"):
+                for _ in range(args.repeat):
+                    render(engine, db)
+            rows.append([name, f"{results['seconds'] / args.repeat * 1000:.1f}"])
+    finally:
+        db.close()
+    print_table(["engine", "ms per render"], rows)
+
+
+if __name__ == "__main__":
+    main()
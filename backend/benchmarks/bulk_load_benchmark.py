@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Compare episode ingest throughput of the ORM path and the bulk loader.
+
+Usage (from the backend directory):
+    python -m benchmarks.bulk_load_benchmark --rows 100000
+
+Writes a synthetic CSV discharge extract, then loads it twice into an empty
+table: once the way seed_database does (PatientEpisode objects, add_all,
+commit, with the rollup flush listeners) and once with
+src.etl.bulk_load.bulk_load (pandas transforms + Core executemany batches).
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ._support import use_temp_database, print_table, UNITS, DIAGNOSES
+
+use_temp_database()
+
+from sqlalchemy import delete  # noqa: E402
+
+from src.analytics.rollups import rebuild_rollups  # noqa: E402
+from src.db import SessionLocal, engine, init_db  # noqa: E402
+from src.etl import bulk_load  # noqa: E402
+from src.models.db_models import PatientEpisode  # noqa: E402
+
+COLUMNS = [
+    "episode_id", "patient_id", "patient_name", "unit", "admit_date", "discharge_date",
+    "length_of_stay", "primary_diagnosis", "readmitted_30d", "readmission_risk_score",
+]
+
+
+def write_extract(path: str, rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    admit_offsets = rng.integers(0, 180 * 86400, rows)
+    los = np.round(rng.uniform(1, 15, rows), 1)
+    discharged = rng.random(rows) > 0.2
+    units = rng.choice(UNITS, rows)
+    diagnoses = rng.choice(DIAGNOSES, rows)
+    readmitted = rng.random(rows) < 0.15
+    scores = np.round(rng.uniform(0.1, 0.95, rows), 3)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            admit = now - timedelta(seconds=int(admit_offsets[i]))
+            writer.writerow([
+                f"EP{i + 1:08d}", f"P{i + 1:07d}", f"Patient {i + 1}", units[i],
+                admit.isoformat(sep=" "),
+                (admit + timedelta(days=int(los[i]))).isoformat(sep=" ") if discharged[i] else "",
+                los[i] if discharged[i] else "",
+                diagnoses[i], int(readmitted[i]), scores[i],
+            ])
+
+
+def empty_episodes():
+    with engine.begin() as conn:
+        conn.execute(delete(PatientEpisode))
+        rebuild_rollups(conn)
+
+
+def orm_load(path: str):
+    def parse(value):
+        return datetime.fromisoformat(value) if value else None
+
+    db = SessionLocal()
+    with open(path, newline="") as f:
+        episodes = [
+            PatientEpisode(
+                episode_id=row["episode_id"],
+                patient_id=row["patient_id"],
+                patient_name=row["patient_name"],
+                unit=row["unit"],
+                admit_date=parse(row["admit_date"]),
+                discharge_date=parse(row["discharge_date"]),
+                length_of_stay=float(row["length_of_stay"]) if row["length_of_stay"] else None,
+                primary_diagnosis=row["primary_diagnosis"],
+                readmitted_30d=row["readmitted_30d"] == "1",
+                readmission_risk_score=float(row["readmission_risk_score"]),
+            )
+            for row in csv.DictReader(f)
+        ]
+    db.add_all(episodes)
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=bulk_load.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="healthsight-bulk-")
+    path = os.path.join(directory, "episodes.csv")
+    write_extract(path, args.rows)
+
+    init_db()
+    rows = []
+    start = time.perf_counter()
+    orm_load(path)
+    elapsed = time.perf_counter() - start
+    rows.append(["ORM add_all", args.rows, f"{elapsed:.2f}", f"{args.rows / elapsed:,.0f}"])
+
+    empty_episodes()
+    stats = bulk_load.bulk_load("episodes", path, args.batch_size)
+    rows.append(["bulk_load", stats["inserted"], f"{stats['seconds']:.2f}", f"{stats['inserted'] / stats['seconds']:,.0f}"])
+
+    print_table(["path", "rows", "seconds", "rows/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Measure response compression: wire size and CPU cost per encoding and level.
+
+Usage (from the backend directory):
+    python -m benchmarks.compression_benchmark --episodes 50000 --limit 1000
+
+Fetches the largest endpoints uncompressed, then compresses each body with
+gzip and (when the brotli package is installed) Brotli at several levels,
+reporting compressed bytes, ratio and CPU milliseconds per response. A final
+table shows the bytes on the wire and latency through the app with the
+configured levels, for Accept-Encoding identity, gzip and br.
+"""
+import argparse
+import asyncio
+import time
+
+from ._support import use_temp_database, bulk_seed, print_table
+
+use_temp_database()
+
+import httpx  # noqa: E402
+
+from src.api.main import app  # noqa: E402
+from src.api.compression import ENCODINGS, compress  # noqa: E402
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 9, 11]}
+
+
+def cpu_ms(body: bytes, encoding: str, level: int, repeat: int) -> tuple:
+    start = time.process_time()
+    for _ in range(repeat):
+        compressed = compress(body, encoding, level)
+    return len(compressed), (time.process_time() - start) / repeat * 1000
+
+
+async def fetch(client, path, params, encoding):
+    start = time.perf_counter()
+    response = await client.get(path, params=params, headers={"Accept-Encoding": encoding})
+    response.raise_for_status()
+    return response, (time.perf_counter() - start) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bulk_seed(args.episodes, incidents=args.episodes // 5, issues=args.episodes // 5)
+    cases = [
+        ("/readmissions/list", {"limit": args.limit, "fields": "*"}),
+        ("/quality/incidents", {}),
+        ("/data-quality/issues", {}),
+        ("/pages/data-quality", {}),
+    ]
+
+    level_rows, wire_rows = [], []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for path, params in cases:
+            response, _ = await fetch(client, path, params, "identity")
+            body = response.content
+            for encoding in ENCODINGS:
+                for level in LEVELS[encoding]:
+                    size, ms = cpu_ms(body, encoding, level, args.repeat)
+                    level_rows.append([
+                        path, f"{encoding} {level}", f"{len(body):,}", f"{size:,}",
+                        f"{len(body) / size:.1f}x", f"{ms:.2f}",
+                    ])
+
+            for encoding in ("identity", *ENCODINGS):
+                # First request fills the response cache for the cached endpoints
+                await fetch(client, path, params, encoding)
+                latencies = []
+                for _ in range(args.repeat):
+                    response, ms = await fetch(client, path, params, encoding)
+                    latencies.append(ms)
+                wire_rows.append([
+                    path, encoding, response.headers.get("content-encoding", "-"),
+                    f"{response.num_bytes_downloaded:,}", f"{min(latencies):.1f}",
+                ])
+
+    print_table(["endpoint", "encoding", "bytes", "compressed", "ratio", "CPU ms"], level_rows)
+    print()
+    print_table(["endpoint", "accept-encoding", "content-encoding", "wire bytes", "ms"], wire_rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Compare SQLite connection profiles under concurrent dashboard reads and write-backs.
+
+Usage (from the backend directory):
+    python -m benchmarks.db_concurrency_benchmark --episodes 100000 --readers 8 --writers 2 --seconds 10
+
+For each profile, reader threads run the episode list query and the episode
+KPIs while writer threads commit AI insight write-backs to random episodes,
+one per transaction, like the insight jobs do. Reports throughput, read and
+write latency percentiles, and "database is locked" errors.
+
+Profiles: "rollback" is the previous configuration (rollback journal,
+synchronous=FULL, pysqlite's 5 s lock timeout); "wal" is SQLITE_PRAGMAS from
+src/db.py. Both use the configured pool.
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from ._support import use_temp_database, bulk_seed, print_table, UNITS
+
+use_temp_database()
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.db import SQLITE_PRAGMAS, create_db_engine  # noqa: E402
+from src.models.db_models import PatientEpisode  # noqa: E402
+from src.analytics import kpis  # noqa: E402
+from src.llm.jobs import apply_insights  # noqa: E402
+
+PROFILES = {
+    "rollback": {"journal_mode": "DELETE", "synchronous": "FULL", "busy_timeout": 5000},
+    "wal": SQLITE_PRAGMAS,
+}
+
+
+def read(db):
+    db.query(PatientEpisode.episode_id, PatientEpisode.risk_level).filter(
+        PatientEpisode.unit == random.choice(UNITS)
+    ).order_by(PatientEpisode.readmission_risk_score.desc()).limit(100).all()
+    kpis.episode_kpis(db)
+
+
+def write(db, episodes: int):
+    episode = db.query(PatientEpisode).filter(PatientEpisode.id == random.randint(1, episodes)).one()
+    apply_insights(episode, {"summary": "Benchmark summary.", "recommendations": "Benchmark recommendation."})
+    db.commit()
+
+
+def worker(Session, op, deadline, latencies, errors, lock):
+    db = Session()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                op(db)
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    errors.append(1)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else 0.0
+
+
+def run(profile: str, args) -> list:
+    engine = create_db_engine(settings.DATABASE_URL, PROFILES[profile])
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    reads, writes, read_errors, write_errors = [], [], [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(Session, read, deadline, reads, read_errors, lock))
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(target=worker, args=(Session, lambda db: write(db, args.episodes), deadline, writes, write_errors, lock))
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    return [
+        profile,
+        f"{len(reads) / args.seconds:,.0f}", f"{percentile(reads, 50):.1f}", f"{percentile(reads, 95):.1f}",
+        f"{len(writes) / args.seconds:,.0f}", f"{percentile(writes, 50):.1f}", f"{percentile(writes, 95):.1f}",
+        len(read_errors) + len(write_errors),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    args = parser.parse_args()
+
+    bulk_seed(args.episodes)
+    # The app engine holds pooled connections that would keep the journal mode from changing
+    from src.db import engine
+    engine.dispose()
+
+    rows = [run(profile, args) for profile in args.profiles]
+    print_table(
+        ["profile", "reads/s", "read p50 ms", "read p95 ms", "writes/s", "write p50 ms", "write p95 ms", "locked errors"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
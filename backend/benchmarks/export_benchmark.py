@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Check that the streaming exports run in flat memory.
+
+Usage (from the backend directory):
+    python -m benchmarks.export_benchmark --rows 100000 400000 --formats ndjson csv arrow
+
+Seeds a throwaway database with the largest row count, then drains
+/export/episodes for each row count and format (limiting rows with the
+admitted_from filter) and reports bytes, throughput and the peak Python heap
+while streaming (tracemalloc). Flat memory means the peak stays the same as
+the row count grows.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from ._support import use_temp_database, bulk_seed, print_table
+
+use_temp_database()
+
+from sqlalchemy import func  # noqa: E402
+
+from src.db import SessionLocal  # noqa: E402
+from src.models.db_models import PatientEpisode  # noqa: E402
+from src.api.main import export_episodes  # noqa: E402
+
+
+def admitted_from_for(db, rows: int) -> date:
+    """Admission date cut-off that leaves roughly the newest `rows` episodes"""
+    offset = max(db.query(func.count(PatientEpisode.id)).scalar() - rows, 0)
+    day = db.query(PatientEpisode.admit_date).order_by(PatientEpisode.admit_date).offset(offset).limit(1).scalar()
+    return day.date() if day else date.today() - timedelta(days=365)
+
+
+def drain(fmt: str, admitted_from: date) -> tuple:
+    db = SessionLocal()
+    try:
+        response = export_episodes(
+            format=fmt, unit=None, risk_level=None, diagnosis=None,
+            admitted_from=admitted_from, admitted_to=None, fields=None, db=db,
+        )
+    finally:
+        db.close()
+
+    async def consume() -> int:
+        # Starlette wraps the sync generators in an async iterator run on its threadpool
+        size = 0
+        async for chunk in response.body_iterator:
+            size += len(chunk)
+        return size
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = asyncio.run(consume())
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000])
+    parser.add_argument("--formats", nargs="+", default=["ndjson", "csv", "arrow"])
+    args = parser.parse_args()
+
+    bulk_seed(max(args.rows))
+    table = []
+    for rows in args.rows:
+        db = SessionLocal()
+        try:
+            admitted_from = admitted_from_for(db, rows)
+            exported = db.query(func.count(PatientEpisode.id)).filter(PatientEpisode.admit_date >= admitted_from).scalar()
+        finally:
+            db.close()
+        for fmt in args.formats:
+            size, seconds, peak = drain(fmt, admitted_from)
+            table.append([
+                fmt, f"{exported:,}", f"{size / 1e6:.1f}", f"{exported / seconds:,.0f}", f"{peak / 1e6:.1f}",
+            ])
+    print_table(["format", "rows", "MB", "rows/s", "peak heap MB"], table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Compare list payloads with and without the clinical narrative columns.
+
+Usage (from the backend directory):
+    python -m benchmarks.fields_benchmark --episodes 50000 --limit 1000
+
+Requests each list endpoint with its default (sparse) projection and with
+fields=* and reports response bytes and latency.
+"""
+import argparse
+import asyncio
+import time
+
+from ._support import use_temp_database, bulk_seed, print_table
+
+use_temp_database()
+
+import httpx  # noqa: E402
+
+from src.api.main import app  # noqa: E402
+
+
+async def measure(client, path, params, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+    return len(response.content), (time.perf_counter() - start) / repeat * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bulk_seed(args.episodes, incidents=args.episodes // 5)
+    cases = [
+        ("/readmissions/list", {"limit": args.limit}),
+        ("/readmissions/high-risk", {}),
+        ("/quality/incidents", {"fields": "id,date,category,severity,unit,status"}),
+    ]
+    rows = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for path, params in cases:
+            full_bytes, full_ms = await measure(client, path, {**params, "fields": "*"}, args.repeat)
+            sparse_bytes, sparse_ms = await measure(client, path, params, args.repeat)
+            rows.append([
+                path, f"{full_bytes:,}", f"{sparse_bytes:,}", f"{full_ms:.1f}", f"{sparse_ms:.1f}",
+            ])
+    print_table(["endpoint", "bytes (all)", "bytes (sparse)", "ms (all)", "ms (sparse)"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
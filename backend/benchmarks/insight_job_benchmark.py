@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Run a cohort insight job against a stub LLM, crash it midway and resume it.
+
+Usage (from the backend directory):
+    python -m benchmarks.insight_job_benchmark --latency 0.05 --failure-rate 0.1
+
+The stub generators sleep for the given latency and fail transiently at the
+given rate, so retries with backoff are exercised. The first run is aborted
+after a few batches (simulating a crash); the second run resumes from the
+last committed checkpoint and must finish the cohort without redoing work.
+"""
+import argparse
+import contextlib
+import io
+import random
+import threading
+import time
+
+from ._support import use_temp_database, print_table
+
+use_temp_database()
+
+from src.config import settings  # noqa: E402
+from src.db import SessionLocal, init_db  # noqa: E402
+from src.etl.load_data import seed_database  # noqa: E402
+from src.llm import jobs  # noqa: E402
+from src.models.db_models import InsightJob, PatientEpisode  # noqa: E402
+
+
+class SimulatedCrash(BaseException):
+    """Escapes every handler, like the process dying, leaving the job "running" """
+
+
+def stub_generators(latency: float, failure_rate: float, calls: dict, crash_after: int = None):
+    lock = threading.Lock()
+
+    def make(field):
+        def generate(episode):
+            with lock:
+                calls[field] = calls.get(field, 0) + 1
+                total_calls = sum(calls.values())
+            if crash_after is not None and total_calls > crash_after:
+                raise SimulatedCrash()
+            time.sleep(latency)
+            if random.random() < failure_rate:
+                raise RuntimeError("transient upstream error")
+            return f"stub {field} for {episode.episode_id}"
+        return generate
+
+    return {field: make(field) for field in jobs.DEFAULT_GENERATORS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--risk-level", default="High")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--crash-after", type=int, default=120, help="LLM calls before the simulated crash")
+    args = parser.parse_args()
+
+    settings.INSIGHT_JOB_RETRY_BACKOFF_SECONDS = 0.01
+    settings.INSIGHT_JOB_RATE_LIMIT_PER_SECOND = 200
+    random.seed(7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+        seed_database()
+
+    db = SessionLocal()
+    job = jobs.create_job(db, risk_level=args.risk_level, missing_only=True)
+    job_id = job.id
+    db.close()
+
+    rows = []
+    for run, crash_after in (("first run (crashes)", args.crash_after), ("resumed run", None)):
+        calls = {}
+        start = time.perf_counter()
+        try:
+            jobs.run_job(job_id, stub_generators(args.latency, args.failure_rate, calls, crash_after))
+        except SimulatedCrash:
+            pass
+        elapsed = time.perf_counter() - start
+
+        db = SessionLocal()
+        job = db.get(InsightJob, job_id)
+        rows.append([run, job.status, f"{job.processed}/{job.total}", job.failed, sum(calls.values()), f"{elapsed:.2f}"])
+        db.close()
+
+    db = SessionLocal()
+    remaining = db.query(PatientEpisode).filter(
+        PatientEpisode.risk_level == args.risk_level, PatientEpisode.ai_generated_at.is_(None)
+    ).count()
+    db.close()
+    print_table(["run", "status", "processed", "failed", "llm calls", "seconds"], rows)
+    print(f"{args.risk_level}-risk episodes still without AI content: {remaining}")
+
+
+if __name__ == "__main__":
+    main()
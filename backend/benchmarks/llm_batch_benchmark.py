@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare LLM request count and prompt size of per-episode and multi-episode prompts.
+
+Usage (from the backend directory):
+    python -m benchmarks.llm_batch_benchmark --risk-level High --prompt-batch-sizes 1 5 10
+
+Runs a cohort insight job per prompt batch size against a fake chat model
+that counts requests and prompt tokens (~4 characters each). The fake model
+answers batch prompts with a JSON array and drops one in --malformed-every
+items, so the per-episode fallback is exercised too.
+"""
+import argparse
+import contextlib
+import io
+import json
+import re
+import threading
+
+from ._support import use_temp_database, print_table
+
+use_temp_database()
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.db import SessionLocal, init_db  # noqa: E402
+from src.etl.load_data import seed_database  # noqa: E402
+from src.llm import jobs, batch, summary, risk_explanation, recommendations  # noqa: E402
+from src.models.db_models import InsightJob, PatientEpisode  # noqa: E402
+
+EPISODE_HEADER = re.compile(r"^### Episode (\S+)$", re.MULTILINE)
+
+
+class CountingChatModel(FakeListChatModel):
+    """Answers single-episode prompts with text and batch prompts with JSON"""
+
+    malformed_every: int = 0
+    stats: dict = {}
+
+    def _call(self, messages, *args, **kwargs):
+        prompt = "\n".join(m.content for m in messages)
+        with _lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += len(prompt) // 4
+            episode_ids = EPISODE_HEADER.findall(prompt)
+            items = []
+            for episode_id in episode_ids:
+                self.stats["items"] += 1
+                if self.malformed_every and self.stats["items"] % self.malformed_every == 0:
+                    items.append({"episode_id": episode_id, "summary": "missing the other fields"})
+                    continue
+                items.append({field: f"{field} for {episode_id}" for field in batch.INSIGHT_FIELDS} | {"episode_id": episode_id})
+        return json.dumps(items) if episode_ids else "Generated insight text."
+
+
+_lock = threading.Lock()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--risk-level", default="High")
+    parser.add_argument("--prompt-batch-sizes", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--malformed-every", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.INSIGHT_JOB_RATE_LIMIT_PER_SECOND = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+        seed_database()
+
+    rows = []
+    for prompt_batch_size in args.prompt_batch_sizes:
+        stats = {"requests": 0, "prompt_tokens": 0, "items": 0}
+        llm = CountingChatModel(responses=[""], malformed_every=args.malformed_every, stats=stats)
+        for module in (batch, summary, risk_explanation, recommendations):
+            module.get_llm = lambda llm=llm: llm
+        settings.INSIGHT_JOB_PROMPT_BATCH_SIZE = prompt_batch_size
+
+        db = SessionLocal()
+        db.query(PatientEpisode).update({PatientEpisode.ai_generated_at: None})
+        db.commit()
+        job_id = jobs.create_job(db, risk_level=args.risk_level, missing_only=True).id
+        db.close()
+
+        jobs.run_job(job_id)
+
+        db = SessionLocal()
+        job = db.get(InsightJob, job_id)
+        rows.append([
+            prompt_batch_size,
+            f"{job.processed}/{job.total}",
+            stats["requests"],
+            f"{stats['requests'] / job.total:.2f}",
+            stats["prompt_tokens"],
+            f"{stats['prompt_tokens'] / job.total:.0f}",
+        ])
+        db.close()
+
+    print_table(["episodes/prompt", "processed", "requests", "requests/episode", "prompt tokens", "prompt tokens/episode"], rows)
+
+
+if __name__ == "__main__":
+    main()
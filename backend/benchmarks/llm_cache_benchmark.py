@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Show what the LLM response cache saves when insights are regenerated.
+
+Usage (from the backend directory):
+    python -m benchmarks.llm_cache_benchmark --episodes 50 --latency 0.2
+
+Generates summaries for a cohort against a fake chat model with fixed
+latency, then regenerates them unchanged (every call is a cache hit), then
+regenerates after editing one episode (only that episode misses).
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from ._support import use_temp_database, fake_llm, print_table
+
+use_temp_database(llm_cache=True)
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from src.db import SessionLocal, init_db  # noqa: E402
+from src.etl.load_data import seed_database  # noqa: E402
+from src.llm import summary  # noqa: E402
+from src.llm.response_cache import llm_response_cache  # noqa: E402
+from src.models.db_models import PatientEpisode  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+        seed_database()
+    llm = fake_llm(args.latency)
+    summary.get_llm = lambda: llm
+
+    db = SessionLocal()
+    episodes = db.query(PatientEpisode).order_by(PatientEpisode.id).limit(args.episodes).all()
+
+    rows = []
+    for run in ("cold", "warm", "one episode edited"):
+        if run == "one episode edited":
+            episodes[0].length_of_stay = (episodes[0].length_of_stay or 0) + 1
+        before = llm_response_cache.stats()
+        start = time.perf_counter()
+        for episode in episodes:
+            summary.generate_episode_summary(episode, use_fallback=False)
+        elapsed = time.perf_counter() - start
+        after = llm_response_cache.stats()
+        rows.append([
+            run,
+            after["hits"] - before["hits"],
+            after["misses"] - before["misses"],
+            after["savedPromptTokens"] + after["savedCompletionTokens"],
+            f"{elapsed:.2f}",
+        ])
+    db.close()
+
+    print_table(["run", "hits", "misses", "tokens saved (cumulative)", "seconds"], rows)
+
+
+if __name__ == "__main__":
+    main()
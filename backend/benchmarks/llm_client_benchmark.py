@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Measure per-call LLM overhead with a fresh client per call vs the shared pooled client.
+
+Usage (from the backend directory):
+    python -m benchmarks.llm_client_benchmark --calls 200 --threads 8
+
+Completions come from a local mock OpenAI-compatible server with no added
+latency, so the timings are pure client overhead: building the ChatOpenAI
+instance and prompt, and opening a new connection vs reusing a keep-alive
+one. Real OpenAI traffic also pays a TLS handshake per new connection, so
+the savings there are larger than shown here.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ._support import use_temp_database, start_mock_openai, print_table
+
+use_temp_database()
+mock = start_mock_openai()
+os.environ["OPENAI_API_KEY"] = "benchmark"
+os.environ["OPENAI_BASE_URL"] = mock["base_url"]
+
+import httpx  # noqa: E402
+import openai  # noqa: E402
+from langchain.prompts import ChatPromptTemplate  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.llm import llm_utils, summary  # noqa: E402
+
+INPUTS = {"context": "Patient Information:\n- Unit: Cardiology\n- Primary Diagnosis: Heart Failure\n"}
+
+
+def per_call_client():
+    """What every generation did before: new model, new HTTP client, new prompt and chain"""
+    params = {"api_key": settings.OPENAI_API_KEY, "base_url": settings.OPENAI_BASE_URL}
+    llm = ChatOpenAI(
+        model_name=settings.OPENAI_MODEL,
+        openai_api_key=settings.OPENAI_API_KEY,
+        client=openai.OpenAI(http_client=httpx.Client(), **params).chat.completions,
+        async_client=openai.AsyncOpenAI(http_client=httpx.AsyncClient(), **params).chat.completions,
+    )
+    prompt = ChatPromptTemplate.from_messages(summary._build_prompt().messages)
+    return (prompt | llm).invoke(INPUTS).content
+
+
+def shared_client():
+    return (summary._build_prompt() | llm_utils.get_llm()).invoke(INPUTS).content
+
+
+def run(call, calls: int, threads: int) -> tuple:
+    mock["connections"].clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: call(), range(calls)))
+    elapsed = time.perf_counter() - start
+    return elapsed, len(mock["connections"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    shared_client()  # build the shared client outside the timings
+    rows = []
+    for threads in args.threads:
+        for name, call in (("client per call", per_call_client), ("shared pooled client", shared_client)):
+            elapsed, connections = run(call, args.calls, threads)
+            rows.append([name, threads, f"{elapsed / args.calls * 1000:.2f}", f"{args.calls / elapsed:.0f}", connections])
+    print_table(["mode", "threads", "ms/call", "calls/s", "connections"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Show that /llm/generate-all takes about as long as its slowest generation.
+
+Usage (from the backend directory):
+    python -m benchmarks.llm_fanout_benchmark --latencies 0.3 0.5 0.2
+
+Each generator gets a fake chat model with its own injected latency. The
+script reports the endpoint's wall time next to the slowest single call and
+the sequential sum, then repeats with one generator slower than
+LLM_TIMEOUT_SECONDS to show its fallback does not hold up the other two.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+from ._support import use_temp_database, fake_llm, print_table
+
+use_temp_database()
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from src.api.main import app, startup_event  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.llm import summary, risk_explanation, recommendations  # noqa: E402
+
+GENERATORS = (summary, risk_explanation, recommendations)
+
+
+def install_fake_llms(latencies):
+    for module, latency in zip(GENERATORS, latencies):
+        llm = fake_llm(latency, response=f"{module.__name__.rsplit('.', 1)[-1]} generated")
+        module.get_llm = lambda llm=llm: llm
+
+
+async def timed_generate_all(client, episode_id):
+    start = time.perf_counter()
+    response = await client.post(f"/llm/generate-all/{episode_id}")
+    response.raise_for_status()
+    return time.perf_counter() - start, response.json()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latencies", type=float, nargs=3, default=[0.3, 0.5, 0.2],
+                        help="Fake latency (s) for summary, risk explanation and recommendations")
+    parser.add_argument("--timeout", type=float, default=0.4, help="LLM_TIMEOUT_SECONDS for the timeout scenario")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        await startup_event()
+
+    rows = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        install_fake_llms(args.latencies)
+        wall, _ = await timed_generate_all(client, "EP000001")
+        rows.append(["all succeed", f"{max(args.latencies):.2f}", f"{sum(args.latencies):.2f}", f"{wall:.2f}", "-"])
+
+        slow = [args.latencies[0], args.timeout * 3, args.latencies[2]]
+        install_fake_llms(slow)
+        settings.LLM_TIMEOUT_SECONDS = args.timeout
+        wall, body = await timed_generate_all(client, "EP000002")
+        fell_back = "risk_explanation" if "generated" not in body["risk_explanation"] else "none"
+        rows.append(["one times out", f"{args.timeout:.2f}", f"{sum(slow):.2f}", f"{wall:.2f}", fell_back])
+
+    print_table(["scenario", "slowest call s", "sequential s", "wall s", "fallback"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
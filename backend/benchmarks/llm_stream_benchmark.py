@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compare time to first byte of the blocking and streaming (SSE) LLM endpoints.
+
+Usage (from the backend directory):
+    python -m benchmarks.llm_stream_benchmark --words 60 --first-token 0.3 --token-latency 0.03
+
+Completions come from a local mock OpenAI-compatible server that answers
+after --first-token seconds and then emits a word every --token-latency
+seconds. The blocking endpoint's first byte arrives only with the whole
+completion; the streaming endpoint's arrives with the first token. The run
+also drops one stream midway to check that nothing is written back.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+from ._support import use_temp_database, start_mock_openai, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument("--first-token", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.03)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    use_temp_database()
+    response = " ".join(f"word{i}" for i in range(args.words))
+    mock = start_mock_openai(args.first_token, response, token_latency=args.token_latency)
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["OPENAI_BASE_URL"] = mock["base_url"]
+
+    import httpx
+    import uvicorn
+    from src.api.main import app
+    from src.db import SessionLocal
+    from src.models.db_models import PatientEpisode
+
+    async def timed(client, path):
+        start = time.perf_counter()
+        first_byte = None
+        async with client.stream("POST", path) as r:
+            r.raise_for_status()
+            async for _ in r.aiter_bytes():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+        return first_byte, time.perf_counter() - start
+
+    async def abandoned_stream(client, episode_id):
+        async with client.stream("POST", f"/llm/summary/{episode_id}/stream") as r:
+            async for _ in r.aiter_bytes():
+                break  # disconnect after the first token
+
+    async def run():
+        rows = []
+        # A real socket is needed to observe the first byte; ASGITransport buffers the whole body
+        server = uvicorn.Server(uvicorn.Config(app, port=0, log_level="warning"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            task = asyncio.create_task(server.serve())
+            while not server.started:
+                await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            for name, suffix in (("blocking", ""), ("streaming (SSE)", "/stream")):
+                timings = [
+                    await timed(client, f"/llm/summary/EP{str(i).zfill(6)}{suffix}")
+                    for i in range(1, args.requests + 1)
+                ]
+                ttfb = sum(t[0] for t in timings) / len(timings)
+                total = sum(t[1] for t in timings) / len(timings)
+                rows.append([name, f"{ttfb * 1000:.0f}", f"{total * 1000:.0f}"])
+
+            await abandoned_stream(client, "EP000100")
+        await asyncio.sleep(args.first_token + args.words * args.token_latency)
+        server.should_exit = True
+        await task
+        return rows
+
+    rows = asyncio.run(run())
+    print_table(["endpoint", "time to first byte ms", "total ms"], rows)
+
+    db = SessionLocal()
+    saved = db.query(PatientEpisode.summary_text).filter(PatientEpisode.episode_id == "EP000100").scalar()
+    db.close()
+    print(f"abandoned stream wrote back a summary: {'yes' if saved and saved.startswith('word0') else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
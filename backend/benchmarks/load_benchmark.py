@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Measure API throughput as the number of concurrent clients grows.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_benchmark --workload llm --clients 1 2 4 8 16
+
+The app runs in-process behind an ASGI transport, so the numbers isolate the
+server's concurrency model: blocking handlers run in the worker threadpool
+(sized by API_THREADPOOL_SIZE) and no longer serialize on the event loop.
+The ``llm`` workload swaps OpenAI for a fake model with fixed latency, which is
+where the threadpool pays off most: throughput grows with the client count.
+"""
+import argparse
+import asyncio
+import time
+
+from ._support import use_temp_database, print_table, fake_llm
+
+use_temp_database()
+
+import httpx  # noqa: E402
+
+from src.api.main import app, startup_event  # noqa: E402
+from src.llm import summary  # noqa: E402
+
+DASHBOARD_ENDPOINTS = [
+    "/overview-metrics",
+    "/readmissions/list",
+    "/quality/incidents/summary",
+    "/risk-distribution",
+    "/health-trends",
+]
+
+
+LLM_ENDPOINTS = [f"/llm/summary/EP{str(i).zfill(6)}" for i in range(1, 51)]
+
+
+async def run_clients(client: httpx.AsyncClient, endpoints: list, clients: int, total: int) -> dict:
+    latencies = []
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            path = endpoints[i % len(endpoints)]
+            if path.startswith("/llm/"):
+                response = await client.post(path)
+            else:
+                response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workload", choices=["dashboard", "llm"], default="dashboard")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM latency in seconds")
+    args = parser.parse_args()
+
+    endpoints = DASHBOARD_ENDPOINTS
+    if args.workload == "llm":
+        endpoints = LLM_ENDPOINTS
+        llm = fake_llm(args.llm_latency)
+        summary.get_llm = lambda: llm
+
+    await startup_event()
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run_clients(client, DASHBOARD_ENDPOINTS, 1, len(DASHBOARD_ENDPOINTS))  # warm-up
+        for clients in args.clients:
+            stats = await run_clients(client, endpoints, clients, args.requests)
+            rows.append([clients, f"{stats['rps']:.1f}", f"{stats['p50']:.1f}", f"{stats['p99']:.1f}"])
+    print_table(["clients", "req/s", "p50 ms", "p99 ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Compare list serialization: ORM objects + jsonable_encoder vs tuple rows + fast JSON.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization_benchmark --rows 100000
+
+Builds the /readmissions/list, /quality/incidents and /data-quality/issues
+payloads both ways and reports milliseconds per 10k rows, split into fetching
+the rows, building the dicts and encoding the body. The encoder in use
+(orjson or the standard library fallback) is printed first.
+"""
+import argparse
+import time
+
+from ._support import use_temp_database, bulk_seed, print_table
+
+use_temp_database()
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy import case  # noqa: E402
+from sqlalchemy.orm import load_only  # noqa: E402
+
+from src.db import SessionLocal  # noqa: E402
+from src.models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue  # noqa: E402
+from src.api import fast_json  # noqa: E402
+from src.api.fields import (  # noqa: E402
+    EPISODE_FIELDS, EPISODE_LIST_FIELDS, INCIDENT_FIELDS, INCIDENT_LIST_FIELDS, project, serialize_rows,
+)
+from src.api.main import list_data_quality_issues  # noqa: E402
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+# The previous implementation: ORM objects, isoformat() per row, jsonable_encoder + JSONResponse
+def legacy_episodes(db, limit):
+    columns = [PatientEpisode.id, PatientEpisode.readmission_risk_score]
+    for name in EPISODE_LIST_FIELDS:
+        columns.extend(EPISODE_FIELDS[name][0])
+    return db.query(PatientEpisode).options(load_only(*columns)).order_by(
+        PatientEpisode.readmission_risk_score.desc().nulls_last(), PatientEpisode.id,
+    ).limit(limit).all()
+
+
+def legacy_episode_dicts(rows):
+    return [
+        {
+            "id": ep.episode_id,
+            "patientId": ep.patient_id,
+            "patientName": ep.patient_name,
+            "unit": ep.unit,
+            "admissionDate": _iso(ep.admit_date),
+            "dischargeDate": _iso(ep.discharge_date),
+            "riskLevel": ep.risk_level,
+            "los": ep.length_of_stay,
+            "diagnosis": ep.primary_diagnosis,
+        }
+        for ep in rows
+    ]
+
+
+def legacy_incidents(db, limit):
+    columns = [SafetyIncident.id]
+    for name in INCIDENT_LIST_FIELDS:
+        columns.extend(INCIDENT_FIELDS[name][0])
+    return db.query(SafetyIncident).options(load_only(*columns)).order_by(SafetyIncident.date.desc()).limit(limit).all()
+
+
+def legacy_incident_dicts(rows):
+    return [
+        {
+            "id": inc.incident_id,
+            "date": _iso(inc.date),
+            "category": inc.category,
+            "severity": inc.severity,
+            "description": inc.description,
+            "unit": inc.unit,
+            "status": inc.status,
+        }
+        for inc in rows
+    ]
+
+
+def legacy_issues(db, limit):
+    severity = case(
+        (DataQualityIssue.severity == "High", 1),
+        (DataQualityIssue.severity == "Medium", 2),
+        (DataQualityIssue.severity == "Low", 3),
+        else_=4,
+    )
+    return db.query(DataQualityIssue).order_by(severity, DataQualityIssue.last_updated.desc()).limit(limit).all()
+
+
+def legacy_issue_dicts(rows):
+    return [
+        {
+            "id": f"DQ{str(iss.id).zfill(6)}",
+            "recordId": iss.record_id,
+            "unit": iss.unit,
+            "issueType": iss.issue_type,
+            "field": iss.field,
+            "description": iss.description,
+            "severity": iss.severity,
+            "lastUpdated": iss.last_updated.isoformat(),
+        }
+        for iss in rows
+    ]
+
+
+def legacy_encode(payload):
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+
+def measure(db, fetch, build, encode, repeat):
+    """Best-of-repeat milliseconds for each stage, plus the row count and body size"""
+    best = None
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        rows = fetch(db)
+        fetched = time.perf_counter()
+        payload = build(rows)
+        built = time.perf_counter()
+        body = encode(payload)
+        encoded = time.perf_counter()
+        stages = (fetched - start, built - fetched, encoded - built)
+        if best is None or sum(stages) < sum(best):
+            best = stages
+    return best, len(rows), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per list (episodes, incidents and issues)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"JSON encoder: {'orjson' if fast_json.orjson is not None else 'json (install orjson for the fast path)'}")
+    bulk_seed(args.rows, incidents=args.rows, issues=args.rows)
+    limit = args.rows
+
+    def fast_episodes(db):
+        query = project(db.query(PatientEpisode), EPISODE_FIELDS, EPISODE_LIST_FIELDS,
+                        always=(PatientEpisode.id, PatientEpisode.readmission_risk_score))
+        return query.order_by(
+            PatientEpisode.readmission_risk_score.desc().nulls_last(), PatientEpisode.id,
+        ).limit(limit).all()
+
+    def fast_incidents(db):
+        query = project(db.query(SafetyIncident), INCIDENT_FIELDS, INCIDENT_LIST_FIELDS)
+        return query.order_by(SafetyIncident.date.desc()).limit(limit).all()
+
+    cases = [
+        ("/readmissions/list",
+         (lambda db: legacy_episodes(db, limit), legacy_episode_dicts, legacy_encode),
+         (fast_episodes, lambda rows: serialize_rows(rows, EPISODE_FIELDS, EPISODE_LIST_FIELDS), fast_json.dumps)),
+        ("/quality/incidents",
+         (lambda db: legacy_incidents(db, limit), legacy_incident_dicts, legacy_encode),
+         (fast_incidents, lambda rows: serialize_rows(rows, INCIDENT_FIELDS, INCIDENT_LIST_FIELDS), fast_json.dumps)),
+        ("/data-quality/issues",
+         (lambda db: legacy_issues(db, limit), legacy_issue_dicts, legacy_encode),
+         (list_data_quality_issues, lambda rows: rows, fast_json.dumps)),
+    ]
+
+    table = []
+    db = SessionLocal()
+    try:
+        for path, legacy, fast in cases:
+            for label, (fetch, build, encode) in (("ORM + jsonable_encoder", legacy), ("tuple rows + fast JSON", fast)):
+                stages, count, size = measure(db, fetch, build, encode, args.repeat)
+                per_10k = [seconds * 1000 * 10_000 / max(count, 1) for seconds in stages]
+                table.append([
+                    path, label, f"{count:,}", f"{size:,}",
+                    *(f"{ms:.1f}" for ms in per_10k), f"{sum(per_10k):.1f}",
+                ])
+    finally:
+        db.close()
+
+    print_table(
+        ["endpoint", "path", "rows", "bytes", "fetch ms/10k", "build ms/10k", "encode ms/10k", "total ms/10k"],
+        table,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Compare peak memory of the whole-file and the chunked loaders as extracts grow.
+
+Usage (from the backend directory):
+    python -m benchmarks.stream_load_benchmark --rows 100000 300000 --chunk-size 20000
+
+For each extract size, loads a synthetic episode CSV into a fresh database
+with bulk_load (whole file in memory) and with stream_load (one chunk at a
+time), each in its own process, and reports that process's peak RSS.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+
+def child(mode: str, path: str, chunk_size: int):
+    from ._support import use_temp_database
+    use_temp_database()
+    from src.db import init_db
+    from src.etl.bulk_load import bulk_load
+    from src.etl.stream_load import stream_load
+
+    init_db()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == "bulk_load":
+        stats = bulk_load("episodes", path)
+    else:
+        stats = stream_load("episodes", path, chunk_size=chunk_size)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": stats["seconds"], "baseline_kb": baseline, "peak_kb": peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 300_000])
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.chunk_size)
+        return
+
+    from ._support import print_table
+    from .bulk_load_benchmark import write_extract
+
+    directory = tempfile.mkdtemp(prefix="healthsight-stream-")
+    rows = []
+    for count in args.rows:
+        path = os.path.join(directory, f"episodes-{count}.csv")
+        write_extract(path, count)
+        size_mb = os.path.getsize(path) / 1e6
+        for mode in ("bulk_load", "stream_load"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.stream_load_benchmark", "--chunk-size", str(args.chunk_size), "--child", mode, path],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            growth_mb = (result["peak_kb"] - result["baseline_kb"]) / 1024
+            rows.append([count, f"{size_mb:.0f}", mode, f"{result['seconds']:.2f}", f"{growth_mb:.0f}"])
+    print_table(["rows", "file MB", "loader", "seconds", "peak memory growth MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+In-memory column store for the dashboard aggregates.
+
+An alternative to the SQL rollups in analytics/kpis.py, selected with
+ANALYTICS_ENGINE=columnar. The columns the aggregates need are read from the
+source tables into pandas DataFrames (categoricals for the low-cardinality
+text columns) and every KPI is a groupby over them. Point lookups and list
+endpoints keep using SQLAlchemy.
+
+The store is rebuilt lazily, on the first query after a write that can change
+the aggregates (aggregate_version: ORM commits touching aggregated columns and
+the ETL loaders in this process; narrative-only AI write-backs do not count),
+or once it is older than ANALYTICS_COLUMNAR_MAX_AGE_SECONDS, which picks up
+ETL runs in other processes. Queries read an immutable snapshot, so
+a rebuild never blocks a query that has already started.
+
+The functions below have the same signatures and return the same values as
+their counterparts in analytics/kpis.py. Admission and incident times are kept
+in full, so the "since" cutoffs are exact like the SQL engine's.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue
+from ..utils.cache import aggregate_version
+from .kpis import DQ_ISSUE_TYPES
+
+LOAD_CHUNK_SIZE = 500_000
+
+# Table -> (select of the columns the aggregates read, categorical columns)
+COLUMNS = {
+    "episodes": (
+        lambda: select(
+            PatientEpisode.unit,
+            PatientEpisode.admit_date.label("at"),
+            PatientEpisode.risk_level,
+            PatientEpisode.discharge_date.isnot(None).label("discharged"),
+            PatientEpisode.readmitted_30d.label("readmitted"),
+            PatientEpisode.length_of_stay.label("los"),
+        ),
+        ("unit", "risk_level"),
+    ),
+    "incidents": (
+        lambda: select(
+            SafetyIncident.unit,
+            SafetyIncident.date.label("at"),
+            SafetyIncident.category,
+        ),
+        ("unit", "category"),
+    ),
+    "data_quality": (
+        lambda: select(
+            DataQualityIssue.unit,
+            DataQualityIssue.issue_type,
+            DataQualityIssue.severity,
+        ),
+        ("unit", "issue_type", "severity"),
+    ),
+}
+
+
+def _load_table(conn: Connection, stmt, categorical: tuple) -> pd.DataFrame:
+    # Convert each chunk's text columns to categoricals as it arrives, so the
+    # full table is never held as Python strings
+    chunks = []
+    for chunk in pd.read_sql(stmt, conn, chunksize=LOAD_CHUNK_SIZE):
+        for column in categorical:
+            chunk[column] = chunk[column].astype("category")
+        chunks.append(chunk)
+
+    if chunks:
+        df = pd.concat(chunks, ignore_index=True)
+        for column in categorical:
+            df[column] = union_categoricals([chunk[column] for chunk in chunks])
+    else:
+        df = pd.read_sql(stmt.limit(0), conn)
+    if "at" in df:
+        df["at"] = pd.to_datetime(df["at"])
+    for column in ("discharged", "readmitted"):
+        if column in df:
+            df[column] = df[column].fillna(False).astype(bool)
+    return df
+
+
+def load_tables(conn: Connection) -> dict:
+    """Read the aggregate columns of every source table into DataFrames"""
+    return {name: _load_table(conn, build(), categorical) for name, (build, categorical) in COLUMNS.items()}
+
+
+class ColumnStore:
+    """Lazily (re)built snapshot of the source table columns"""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._tables: Optional[dict] = None
+        self._built_at = 0.0
+        self._version = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.last_build_seconds = 0.0
+
+    def _stale(self) -> bool:
+        return (
+            self._tables is None
+            or self._version != aggregate_version.value
+            or time.monotonic() - self._built_at > self.max_age
+        )
+
+    def tables(self, db: Session) -> dict:
+        """Current snapshot, rebuilt first if the data may have changed"""
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    # Read the version first: a write committed during the load triggers another rebuild
+                    version = aggregate_version.value
+                    start = time.perf_counter()
+                    self._tables = load_tables(db.connection())
+                    self.last_build_seconds = time.perf_counter() - start
+                    self._built_at = time.monotonic()
+                    self._version = version
+                    self.builds += 1
+        return self._tables
+
+
+column_store = ColumnStore(settings.ANALYTICS_COLUMNAR_MAX_AGE_SECONDS)
+
+
+def episode_kpis(db: Session) -> dict:
+    """Column store version of kpis.episode_kpis"""
+    episodes = column_store.tables(db)["episodes"]
+    risk = {"Low": 0, "Medium": 0, "High": 0}
+    risk.update({level: int(count) for level, count in episodes["risk_level"].value_counts().items()})
+    discharged = episodes["discharged"]
+    los = episodes["los"]
+    los_count = int(los.count())
+    return {
+        "total": sum(risk.values()),
+        "discharged": int(discharged.sum()),
+        "readmitted": int((discharged & episodes["readmitted"]).sum()),
+        "avg_los": float(los.sum()) / los_count if los_count else None,
+        "risk": risk,
+    }
+
+
+def monthly_trends(db: Session, since: datetime) -> list:
+    """Column store version of kpis.monthly_trends"""
+    episodes = column_store.tables(db)["episodes"]
+    recent = episodes[episodes["at"] >= pd.Timestamp(since)]
+    months = recent.groupby(recent["at"].dt.to_period("M"))["readmitted"].agg(["size", "sum"]).sort_index()
+    return [(str(month), int(count), int(readmitted)) for month, (count, readmitted) in months.iterrows()]
+
+
+def incident_kpis(db: Session, since: Optional[datetime] = None) -> dict:
+    """Column store version of kpis.incident_kpis"""
+    if since is None:
+        since = datetime.now() - timedelta(days=30)
+
+    incidents = column_store.tables(db)["incidents"]
+    categories = incidents.loc[incidents["at"] >= pd.Timestamp(since), "category"]
+    by_category = {category: int(count) for category, count in categories.value_counts(sort=False).items() if count}
+    return {
+        "total": sum(by_category.values()),
+        "by_category": by_category,
+    }
+
+
+def data_quality_kpis(db: Session) -> dict:
+    """Column store version of kpis.data_quality_kpis"""
+    issues = column_store.tables(db)["data_quality"]
+    by_type = pd.crosstab(issues["unit"], issues["issue_type"])
+
+    by_unit = []
+    totals = {key: 0 for key in DQ_ISSUE_TYPES.values()}
+    for unit, counts in by_type.sort_index().iterrows():
+        unit_counts = {key: int(counts.get(issue_type, 0)) for issue_type, key in DQ_ISSUE_TYPES.items()}
+        for key, value in unit_counts.items():
+            totals[key] += value
+        by_unit.append({"name": unit, **unit_counts})
+
+    return {
+        "total": len(issues),
+        "high_severity": int((issues["severity"] == "High").sum()),
+        "by_type": totals,
+        "by_unit": by_unit,
+    }
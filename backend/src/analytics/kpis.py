@@ -0,0 +1,173 @@
+from datetime import datetime, time, timedelta
+from typing import Optional
+from sqlalchemy import func, case, literal, select, union_all
+from sqlalchemy.orm import Session
+from ..models.db_models import (
+    PatientEpisode,
+    SafetyIncident,
+    EpisodeDailyRollup,
+    IncidentDailyRollup,
+    DataQualityDailyRollup,
+)
+
+DQ_ISSUE_TYPES = {
+    "Invalid": "invalid",
+    "Missing": "missing",
+    "Duplicate": "duplicates",
+    "Stale": "stale",
+}
+
+
+def _sum_if(condition, value):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+
+def _before_cutoff(column, since: datetime):
+    """
+    Filter for source rows on the cutoff's day but before the cutoff itself.
+
+    Rollups are per day, so filtering them with day >= since.date() also counts
+    these rows. The windowed KPIs cancel them with a count of -1 in the same
+    query (UNION ALL), which keeps exact timestamps at one round trip.
+    """
+    return (column >= datetime.combine(since.date(), time.min)) & (column < since)
+
+
+def episode_kpis(db: Session) -> dict:
+    """
+    Compute every patient episode KPI in a single pass over the episode rollups.
+
+    Returns:
+        Dict with episode counts, readmissions among discharged episodes,
+        average length of stay and the Low/Medium/High risk band counts
+    """
+    rows = db.query(
+        EpisodeDailyRollup.risk_level,
+        func.sum(EpisodeDailyRollup.episodes),
+        func.sum(EpisodeDailyRollup.discharged),
+        func.sum(EpisodeDailyRollup.discharged_readmitted),
+        func.sum(EpisodeDailyRollup.los_sum),
+        func.sum(EpisodeDailyRollup.los_count),
+    ).group_by(EpisodeDailyRollup.risk_level).all()
+
+    risk = {"Low": 0, "Medium": 0, "High": 0}
+    discharged = readmitted = los_count = 0
+    los_sum = 0.0
+    for risk_level, episodes, discharged_count, readmitted_count, level_los_sum, level_los_count in rows:
+        risk[risk_level] = int(episodes)
+        discharged += int(discharged_count)
+        readmitted += int(readmitted_count)
+        los_sum += float(level_los_sum)
+        los_count += int(level_los_count)
+
+    return {
+        "total": sum(risk.values()),
+        "discharged": discharged,
+        "readmitted": readmitted,
+        "avg_los": los_sum / los_count if los_count else None,
+        "risk": risk,
+    }
+
+
+def monthly_trends(db: Session, since: datetime) -> list:
+    """
+    Aggregate episodes and readmissions per admission month from the episode rollups.
+
+    Returns:
+        List of (month "YYYY-MM", episodes, readmissions) tuples in month order
+    """
+    days = select(
+        func.strftime("%Y-%m", EpisodeDailyRollup.day).label("month"),
+        EpisodeDailyRollup.episodes.label("episodes"),
+        EpisodeDailyRollup.readmitted.label("readmitted"),
+    ).where(EpisodeDailyRollup.day >= since.date())
+    early = select(
+        func.strftime("%Y-%m", PatientEpisode.admit_date),
+        literal(-1),
+        case((PatientEpisode.readmitted_30d == True, -1), else_=0),
+    ).where(_before_cutoff(PatientEpisode.admit_date, since))
+    combined = union_all(days, early).subquery()
+
+    episodes = func.sum(combined.c.episodes)
+    return db.query(
+        combined.c.month,
+        episodes,
+        func.sum(combined.c.readmitted),
+    ).group_by(combined.c.month).having(episodes > 0).order_by(combined.c.month).all()
+
+
+def incident_kpis(db: Session, since: Optional[datetime] = None) -> dict:
+    """
+    Compute safety incident counts per category since a cutoff from the incident rollups.
+
+    Args:
+        db: Database session
+        since: Only count incidents from this time on (defaults to 30 days ago)
+
+    Returns:
+        Dict with the total count and a {category: count} mapping
+    """
+    if since is None:
+        since = datetime.now() - timedelta(days=30)
+
+    days = select(
+        IncidentDailyRollup.category.label("category"),
+        IncidentDailyRollup.incidents.label("incidents"),
+    ).where(IncidentDailyRollup.day >= since.date())
+    early = select(
+        SafetyIncident.category,
+        literal(-1),
+    ).where(_before_cutoff(SafetyIncident.date, since))
+    combined = union_all(days, early).subquery()
+
+    incidents = func.sum(combined.c.incidents)
+    rows = db.query(
+        combined.c.category,
+        incidents,
+    ).group_by(combined.c.category).having(incidents > 0).all()
+
+    by_category = {category: int(count) for category, count in rows}
+    return {
+        "total": sum(by_category.values()),
+        "by_category": by_category,
+    }
+
+
+def data_quality_kpis(db: Session) -> dict:
+    """
+    Compute data quality issue counts by type, severity and unit in one pass over the DQ rollups.
+
+    Returns:
+        Dict with overall totals per issue type, the high severity count and
+        per-unit issue type counts
+    """
+    issues = DataQualityDailyRollup.issues
+    columns = [
+        _sum_if(DataQualityDailyRollup.issue_type == issue_type, issues).label(key)
+        for issue_type, key in DQ_ISSUE_TYPES.items()
+    ]
+    rows = db.query(
+        DataQualityDailyRollup.unit,
+        func.sum(issues),
+        _sum_if(DataQualityDailyRollup.severity == "High", issues),
+        *columns,
+    ).group_by(DataQualityDailyRollup.unit).all()
+
+    by_unit = []
+    totals = {key: 0 for key in DQ_ISSUE_TYPES.values()}
+    total_issues = 0
+    high_severity = 0
+    for unit, count, high, *type_counts in rows:
+        total_issues += int(count)
+        high_severity += int(high)
+        unit_counts = dict(zip(DQ_ISSUE_TYPES.values(), (int(c) for c in type_counts)))
+        for key, value in unit_counts.items():
+            totals[key] += value
+        by_unit.append({"name": unit, **unit_counts})
+
+    return {
+        "total": total_issues,
+        "high_severity": high_severity,
+        "by_type": totals,
+        "by_unit": by_unit,
+    }
@@ -0,0 +1,234 @@
+"""
+KPI rollup maintenance.
+
+Each source table has a rollup table keyed by unit, day and category (see
+models/db_models.py). Rollups are refreshed incrementally: any ORM flush that
+inserts, updates or deletes source rows re-aggregates only the days those rows
+fall on (consecutive days as one range), inside the same transaction. Bulk loaders that bypass the ORM call
+refresh_rollups() themselves, and rebuild_rollups() recomputes everything.
+
+Usage:
+    python -m src.analytics.rollups rebuild
+"""
+import argparse
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from sqlalchemy import event, func, case, select, insert, delete, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from ..db import SessionLocal, engine
+from ..models.db_models import (
+    PatientEpisode,
+    SafetyIncident,
+    DataQualityIssue,
+    EpisodeDailyRollup,
+    IncidentDailyRollup,
+    DataQualityDailyRollup,
+)
+
+
+def _count_if(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def _episode_rollup_select():
+    day = func.date(PatientEpisode.admit_date)
+    discharged = PatientEpisode.discharge_date.isnot(None)
+    return select(
+        PatientEpisode.unit,
+        day,
+        PatientEpisode.risk_level,
+        func.count(PatientEpisode.id),
+        _count_if(discharged),
+        _count_if(discharged & (PatientEpisode.readmitted_30d == True)),
+        _count_if(PatientEpisode.readmitted_30d == True),
+        func.coalesce(func.sum(PatientEpisode.length_of_stay), 0),
+        func.count(PatientEpisode.length_of_stay),
+    ).group_by(PatientEpisode.unit, day, PatientEpisode.risk_level)
+
+
+def _incident_rollup_select():
+    day = func.date(SafetyIncident.date)
+    return select(
+        SafetyIncident.unit,
+        day,
+        SafetyIncident.category,
+        func.count(SafetyIncident.id),
+    ).group_by(SafetyIncident.unit, day, SafetyIncident.category)
+
+
+def _data_quality_rollup_select():
+    day = func.date(DataQualityIssue.last_updated)
+    return select(
+        DataQualityIssue.unit,
+        day,
+        DataQualityIssue.issue_type,
+        DataQualityIssue.severity,
+        func.count(DataQualityIssue.id),
+    ).group_by(DataQualityIssue.unit, day, DataQualityIssue.issue_type, DataQualityIssue.severity)
+
+
+# Source model -> (rollup model, source day column, aggregate select, columns that affect the rollup)
+ROLLUPS = {
+    PatientEpisode: (
+        EpisodeDailyRollup,
+        PatientEpisode.admit_date,
+        _episode_rollup_select,
+        ("unit", "admit_date", "discharge_date", "length_of_stay", "readmitted_30d", "risk_level"),
+    ),
+    SafetyIncident: (
+        IncidentDailyRollup,
+        SafetyIncident.date,
+        _incident_rollup_select,
+        ("unit", "date", "category"),
+    ),
+    DataQualityIssue: (
+        DataQualityDailyRollup,
+        DataQualityIssue.last_updated,
+        _data_quality_rollup_select,
+        ("unit", "last_updated", "issue_type", "severity"),
+    ),
+}
+
+
+def _rollup_columns(rollup_model):
+    return [c for c in rollup_model.__table__.columns]
+
+
+def _rollup_insert(conn: Connection, rollup_model):
+    # Upsert so two refreshes of the same days can't collide on the primary key:
+    # the DELETE doesn't lock rows another transaction is about to insert
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(rollup_model)
+    stmt = dialect_insert(rollup_model)
+    table = rollup_model.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={c.name: stmt.excluded[c.name] for c in table.columns if not c.primary_key},
+    )
+
+
+def refresh_rollups(conn: Connection, source_model, start_day: Optional[date] = None, end_day: Optional[date] = None):
+    """
+    Recompute the rollup rows of one source table for an inclusive day range.
+
+    Args:
+        conn: Connection to run on (use the caller's transaction)
+        source_model: PatientEpisode, SafetyIncident or DataQualityIssue
+        start_day: First day to refresh, or None for no lower bound
+        end_day: Last day to refresh, or None for no upper bound
+    """
+    rollup_model, day_column, build_select, _ = ROLLUPS[source_model]
+
+    stmt = build_select()
+    clear = delete(rollup_model)
+    if start_day is not None:
+        stmt = stmt.where(day_column >= datetime.combine(start_day, time.min))
+        clear = clear.where(rollup_model.day >= start_day)
+    if end_day is not None:
+        stmt = stmt.where(day_column < datetime.combine(end_day + timedelta(days=1), time.min))
+        clear = clear.where(rollup_model.day <= end_day)
+
+    conn.execute(clear)
+    conn.execute(_rollup_insert(conn, rollup_model).from_select(_rollup_columns(rollup_model), stmt))
+
+
+def rebuild_rollups(conn: Optional[Connection] = None):
+    """Recompute every rollup table from scratch (for backfills and upgrades)"""
+    if conn is None:
+        with engine.begin() as conn:
+            return rebuild_rollups(conn)
+    for source_model in ROLLUPS:
+        refresh_rollups(conn, source_model)
+
+
+def ensure_rollups():
+    """Build the rollups once for databases that predate them"""
+    db = SessionLocal()
+    try:
+        has_source_rows = db.query(PatientEpisode.id).first() is not None
+        has_rollup_rows = db.query(EpisodeDailyRollup.day).first() is not None
+    finally:
+        db.close()
+    if has_source_rows and not has_rollup_rows:
+        rebuild_rollups()
+
+
+# ==================== Incremental refresh on ORM writes ====================
+
+def _day(value) -> Optional[date]:
+    # None stands for a server-side default (e.g. last_updated), resolved in _database_today()
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _database_today(conn: Connection) -> date:
+    """Today by the database's clock, which server defaults like func.now() use (UTC on SQLite)"""
+    today = conn.execute(select(func.date(func.now()))).scalar()
+    return today if isinstance(today, date) else date.fromisoformat(str(today))
+
+
+def _day_ranges(days: set) -> list:
+    """Inclusive (start, end) ranges of consecutive days, so a refresh skips the gaps between edits"""
+    ranges = []
+    for day in sorted(days):
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [tuple(r) for r in ranges]
+
+
+def _track(pending: dict, source_model, *values):
+    days = pending.setdefault(source_model, set())
+    days.update(_day(v) for v in values)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_rollup_changes(session: Session, flush_context, instances):
+    pending = session.info.setdefault("rollup_days", {})
+    for obj in list(session.new) + list(session.deleted):
+        spec = ROLLUPS.get(type(obj))
+        if spec:
+            _track(pending, type(obj), getattr(obj, spec[1].key))
+    for obj in session.dirty:
+        spec = ROLLUPS.get(type(obj))
+        if not spec or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in spec[3]):
+            # e.g. LLM write-backs only touch narrative text
+            continue
+        history = state.attrs[spec[1].key].history
+        _track(pending, type(obj), *(history.deleted or ()), getattr(obj, spec[1].key))
+    if pending:
+        # Picked up on commit by utils/cache.py to bump aggregate_version
+        session.info["aggregates_changed"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_changes(session: Session, flush_context):
+    pending = session.info.pop("rollup_days", None)
+    if not pending:
+        return
+    conn = session.connection()
+    for source_model, days in pending.items():
+        if None in days:
+            days = (days - {None}) | {_database_today(conn)}
+        for start_day, end_day in _day_ranges(days):
+            refresh_rollups(conn, source_model, start_day, end_day)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain KPI rollup tables")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute all rollups from the source tables")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        from ..db import init_db
+        init_db()
+        rebuild_rollups()
+        print("✓ Rollup tables rebuilt")
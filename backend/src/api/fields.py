@@ -0,0 +1,112 @@
+"""
+Sparse fieldsets for list endpoints.
+
+Each endpoint declares the API fields it can return as
+{field name: (columns to load, value getter)}. Only the columns behind the
+requested fields are selected, as plain tuple rows rather than ORM objects, so
+list views skip the long narrative text columns unless a client asks for them
+with ``fields=``. Getters return raw column values (datetimes included); the
+JSON encoder formats them.
+"""
+from operator import attrgetter
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue
+
+ALL_FIELDS = "*"
+
+
+def _column(column):
+    # Field backed by a single column, returned as is
+    return (column,), attrgetter(column.key)
+
+
+EPISODE_FIELDS = {
+    "id": _column(PatientEpisode.episode_id),
+    "patientId": _column(PatientEpisode.patient_id),
+    "patientName": _column(PatientEpisode.patient_name),
+    "unit": _column(PatientEpisode.unit),
+    "admissionDate": _column(PatientEpisode.admit_date),
+    "dischargeDate": _column(PatientEpisode.discharge_date),
+    "riskLevel": _column(PatientEpisode.risk_level),
+    "los": _column(PatientEpisode.length_of_stay),
+    "diagnosis": _column(PatientEpisode.primary_diagnosis),
+    "summary": _column(PatientEpisode.summary),
+    "riskExplanation": _column(PatientEpisode.risk_explanation),
+    "nextBestAction": _column(PatientEpisode.next_best_action),
+}
+
+# Narrative text is only needed by the episode detail view (/readmissions/{episode_id})
+EPISODE_LIST_FIELDS = [
+    "id", "patientId", "patientName", "unit", "admissionDate", "dischargeDate", "riskLevel", "los", "diagnosis",
+]
+
+INCIDENT_FIELDS = {
+    "id": _column(SafetyIncident.incident_id),
+    "date": _column(SafetyIncident.date),
+    "category": _column(SafetyIncident.category),
+    "severity": _column(SafetyIncident.severity),
+    "description": _column(SafetyIncident.description),
+    "unit": _column(SafetyIncident.unit),
+    "status": _column(SafetyIncident.status),
+}
+
+INCIDENT_LIST_FIELDS = list(INCIDENT_FIELDS)
+
+DATA_QUALITY_FIELDS = {
+    "id": ((DataQualityIssue.id,), lambda iss: f"DQ{iss.id:06d}"),
+    "recordId": _column(DataQualityIssue.record_id),
+    "unit": _column(DataQualityIssue.unit),
+    "issueType": _column(DataQualityIssue.issue_type),
+    "field": _column(DataQualityIssue.field),
+    "description": _column(DataQualityIssue.description),
+    "severity": _column(DataQualityIssue.severity),
+    "lastUpdated": _column(DataQualityIssue.last_updated),
+}
+
+DATA_QUALITY_LIST_FIELDS = list(DATA_QUALITY_FIELDS)
+
+
+def parse_fields(fields: Optional[str], available: dict, default: list) -> list:
+    """
+    Resolve a comma-separated ``fields`` query parameter.
+
+    Args:
+        fields: Raw parameter value; None uses the default set, "*" selects every field
+        available: Field spec of the endpoint
+        default: Fields returned when none are requested
+
+    Returns:
+        Ordered list of field names
+    """
+    if not fields:
+        return list(default)
+    if fields.strip() == ALL_FIELDS:
+        return list(available)
+
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}",
+        )
+    return selected
+
+
+def project(query, available: dict, selected: list, always: tuple = ()):
+    """Turn an entity query into a tuple-row query of the columns behind the selected fields (plus any always needed)"""
+    columns = list(always)
+    for name in selected:
+        columns.extend(column for column in available[name][0] if not any(column is c for c in columns))
+    return query.with_entities(*columns)
+
+
+def serialize(row, available: dict, selected: list) -> dict:
+    return {name: available[name][1](row) for name in selected}
+
+
+def serialize_rows(rows: Iterable, available: dict, selected: list) -> list:
+    """serialize() for many rows, resolving the getters once"""
+    getters = [(name, available[name][1]) for name in selected]
+    return [{name: get(row) for name, get in getters} for row in rows]
@@ -0,0 +1,81 @@
+import hashlib
+from typing import Callable, Optional
+from fastapi import Request, Response
+from ..config import settings
+from ..utils.cache import response_cache, response_flights
+from .compression import compress, negotiate
+from .fast_json import dumps
+
+CACHED_LEVELS = {"gzip": settings.COMPRESSION_CACHED_GZIP_LEVEL, "br": settings.COMPRESSION_CACHED_BROTLI_QUALITY}
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class CachedBody:
+    """A cached JSON body, its ETag, and compressed variants made on first request"""
+
+    __slots__ = ("body", "etag", "_variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = _etag(body)
+        self._variants = {}
+
+    def variant(self, encoding: Optional[str]) -> tuple:
+        """(body, ETag) for an encoding; each encoding has its own ETag"""
+        if encoding is None:
+            return self.body, self.etag
+        variant = self._variants.get(encoding)
+        if variant is None:
+            # Concurrent first requests may both compress; either result is kept
+            variant = (compress(self.body, encoding, CACHED_LEVELS[encoding]), f'{self.etag[:-1]}-{encoding}"')
+            self._variants[encoding] = variant
+        return variant
+
+
+def _compute_entry(key, compute: Callable[[], object]) -> CachedBody:
+    # Read the version first: if a write commits while computing, the payload
+    # may predate it, so it is served to this request but not cached
+    version = response_cache.invalidations
+    entry = CachedBody(dumps(compute()))
+    response_cache.set(key, entry, version=version)
+    return entry
+
+
+def cached_json_response(request: Request, compute: Callable[[], object]) -> Response:
+    """
+    Serve a JSON payload from the response cache, computing it on a miss.
+
+    The cache key is the request path plus its sorted query parameters.
+    Concurrent misses for the same key are coalesced: one request computes
+    the payload and the others wait for it. Every response carries an ETag;
+    a matching If-None-Match gets an empty 304.
+
+    Bodies of at least COMPRESSION_MIN_SIZE bytes are sent with the
+    negotiated Content-Encoding, compressed once per cache entry rather than
+    on every request.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = response_flights.do(key, lambda: _compute_entry(key, compute))
+
+    encoding = None
+    if settings.COMPRESSION_ENABLED and len(entry.body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+    body, etag = entry.variant(encoding)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    # The payload is unchanged whichever encoding the client cached it in
+    if if_none_match and any(_etag_matches(if_none_match, tag) for tag in (etag, entry.etag)):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,28 +1,61 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from anyio import to_thread
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from datetime import datetime, timedelta
+from sqlalchemy import case
+from datetime import date, datetime, time, timedelta
 from typing import Optional
+import asyncio
 import random
 
 from ..db import get_db, init_db
 from ..etl.load_data import seed_database
-from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue
+from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue, InsightJob
 from ..schemas.api_models import (
     PatientEpisode as PatientEpisodeSchema,
     SafetyIncident as SafetyIncidentSchema,
     DataQualityIssue as DataQualityIssueSchema,
     OverviewMetrics,
     DataQualityMetrics,
+    InsightJobCreate,
 )
 from ..config import settings
-from ..llm.summary import generate_episode_summary
-from ..llm.risk_explanation import generate_risk_explanation
-from ..llm.recommendations import generate_next_best_action
+from ..utils.cache import response_cache, response_flights
+from .http_cache import cached_json_response
+from .fast_json import FastJSONResponse
+from .compression import CompressionMiddleware
+from .streaming import stream_insight
+from .export import export_response
+from .pagination import NEXT_CURSOR_HEADER, encode_cursor, after_risk_cursor
+from .fields import (
+    EPISODE_FIELDS,
+    EPISODE_LIST_FIELDS,
+    INCIDENT_FIELDS,
+    INCIDENT_LIST_FIELDS,
+    DATA_QUALITY_FIELDS,
+    DATA_QUALITY_LIST_FIELDS,
+    parse_fields,
+    project,
+    serialize_rows,
+)
+from ..analytics import kpis, columnar
+from ..llm.summary import generate_episode_summary, agenerate_episode_summary, astream_episode_summary
+from ..llm.risk_explanation import generate_risk_explanation, agenerate_risk_explanation, astream_risk_explanation
+from ..llm.recommendations import generate_next_best_action, agenerate_next_best_action, astream_next_best_action
+from ..llm import jobs as insight_jobs
+from ..llm.response_cache import llm_response_cache
+from ..llm.llm_utils import close_llm
+from ..utils.risk import RISK_LEVELS
 
 app = FastAPI(title="Healthcare Analytics API", version="1.0.0")
 
+# Dashboard aggregates come from the rollup tables or the in-memory column store
+analytics = columnar if settings.ANALYTICS_ENGINE == "columnar" else kpis
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,14 +63,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and seed data on startup"""
+    # Endpoints that touch the database or the LLM are plain `def` functions,
+    # so FastAPI runs them in this worker threadpool instead of on the event loop.
+    to_thread.current_default_thread_limiter().total_tokens = settings.API_THREADPOOL_SIZE
     init_db()
     seed_database()
+    insight_jobs.resume_jobs()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared LLM connection pools"""
+    await close_llm()
 
 
 @app.get("/health")
@@ -47,38 +91,33 @@ async def health_check():
 
 
 @app.get("/overview-metrics")
-async def get_overview_metrics(db: Session = Depends(get_db)):
-    """Get overview dashboard metrics"""
-    
+def get_overview_metrics(request: Request, db: Session = Depends(get_db)):
+    """Get overview dashboard metrics (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_overview_metrics(db))
+
+
+def compute_overview_metrics(db: Session) -> dict:
+    """Compute overview dashboard metrics"""
+    return overview_metrics(analytics.episode_kpis(db), analytics.incident_kpis(db), analytics.data_quality_kpis(db))
+
+
+def overview_metrics(episodes: dict, incidents: dict, dq: dict) -> dict:
+    """Format the overview KPI cards from the episode, incident and data quality KPIs"""
+
     # Calculate readmission rate
-    total_episodes = db.query(PatientEpisode).filter(
-        PatientEpisode.discharge_date.isnot(None)
-    ).count()
-    readmitted_count = db.query(PatientEpisode).filter(
-        and_(
-            PatientEpisode.discharge_date.isnot(None),
-            PatientEpisode.readmitted_30d == True
-        )
-    ).count()
+    total_episodes = episodes["discharged"]
+    readmitted_count = episodes["readmitted"]
     readmission_rate = round((readmitted_count / total_episodes * 100), 1) if total_episodes > 0 else 0
     
     # Calculate average length of stay
-    avg_los_result = db.query(func.avg(PatientEpisode.length_of_stay)).filter(
-        PatientEpisode.length_of_stay.isnot(None)
-    ).scalar()
-    avg_los = round(avg_los_result, 1) if avg_los_result else 0
+    avg_los = round(episodes["avg_los"], 1) if episodes["avg_los"] else 0
     
     # Count safety events (last 30 days)
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    safety_events_count = db.query(SafetyIncident).filter(
-        SafetyIncident.date >= thirty_days_ago
-    ).count()
+    safety_events_count = incidents["total"]
     
     # Calculate data quality score
-    total_issues = db.query(DataQualityIssue).count()
-    high_severity_issues = db.query(DataQualityIssue).filter(
-        DataQualityIssue.severity == "High"
-    ).count()
+    total_issues = dq["total"]
+    high_severity_issues = dq["high_severity"]
     # Simple scoring: 100 - (high issues * 2) - (total issues * 0.1)
     quality_score = max(0, min(100, round(100 - (high_severity_issues * 2) - (total_issues * 0.1), 1)))
     
@@ -118,84 +157,97 @@ async def get_overview_metrics(db: Session = Depends(get_db)):
     }
 
 
+def filter_episodes(
+    query,
+    unit: Optional[str],
+    risk_level: Optional[str],
+    diagnosis: Optional[str],
+    admitted_from: Optional[date],
+    admitted_to: Optional[date],
+):
+    """Apply the episode list filters ("All" or None means no filter)"""
+    if unit and unit != "All":
+        query = query.filter(PatientEpisode.unit == unit)
+    
+    if diagnosis and diagnosis != "All":
+        query = query.filter(PatientEpisode.primary_diagnosis == diagnosis)
+    
+    if admitted_from:
+        query = query.filter(PatientEpisode.admit_date >= datetime.combine(admitted_from, time.min))
+    
+    if admitted_to:
+        query = query.filter(PatientEpisode.admit_date < datetime.combine(admitted_to + timedelta(days=1), time.min))
+    
+    if risk_level and risk_level != "All":
+        query = query.filter(PatientEpisode.risk_level == risk_level)
+    
+    return query
+
+
 @app.get("/readmissions/list")
-async def get_readmissions_list(
+def get_readmissions_list(
     unit: Optional[str] = Query(None, description="Filter by unit"),
     risk_level: Optional[str] = Query(None, description="Filter by risk level (Low, Medium, High)"),
+    diagnosis: Optional[str] = Query(None, description="Filter by primary diagnosis"),
+    admitted_from: Optional[date] = Query(None, description="Only episodes admitted on or after this date"),
+    admitted_to: Optional[date] = Query(None, description="Only episodes admitted on or before this date"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of episodes per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or * for all (narrative text is excluded by default)"),
     db: Session = Depends(get_db)
 ):
-    """Get list of patient episodes with readmission risks"""
+    """Get a page of patient episodes with readmission risks, highest risk first
+
+    The next page's cursor is returned in the X-Next-Cursor header (absent on the last page).
+    """
     
-    query = db.query(PatientEpisode)
+    selected = parse_fields(fields, EPISODE_FIELDS, EPISODE_LIST_FIELDS)
+    # The keyset columns are always needed to build the next cursor
+    query = project(
+        db.query(PatientEpisode),
+        EPISODE_FIELDS,
+        selected,
+        always=(PatientEpisode.id, PatientEpisode.readmission_risk_score),
+    )
     
-    # Apply filters
-    if unit and unit != "All":
-        query = query.filter(PatientEpisode.unit == unit)
+    query = filter_episodes(query, unit, risk_level, diagnosis, admitted_from, admitted_to)
     
-    if risk_level and risk_level != "All":
-        # Determine risk level based on score
-        if risk_level == "High":
-            query = query.filter(PatientEpisode.readmission_risk_score >= 0.7)
-        elif risk_level == "Medium":
-            query = query.filter(
-                and_(
-                    PatientEpisode.readmission_risk_score >= 0.4,
-                    PatientEpisode.readmission_risk_score < 0.7
-                )
-            )
-        elif risk_level == "Low":
-            query = query.filter(PatientEpisode.readmission_risk_score < 0.4)
-    
-    episodes = query.order_by(PatientEpisode.readmission_risk_score.desc().nulls_last()).all()
+    if cursor:
+        query = after_risk_cursor(query, cursor)
     
-    return [
-        {
-            "id": ep.episode_id,
-            "patientId": ep.patient_id,
-            "patientName": ep.patient_name,
-            "unit": ep.unit,
-            "admissionDate": ep.admit_date.isoformat(),
-            "dischargeDate": ep.discharge_date.isoformat() if ep.discharge_date else None,
-            "riskLevel": "High" if ep.readmission_risk_score and ep.readmission_risk_score >= 0.7 else "Medium" if ep.readmission_risk_score and ep.readmission_risk_score >= 0.4 else "Low",
-            "los": ep.length_of_stay,
-            "diagnosis": ep.primary_diagnosis,
-            "summary": ep.summary,
-            "riskExplanation": ep.risk_explanation,
-            "nextBestAction": ep.next_best_action,
-        }
-        for ep in episodes
-    ]
+    # Keyset pagination: fetch one extra row to know whether another page exists
+    episodes = query.order_by(
+        PatientEpisode.readmission_risk_score.desc().nulls_last(),
+        PatientEpisode.id,
+    ).limit(limit + 1).all()
+    
+    headers = {}
+    if len(episodes) > limit:
+        episodes = episodes[:limit]
+        last = episodes[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.readmission_risk_score, last.id)
+    
+    return FastJSONResponse(serialize_rows(episodes, EPISODE_FIELDS, selected), headers=headers)
 
 
 @app.get("/readmissions/high-risk")
-async def get_high_risk_readmissions(db: Session = Depends(get_db)):
+def get_high_risk_readmissions(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or * for all (narrative text is excluded by default)"),
+    db: Session = Depends(get_db)
+):
     """Get high-risk readmission episodes"""
     
-    episodes = db.query(PatientEpisode).filter(
-        PatientEpisode.readmission_risk_score >= 0.7
+    selected = parse_fields(fields, EPISODE_FIELDS, EPISODE_LIST_FIELDS)
+    query = project(db.query(PatientEpisode), EPISODE_FIELDS, selected)
+    episodes = query.filter(
+        PatientEpisode.risk_level == "High"
     ).order_by(PatientEpisode.readmission_risk_score.desc()).limit(20).all()
     
-    return [
-        {
-            "id": ep.episode_id,
-            "patientId": ep.patient_id,
-            "patientName": ep.patient_name,
-            "unit": ep.unit,
-            "admissionDate": ep.admit_date.isoformat(),
-            "dischargeDate": ep.discharge_date.isoformat() if ep.discharge_date else None,
-            "riskLevel": "High",
-            "los": ep.length_of_stay,
-            "diagnosis": ep.primary_diagnosis,
-            "summary": ep.summary,
-            "riskExplanation": ep.risk_explanation,
-            "nextBestAction": ep.next_best_action,
-        }
-        for ep in episodes
-    ]
+    return FastJSONResponse(serialize_rows(episodes, EPISODE_FIELDS, selected))
 
 
 @app.get("/readmissions/{episode_id}")
-async def get_episode_by_id(episode_id: str, db: Session = Depends(get_db)):
+def get_episode_by_id(episode_id: str, db: Session = Depends(get_db)):
     """Get a specific episode by ID"""
     
     episode = db.query(PatientEpisode).filter(
@@ -205,9 +257,6 @@ async def get_episode_by_id(episode_id: str, db: Session = Depends(get_db)):
     if not episode:
         raise HTTPException(status_code=404, detail="Episode not found")
     
-    risk_score = episode.readmission_risk_score or 0
-    risk_level = "High" if risk_score >= 0.7 else "Medium" if risk_score >= 0.4 else "Low"
-    
     return {
         "id": episode.episode_id,
         "patientId": episode.patient_id,
@@ -215,7 +264,7 @@ async def get_episode_by_id(episode_id: str, db: Session = Depends(get_db)):
         "unit": episode.unit,
         "admissionDate": episode.admit_date.isoformat(),
         "dischargeDate": episode.discharge_date.isoformat() if episode.discharge_date else None,
-        "riskLevel": risk_level,
+        "riskLevel": episode.risk_level,
         "los": episode.length_of_stay,
         "diagnosis": episode.primary_diagnosis,
         "summary": episode.summary_text or episode.summary,  # Prefer AI-generated summary
@@ -227,57 +276,34 @@ async def get_episode_by_id(episode_id: str, db: Session = Depends(get_db)):
 
 
 @app.get("/quality/incidents")
-async def get_safety_incidents(db: Session = Depends(get_db)):
+def get_safety_incidents(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or * for all"),
+    db: Session = Depends(get_db)
+):
     """Get safety incidents"""
     
-    incidents = db.query(SafetyIncident).order_by(SafetyIncident.date.desc()).all()
+    selected = parse_fields(fields, INCIDENT_FIELDS, INCIDENT_LIST_FIELDS)
+    query = project(db.query(SafetyIncident), INCIDENT_FIELDS, selected)
+    incidents = query.order_by(SafetyIncident.date.desc()).all()
     
-    return [
-        {
-            "id": inc.incident_id,
-            "date": inc.date.isoformat(),
-            "category": inc.category,
-            "severity": inc.severity,
-            "description": inc.description,
-            "unit": inc.unit,
-            "status": inc.status,
-        }
-        for inc in incidents
-    ]
+    return FastJSONResponse(serialize_rows(incidents, INCIDENT_FIELDS, selected))
 
 
 @app.get("/quality/incidents/summary")
-async def get_safety_incidents_summary(db: Session = Depends(get_db)):
-    """Get safety incidents summary and KPIs"""
-    
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    # Count by category
-    falls_count = db.query(SafetyIncident).filter(
-        and_(
-            SafetyIncident.category == "Falls",
-            SafetyIncident.date >= thirty_days_ago
-        )
-    ).count()
-    
-    med_errors_count = db.query(SafetyIncident).filter(
-        and_(
-            SafetyIncident.category == "Medication Error",
-            SafetyIncident.date >= thirty_days_ago
-        )
-    ).count()
+def get_safety_incidents_summary(request: Request, db: Session = Depends(get_db)):
+    """Get safety incidents summary and KPIs (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_safety_incidents_summary(db))
+
+
+def compute_safety_incidents_summary(db: Session) -> dict:
+    """Compute safety incidents summary and KPIs"""
     
-    total_incidents = db.query(SafetyIncident).filter(
-        SafetyIncident.date >= thirty_days_ago
-    ).count()
+    incidents = analytics.incident_kpis(db)
+    categories = incidents["by_category"]
     
-    # Category distribution for pie chart
-    categories = db.query(
-        SafetyIncident.category,
-        func.count(SafetyIncident.id).label("count")
-    ).filter(
-        SafetyIncident.date >= thirty_days_ago
-    ).group_by(SafetyIncident.category).all()
+    falls_count = categories.get("Falls", 0)
+    med_errors_count = categories.get("Medication Error", 0)
+    total_incidents = incidents["total"]
     
     return {
         "kpis": {
@@ -302,69 +328,52 @@ async def get_safety_incidents_summary(db: Session = Depends(get_db)):
         },
         "categoryData": [
             {"name": cat, "value": count, "fill": "#ef4444" if cat == "Falls" else "#f59e0b" if cat == "Medication Error" else "#8b5cf6" if cat == "Pressure Injury" else "#3b82f6" if cat == "Infection" else "#6b7280"}
-            for cat, count in categories
+            for cat, count in categories.items()
         ],
     }
 
 
 @app.get("/data-quality/issues")
-async def get_data_quality_issues(db: Session = Depends(get_db)):
+def get_data_quality_issues(db: Session = Depends(get_db)):
     """Get data quality issues"""
-    
-    issues = db.query(DataQualityIssue).order_by(
-        func.case(
+    return FastJSONResponse(list_data_quality_issues(db))
+
+
+def data_quality_issues_query(db: Session, selected: list):
+    """Data quality issues, most severe and most recently updated first"""
+    query = project(db.query(DataQualityIssue), DATA_QUALITY_FIELDS, selected)
+    return query.order_by(
+        case(
             (DataQualityIssue.severity == "High", 1),
             (DataQualityIssue.severity == "Medium", 2),
             (DataQualityIssue.severity == "Low", 3),
             else_=4
         ),
         DataQualityIssue.last_updated.desc()
-    ).all()
-    
-    return [
-        {
-            "id": f"DQ{str(iss.id).zfill(6)}",
-            "recordId": iss.record_id,
-            "unit": iss.unit,
-            "issueType": iss.issue_type,
-            "field": iss.field,
-            "description": iss.description,
-            "severity": iss.severity,
-            "lastUpdated": iss.last_updated.isoformat(),
-        }
-        for iss in issues
-    ]
+    )
+
+
+def list_data_quality_issues(db: Session) -> list:
+    """The /data-quality/issues payload"""
+    issues = data_quality_issues_query(db, DATA_QUALITY_LIST_FIELDS).all()
+    return serialize_rows(issues, DATA_QUALITY_FIELDS, DATA_QUALITY_LIST_FIELDS)
 
 
 @app.get("/data-quality/metrics")
-async def get_data_quality_metrics(db: Session = Depends(get_db)):
-    """Get data quality metrics and KPIs"""
-    
-    # Count by issue type
-    invalid_count = db.query(DataQualityIssue).filter(
-        DataQualityIssue.issue_type == "Invalid"
-    ).count()
-    
-    missing_count = db.query(DataQualityIssue).filter(
-        DataQualityIssue.issue_type == "Missing"
-    ).count()
-    
-    duplicate_count = db.query(DataQualityIssue).filter(
-        DataQualityIssue.issue_type == "Duplicate"
-    ).count()
-    
-    stale_count = db.query(DataQualityIssue).filter(
-        DataQualityIssue.issue_type == "Stale"
-    ).count()
-    
-    # Count by unit for chart
-    unit_stats = db.query(
-        DataQualityIssue.unit,
-        func.sum(func.case((DataQualityIssue.issue_type == "Invalid", 1), else_=0)).label("invalid"),
-        func.sum(func.case((DataQualityIssue.issue_type == "Missing", 1), else_=0)).label("missing"),
-        func.sum(func.case((DataQualityIssue.issue_type == "Duplicate", 1), else_=0)).label("duplicates"),
-        func.sum(func.case((DataQualityIssue.issue_type == "Stale", 1), else_=0)).label("stale"),
-    ).group_by(DataQualityIssue.unit).all()
+def get_data_quality_metrics(request: Request, db: Session = Depends(get_db)):
+    """Get data quality metrics and KPIs (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_data_quality_metrics(db))
+
+
+def compute_data_quality_metrics(db: Session) -> dict:
+    """Compute data quality metrics and KPIs"""
+    
+    dq = analytics.data_quality_kpis(db)
+    
+    invalid_count = dq["by_type"]["invalid"]
+    missing_count = dq["by_type"]["missing"]
+    duplicate_count = dq["by_type"]["duplicates"]
+    stale_count = dq["by_type"]["stale"]
     
     return {
         "kpis": {
@@ -393,65 +402,44 @@ async def get_data_quality_metrics(db: Session = Depends(get_db)):
                 "change": f"+{random.randint(1, 5)}" if random.random() > 0.5 else f"-{random.randint(1, 4)}",
             },
         },
-        "byUnit": [
-            {
-                "name": unit,
-                "invalid": int(inv or 0),
-                "missing": int(miss or 0),
-                "duplicates": int(dup or 0),
-                "stale": int(stale or 0),
-            }
-            for unit, inv, miss, dup, stale in unit_stats
-        ],
+        "byUnit": dq["by_unit"],
     }
 
 
 @app.get("/risk-distribution")
-async def get_risk_distribution(db: Session = Depends(get_db)):
-    """Get risk level distribution for overview page"""
-    
-    total = db.query(PatientEpisode).count()
-    
-    high_count = db.query(PatientEpisode).filter(
-        PatientEpisode.readmission_risk_score >= 0.7
-    ).count()
-    
-    medium_count = db.query(PatientEpisode).filter(
-        and_(
-            PatientEpisode.readmission_risk_score >= 0.4,
-            PatientEpisode.readmission_risk_score < 0.7
-        )
-    ).count()
-    
-    low_count = db.query(PatientEpisode).filter(
-        or_(
-            PatientEpisode.readmission_risk_score < 0.4,
-            PatientEpisode.readmission_risk_score.is_(None)
-        )
-    ).count()
-    
+def get_risk_distribution(request: Request, db: Session = Depends(get_db)):
+    """Get risk level distribution for overview page (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_risk_distribution(db))
+
+
+def compute_risk_distribution(db: Session) -> list:
+    """Compute risk level distribution for overview page"""
+    return risk_distribution(analytics.episode_kpis(db)["risk"])
+
+
+def risk_distribution(risk: dict) -> list:
+    """Format the Low/Medium/High episode counts for the risk distribution chart"""
     return [
-        {"name": "Low", "value": low_count, "color": "#10b981"},
-        {"name": "Medium", "value": medium_count, "color": "#f59e0b"},
-        {"name": "High", "value": high_count, "color": "#ef4444"},
+        {"name": "Low", "value": risk["Low"], "color": "#10b981"},
+        {"name": "Medium", "value": risk["Medium"], "color": "#f59e0b"},
+        {"name": "High", "value": risk["High"], "color": "#ef4444"},
     ]
 
 
 @app.get("/health-trends")
-async def get_health_trends(db: Session = Depends(get_db)):
-    """Get health trends data for overview page"""
+def get_health_trends(request: Request, db: Session = Depends(get_db)):
+    """Get health trends data for overview page (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_health_trends(db))
+
+
+def compute_health_trends(db: Session) -> list:
+    """Compute health trends data for overview page"""
     
     # Get last 6 months of data
     six_months_ago = datetime.now() - timedelta(days=180)
     
     # Aggregate by month
-    trends = db.query(
-        func.strftime("%Y-%m", PatientEpisode.admit_date).label("month"),
-        func.count(PatientEpisode.id).label("episodes"),
-        func.sum(func.case((PatientEpisode.readmitted_30d == True, 1), else_=0)).label("readmissions"),
-    ).filter(
-        PatientEpisode.admit_date >= six_months_ago
-    ).group_by("month").order_by("month").all()
+    trends = analytics.monthly_trends(db, six_months_ago)
     
     # Format for frontend
     month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
@@ -466,10 +454,120 @@ async def get_health_trends(db: Session = Depends(get_db)):
     ]
 
 
+# ==================== Page Endpoints ====================
+# One request per dashboard page. Every panel is built in one DB session from a
+# single set of KPI queries, and the page payload is cached and coalesced like
+# the single-panel endpoints above.
+
+@app.get("/pages/overview")
+def get_overview_page(request: Request, db: Session = Depends(get_db)):
+    """Get every panel of the overview page (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_overview_page(db))
+
+
+def compute_overview_page(db: Session) -> dict:
+    """KPI cards, risk distribution and health trends for the overview page"""
+    episodes = analytics.episode_kpis(db)
+    return {
+        "metrics": overview_metrics(episodes, analytics.incident_kpis(db), analytics.data_quality_kpis(db)),
+        "riskDistribution": risk_distribution(episodes["risk"]),
+        "healthTrends": compute_health_trends(db),
+    }
+
+
+@app.get("/pages/quality-safety")
+def get_quality_safety_page(request: Request, db: Session = Depends(get_db)):
+    """Get every panel of the quality & safety page (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_quality_safety_page(db))
+
+
+def compute_quality_safety_page(db: Session) -> dict:
+    """Incident KPIs, category chart and the High/Critical incidents table"""
+    summary = compute_safety_incidents_summary(db)
+    query = project(db.query(SafetyIncident), INCIDENT_FIELDS, INCIDENT_LIST_FIELDS)
+    incidents = query.filter(
+        SafetyIncident.severity.in_(("High", "Critical"))
+    ).order_by(SafetyIncident.date.desc()).all()
+    return {
+        **summary,
+        "incidents": serialize_rows(incidents, INCIDENT_FIELDS, INCIDENT_LIST_FIELDS),
+    }
+
+
+@app.get("/pages/data-quality")
+def get_data_quality_page(request: Request, db: Session = Depends(get_db)):
+    """Get every panel of the data quality page (cached, supports If-None-Match)"""
+    return cached_json_response(request, lambda: compute_data_quality_page(db))
+
+
+def compute_data_quality_page(db: Session) -> dict:
+    """Data quality KPIs, per-unit chart and the issues table"""
+    return {
+        **compute_data_quality_metrics(db),
+        "issues": list_data_quality_issues(db),
+    }
+
+
+@app.get("/export/episodes")
+def export_episodes(
+    format: str = Query("ndjson", description="ndjson, csv or arrow (Arrow IPC stream, requires pyarrow)"),
+    unit: Optional[str] = Query(None, description="Filter by unit"),
+    risk_level: Optional[str] = Query(None, description="Filter by risk level (Low, Medium, High)"),
+    diagnosis: Optional[str] = Query(None, description="Filter by primary diagnosis"),
+    admitted_from: Optional[date] = Query(None, description="Only episodes admitted on or after this date"),
+    admitted_to: Optional[date] = Query(None, description="Only episodes admitted on or before this date"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, or * for all (narrative text is excluded by default)"),
+    db: Session = Depends(get_db)
+):
+    """Stream every matching episode, highest risk first, in the same filters and fields as /readmissions/list"""
+    selected = parse_fields(fields, EPISODE_FIELDS, EPISODE_LIST_FIELDS)
+    query = filter_episodes(
+        project(db.query(PatientEpisode), EPISODE_FIELDS, selected),
+        unit, risk_level, diagnosis, admitted_from, admitted_to,
+    ).order_by(PatientEpisode.readmission_risk_score.desc().nulls_last(), PatientEpisode.id)
+    return export_response(query.statement, EPISODE_FIELDS, selected, format, "episodes")
+
+
+@app.get("/export/incidents")
+def export_incidents(
+    format: str = Query("ndjson", description="ndjson, csv or arrow (Arrow IPC stream, requires pyarrow)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, or * for all"),
+    db: Session = Depends(get_db)
+):
+    """Stream every safety incident, newest first, with the same fields as /quality/incidents"""
+    selected = parse_fields(fields, INCIDENT_FIELDS, INCIDENT_LIST_FIELDS)
+    query = project(db.query(SafetyIncident), INCIDENT_FIELDS, selected).order_by(SafetyIncident.date.desc())
+    return export_response(query.statement, INCIDENT_FIELDS, selected, format, "incidents")
+
+
+@app.get("/export/data-quality")
+def export_data_quality_issues(
+    format: str = Query("ndjson", description="ndjson, csv or arrow (Arrow IPC stream, requires pyarrow)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, or * for all"),
+    db: Session = Depends(get_db)
+):
+    """Stream every data quality issue in the same order and fields as /data-quality/issues"""
+    selected = parse_fields(fields, DATA_QUALITY_FIELDS, DATA_QUALITY_LIST_FIELDS)
+    query = data_quality_issues_query(db, selected)
+    return export_response(query.statement, DATA_QUALITY_FIELDS, selected, format, "data_quality_issues")
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Get response cache hit/miss counters and the number of coalesced requests"""
+    return {**response_cache.stats(), "coalesced": response_flights.coalesced}
+
+
+@app.get("/llm/cache/stats")
+def get_llm_cache_stats():
+    """Get LLM response cache hit rate and tokens saved"""
+    return llm_response_cache.stats()
+
+
 # ==================== AI Endpoints ====================
 
 @app.post("/llm/summary/{episode_id}")
-async def generate_summary(episode_id: str, db: Session = Depends(get_db)):
+def generate_summary(episode_id: str, db: Session = Depends(get_db)):
     """Generate AI summary for a patient episode"""
     
     episode = db.query(PatientEpisode).filter(
@@ -504,7 +602,7 @@ async def generate_summary(episode_id: str, db: Session = Depends(get_db)):
 
 
 @app.post("/llm/risk-explanation/{episode_id}")
-async def generate_risk_explanation_endpoint(episode_id: str, db: Session = Depends(get_db)):
+def generate_risk_explanation_endpoint(episode_id: str, db: Session = Depends(get_db)):
     """Generate AI risk explanation for a patient episode"""
     
     episode = db.query(PatientEpisode).filter(
@@ -537,7 +635,7 @@ async def generate_risk_explanation_endpoint(episode_id: str, db: Session = Depe
 
 
 @app.post("/llm/recommendations/{episode_id}")
-async def generate_recommendations_endpoint(episode_id: str, db: Session = Depends(get_db)):
+def generate_recommendations_endpoint(episode_id: str, db: Session = Depends(get_db)):
     """Generate AI recommendations for a patient episode"""
     
     episode = db.query(PatientEpisode).filter(
@@ -570,32 +668,46 @@ async def generate_recommendations_endpoint(episode_id: str, db: Session = Depen
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
 
 
-@app.post("/llm/generate-all/{episode_id}")
-async def generate_all_insights(episode_id: str, db: Session = Depends(get_db)):
-    """Generate all AI insights (summary, risk explanation, recommendations) for a patient episode"""
-    
+def _get_episode(db: Session, episode_id: str) -> PatientEpisode:
     episode = db.query(PatientEpisode).filter(
         PatientEpisode.episode_id == episode_id
     ).first()
     
     if not episode:
         raise HTTPException(status_code=404, detail="Episode not found")
+    return episode
+
+
+def _save_all_insights(db: Session, episode: PatientEpisode, summary_text: str, explanation: str, recommendations: str):
+    episode.summary_text = summary_text
+    episode.summary = summary_text  # Legacy field
+    episode.risk_explanation = explanation
+    episode.recommendations = recommendations
+    episode.next_best_action = recommendations  # Legacy field
+    episode.ai_generated_at = datetime.now()
+    db.commit()
+    db.refresh(episode)
+
+
+@app.post("/llm/generate-all/{episode_id}")
+async def generate_all_insights(episode_id: str, db: Session = Depends(get_db)):
+    """Generate all AI insights (summary, risk explanation, recommendations) for a patient episode
+
+    The three generations run concurrently, each with its own timeout and
+    fallback, so the request takes about as long as the slowest one. Database
+    work runs in the threadpool to keep the event loop free.
+    """
+    
+    episode = await run_in_threadpool(_get_episode, db, episode_id)
     
     try:
-        # Generate all AI insights
-        summary_text = generate_episode_summary(episode)
-        explanation = generate_risk_explanation(episode)
-        recommendations = generate_next_best_action(episode)
+        summary_text, explanation, recommendations = await asyncio.gather(
+            agenerate_episode_summary(episode),
+            agenerate_risk_explanation(episode),
+            agenerate_next_best_action(episode),
+        )
         
-        # Save all to database
-        episode.summary_text = summary_text
-        episode.summary = summary_text  # Legacy field
-        episode.risk_explanation = explanation
-        episode.recommendations = recommendations
-        episode.next_best_action = recommendations  # Legacy field
-        episode.ai_generated_at = datetime.now()
-        db.commit()
-        db.refresh(episode)
+        await run_in_threadpool(_save_all_insights, db, episode, summary_text, explanation, recommendations)
         
         return {
             "episode_id": episode_id,
@@ -607,7 +719,59 @@ async def generate_all_insights(episode_id: str, db: Session = Depends(get_db)):
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
 
+@app.post("/llm/summary/{episode_id}/stream")
+async def stream_summary(episode_id: str, db: Session = Depends(get_db)):
+    """Stream an AI summary as Server-Sent Events, saving it to the episode when complete"""
+    
+    episode = await run_in_threadpool(_get_episode, db, episode_id)
+    return await stream_insight(episode_id, "summary", astream_episode_summary(episode))
+
+
+@app.post("/llm/risk-explanation/{episode_id}/stream")
+async def stream_risk_explanation(episode_id: str, db: Session = Depends(get_db)):
+    """Stream an AI risk explanation as Server-Sent Events, saving it to the episode when complete"""
+    
+    episode = await run_in_threadpool(_get_episode, db, episode_id)
+    return await stream_insight(episode_id, "risk_explanation", astream_risk_explanation(episode))
+
+
+@app.post("/llm/recommendations/{episode_id}/stream")
+async def stream_recommendations(episode_id: str, db: Session = Depends(get_db)):
+    """Stream AI recommendations as Server-Sent Events, saving them to the episode when complete"""
+    
+    episode = await run_in_threadpool(_get_episode, db, episode_id)
+    return await stream_insight(episode_id, "recommendations", astream_next_best_action(episode))
+
+
+@app.post("/llm/jobs", status_code=202)
+def create_insight_job(request: InsightJobCreate, db: Session = Depends(get_db)):
+    """Start a background job generating all AI insights for a cohort of episodes
+
+    Poll GET /llm/jobs/{job_id} for progress. Unfinished jobs resume on restart.
+    """
+    
+    if request.risk_level and request.risk_level not in RISK_LEVELS:
+        raise HTTPException(status_code=400, detail=f"risk_level must be one of {', '.join(RISK_LEVELS)}")
+    
+    job = insight_jobs.create_job(
+        db,
+        unit=request.unit,
+        risk_level=request.risk_level,
+        missing_only=request.missing_only,
+    )
+    insight_jobs.start_job(job.id)
+    return insight_jobs.job_to_dict(job)
+
+
+@app.get("/llm/jobs/{job_id}")
+def get_insight_job(job_id: int, db: Session = Depends(get_db)):
+    """Get the status and progress of an insight generation job"""
+    
+    job = db.get(InsightJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return insight_jobs.job_to_dict(job)
@@ -0,0 +1,44 @@
+import base64
+import json
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from ..models.db_models import PatientEpisode
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(score: Optional[float], row_id: int) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps([score, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[float], int]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if score is not None:
+            score = float(score)
+        return score, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_risk_cursor(query, cursor: str):
+    """
+    Restrict a query ordered by (readmission_risk_score DESC NULLS LAST, id)
+    to the rows after the cursor position.
+    """
+    score, row_id = decode_cursor(cursor)
+    risk_score = PatientEpisode.readmission_risk_score
+    if score is None:
+        return query.filter(and_(risk_score.is_(None), PatientEpisode.id > row_id))
+    return query.filter(
+        or_(
+            risk_score < score,
+            and_(risk_score == score, PatientEpisode.id > row_id),
+            risk_score.is_(None),
+        )
+    )
@@ -0,0 +1,80 @@
+import json
+from datetime import datetime
+from typing import AsyncIterator
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..db import SessionLocal
+from ..llm.jobs import apply_insights
+from ..models.db_models import PatientEpisode
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Stop nginx from buffering the stream
+}
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _save_insight(episode_id: str, field: str, text: str) -> datetime:
+    # The request's session is closed once streaming starts, so write back with a fresh one
+    db = SessionLocal()
+    try:
+        episode = db.query(PatientEpisode).filter(PatientEpisode.episode_id == episode_id).one()
+        apply_insights(episode, {field: text})
+        db.commit()
+        return episode.ai_generated_at
+    finally:
+        db.close()
+
+
+async def stream_insight(episode_id: str, field: str, chunks: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Relay a streaming generation to the client as Server-Sent Events.
+
+    Emits ``token`` events ({"text": chunk}) as the model produces them, then
+    saves the full text to the episode and emits a ``done`` event with it. A
+    failure mid-stream emits an ``error`` event and saves nothing; so does a
+    client disconnect, which cancels the stream.
+
+    Args:
+        episode_id: Episode the insight belongs to
+        field: Insight name ("summary", "risk_explanation" or "recommendations")
+        chunks: Text chunk stream from one of the llm astream_* generators
+    """
+    # Wait for the first chunk so configuration errors still get a proper HTTP status
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating {field.replace('_', ' ')}: {str(e)}")
+
+    async def events():
+        parts = [first]
+        try:
+            if first:
+                yield sse_event("token", {"text": first})
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield sse_event("token", {"text": chunk})
+        except Exception as e:
+            yield sse_event("error", {"detail": f"Error generating {field.replace('_', ' ')}: {str(e)}"})
+            return
+        finally:
+            await chunks.aclose()
+
+        text = "".join(parts).strip()
+        generated_at = await run_in_threadpool(_save_insight, episode_id, field, text)
+        yield sse_event("done", {
+            "episode_id": episode_id,
+            field: text,
+            "generated_at": generated_at.isoformat() if generated_at else None,
+        })
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
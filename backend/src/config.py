@@ -1,9 +1,22 @@
 from pydantic_settings import BaseSettings
-from typing import ClassVar
+from typing import ClassVar, Literal, Optional
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./healthcare.db"
+    # Connection pool (PostgreSQL and file-backed SQLite); size it to API_THREADPOOL_SIZE
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    # PostgreSQL only: test connections before use and replace them before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # SQLite connection PRAGMAs (src/db.py)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268_435_456  # 256 MiB of the file memory-mapped
+    SQLITE_CACHE_SIZE: int = -65_536  # Negative is KiB (64 MiB) per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for a lock instead of failing with "database is locked"
     API_V1_PREFIX: str = ""
     CORS_ORIGINS: ClassVar[list[str]] = [
         "http://localhost:5173",
@@ -12,6 +25,44 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_TEMPERATURE: float = 0.3
+    OPENAI_BASE_URL: Optional[str] = None  # OpenAI-compatible endpoint (proxy, gateway or mock server)
+    # Keep-alive connection pool shared by every LLM call in the process
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    # Per-generation timeout for concurrent LLM calls; slower calls use the fallback text
+    LLM_TIMEOUT_SECONDS: float = 30
+    # Persistent LLM completion cache keyed on model, temperature and rendered prompt
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "./llm_cache.db"
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    # Bulk insight generation jobs (/llm/jobs)
+    INSIGHT_JOB_CONCURRENCY: int = 4
+    INSIGHT_JOB_BATCH_SIZE: int = 20
+    INSIGHT_JOB_PROMPT_BATCH_SIZE: int = 5  # Episodes per completion; 1 sends three prompts per episode
+    INSIGHT_JOB_RATE_LIMIT_PER_SECOND: float = 5.0  # LLM calls per second across all jobs in one server process
+    INSIGHT_JOB_MAX_RETRIES: int = 3
+    INSIGHT_JOB_RETRY_BACKOFF_SECONDS: float = 1.0
+    INSIGHT_JOB_STALE_SECONDS: int = 600  # A running job with no committed batch for this long can be reclaimed
+    # Max concurrent worker threads for blocking (DB / LLM) request handlers
+    API_THREADPOOL_SIZE: int = 40
+    # In-process cache for dashboard aggregate responses
+    RESPONSE_CACHE_TTL_SECONDS: float = 60
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256
+    # Engine behind the dashboard aggregates: "sql" (rollup tables) or "columnar"
+    # (in-memory pandas column store, analytics/columnar.py)
+    ANALYTICS_ENGINE: Literal["sql", "columnar"] = "sql"
+    # Rebuild the column store at least this often, to pick up ETL runs in other processes
+    ANALYTICS_COLUMNAR_MAX_AGE_SECONDS: float = 300
+    # Rows fetched and encoded per chunk by the streaming /export endpoints
+    EXPORT_BATCH_SIZE: int = 5000
+    # Negotiated gzip / Brotli response compression (api/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Cached responses are compressed once per cache entry, so they use higher levels
+    COMPRESSION_CACHED_GZIP_LEVEL: int = 9
+    COMPRESSION_CACHED_BROTLI_QUALITY: int = 9
 
     class Config:
         env_file = ".env"
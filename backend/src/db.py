@@ -1,13 +1,69 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .utils.risk import risk_level_expression
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=False,
-)
+# Set on every new SQLite connection. WAL lets dashboard reads run while a
+# write-back commits; synchronous=NORMAL is durable against application
+# crashes in WAL mode and only fsyncs at checkpoints.
+SQLITE_PRAGMAS = {
+    "journal_mode": settings.SQLITE_JOURNAL_MODE,
+    "synchronous": settings.SQLITE_SYNCHRONOUS,
+    "mmap_size": settings.SQLITE_MMAP_SIZE,
+    "cache_size": settings.SQLITE_CACHE_SIZE,
+    "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+}
+
+
+def create_db_engine(url: str, sqlite_pragmas: Optional[dict] = None) -> Engine:
+    """
+    Create an engine with the pool and connection settings from config.
+
+    Args:
+        url: Database URL
+        sqlite_pragmas: PRAGMAs for SQLite connections (defaults to SQLITE_PRAGMAS)
+    """
+    parsed = make_url(url)
+    pool = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if parsed.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            echo=False,
+            **pool,
+        )
+
+    # In-memory databases use a single-connection pool that takes no sizing options
+    in_memory = parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+    sqlite_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        echo=False,
+        **({} if in_memory else pool),
+    )
+    pragmas = SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return sqlite_engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -16,7 +72,49 @@ Base = declarative_base()
 
 def init_db():
     """Create all database tables"""
+    from .models import db_models  # noqa: F401  (registers the tables on Base.metadata)
     Base.metadata.create_all(bind=engine)
+    migrate_db()
+
+
+def migrate_db():
+    """Bring an existing database up to the current schema
+
+    create_all() only creates missing tables, so columns and indexes added to
+    existing tables are created here. Every step is idempotent.
+    """
+    added = _add_missing_columns()
+
+    if ("patient_episodes", "risk_level") in added:
+        episodes = Base.metadata.tables["patient_episodes"]
+        with engine.begin() as conn:
+            conn.execute(episodes.update().values(
+                risk_level=risk_level_expression(episodes.c.readmission_risk_score)
+            ))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _add_missing_columns() -> set:
+    """ALTER TABLE ADD COLUMN for model columns the database does not have yet"""
+    inspector = inspect(engine)
+    added = set()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                default = column.server_default.arg if column.server_default is not None else None
+                if isinstance(default, str):
+                    # NOT NULL columns can only be added with a default to fill existing rows
+                    ddl += f" DEFAULT '{default}'" + ("" if column.nullable else " NOT NULL")
+                conn.exec_driver_sql(ddl)
+                added.add((table.name, column.name))
+    return added
 
 
 def get_db():
@@ -0,0 +1,405 @@
+"""
+Bulk loader for CSV and Parquet extracts.
+
+Extracts use the table's column names (e.g. episode_id, admit_date). Rows are
+validated and transformed column-wise with pandas, then inserted with Core
+executemany batches in a single transaction, bypassing the ORM. Optional
+columns an extract leaves out are not written, so upserting it keeps the values
+already stored for them; narrative text is only written when a row is first
+inserted, since AI write-backs replace it afterwards. KPI rollups
+for the days the extract covers are refreshed in the same transaction, and
+cached dashboard responses are invalidated once it commits.
+
+Usage:
+    python -m src.etl.bulk_load episodes discharges.csv
+    python -m src.etl.bulk_load incidents incidents.parquet --batch-size 20000
+"""
+import argparse
+import os
+import time
+from typing import Iterator, Optional
+import pandas as pd
+from sqlalchemy import insert, select, func
+from sqlalchemy.engine import Connection
+from ..db import engine
+from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue
+from ..analytics.rollups import ROLLUPS, refresh_rollups
+from ..utils.cache import invalidate_caches
+from ..utils.risk import risk_levels_for_scores
+
+DEFAULT_BATCH_SIZE = 10_000
+
+TRUE_VALUES = ("1", "true", "t", "yes", "y")
+
+
+def read_extract(path: str, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Read a CSV or Parquet extract into a DataFrame.
+
+    Args:
+        path: .csv (optionally compressed, e.g. .csv.gz) or .parquet file
+        columns: Only read these columns (Parquet only; CSV reads all)
+
+    Returns:
+        DataFrame with every column as read from the file
+    """
+    if path.endswith(".parquet"):
+        try:
+            return pd.read_parquet(path, columns=columns)
+        except ImportError as e:
+            raise RuntimeError("Reading Parquet extracts requires pyarrow: pip install pyarrow") from e
+    # Keep identifiers as text (e.g. leading zeros); dates and numbers are parsed below
+    return pd.read_csv(path, dtype=str, keep_default_na=True)
+
+
+def iter_extract(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet extract as DataFrames of at most chunk_size rows.
+
+    Only one chunk is held in memory at a time, whatever the file size.
+    """
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Reading Parquet extracts requires pyarrow: pip install pyarrow") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+    with pd.read_csv(path, dtype=str, keep_default_na=True, chunksize=chunk_size) as reader:
+        yield from reader
+
+
+def _require_columns(df: pd.DataFrame, required: tuple, optional: tuple) -> pd.DataFrame:
+    # Optional columns the extract lacks are added as None so the transforms can
+    # run; prepare functions drop them again with _drop_absent
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"Extract is missing required columns: {', '.join(missing)}")
+    df = df[[c for c in required + optional if c in df.columns]].copy()
+    for column in optional:
+        if column not in df.columns:
+            df[column] = None
+    return df
+
+
+def _drop_absent(df: pd.DataFrame, raw: pd.DataFrame, derived: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Drop the columns that neither came from the extract nor were derived from one that did.
+
+    Args:
+        df: Prepared rows
+        raw: The extract they were prepared from
+        derived: {prepared column: extract columns it is computed from}
+    """
+    present = set(raw.columns)
+    absent = [
+        column for column in df.columns
+        if column not in present and not present.intersection((derived or {}).get(column, ()))
+    ]
+    return df.drop(columns=absent)
+
+
+def _strip(series: pd.Series) -> pd.Series:
+    series = series.astype("string").str.strip()
+    return series.mask(series == "")
+
+
+def _to_datetime(series: pd.Series) -> pd.Series:
+    return pd.to_datetime(series, errors="coerce", format="ISO8601")
+
+
+def _to_float(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce")
+
+
+def _to_bool(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.strip().str.lower().isin(TRUE_VALUES).astype(bool)
+
+
+def _with_row_hash(df: pd.DataFrame) -> pd.DataFrame:
+    # Hash of every loaded column, so incremental loads can tell unchanged rows apart
+    hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    return df.assign(row_hash=hashes.map("{:016x}".format))
+
+
+EPISODE_REQUIRED = ("episode_id", "patient_id", "patient_name", "unit", "admit_date", "primary_diagnosis")
+EPISODE_OPTIONAL = (
+    "discharge_date", "length_of_stay", "readmitted_30d", "readmission_risk_score",
+    "summary", "risk_explanation", "next_best_action",
+)
+
+
+# Prepared episode column -> extract columns it is derived from
+EPISODE_DERIVED = {
+    "length_of_stay": ("length_of_stay", "discharge_date"),
+    "risk_level": ("readmission_risk_score",),
+}
+
+
+def prepare_episodes(raw: pd.DataFrame) -> pd.DataFrame:
+    """Validate and type patient episode rows; derive length of stay and risk band"""
+    df = _require_columns(raw, EPISODE_REQUIRED, EPISODE_OPTIONAL)
+    for column in ("episode_id", "patient_id", "patient_name", "unit", "primary_diagnosis"):
+        df[column] = _strip(df[column])
+    df["admit_date"] = _to_datetime(df["admit_date"])
+    df["discharge_date"] = _to_datetime(df["discharge_date"])
+
+    los = _to_float(df["length_of_stay"])
+    derived_los = ((df["discharge_date"] - df["admit_date"]).dt.total_seconds() / 86400).round(1)
+    df["length_of_stay"] = los.fillna(derived_los)
+
+    score = _to_float(df["readmission_risk_score"])
+    df["readmission_risk_score"] = score.where(score.between(0, 1))
+    df["risk_level"] = risk_levels_for_scores(df["readmission_risk_score"])
+    df["readmitted_30d"] = _to_bool(df["readmitted_30d"])
+    df = df.dropna(subset=list(EPISODE_REQUIRED)).drop_duplicates("episode_id", keep="last")
+    return _with_row_hash(_drop_absent(df, raw, EPISODE_DERIVED))
+
+
+INCIDENT_REQUIRED = ("incident_id", "date", "unit", "category", "severity", "status", "description")
+INCIDENT_OPTIONAL = ("episode_id",)
+
+
+def prepare_incidents(raw: pd.DataFrame) -> pd.DataFrame:
+    """Validate and type safety incident rows"""
+    df = _require_columns(raw, INCIDENT_REQUIRED, INCIDENT_OPTIONAL)
+    for column in ("incident_id", "episode_id", "unit", "category", "severity", "status"):
+        df[column] = _strip(df[column])
+    df["date"] = _to_datetime(df["date"])
+    df = df.dropna(subset=list(INCIDENT_REQUIRED)).drop_duplicates("incident_id", keep="last")
+    return _with_row_hash(_drop_absent(df, raw))
+
+
+DQ_REQUIRED = ("record_type", "record_id", "unit", "issue_type", "field", "severity", "description")
+DQ_OPTIONAL = ("last_updated",)
+# Columns that identify a data quality issue, joined into issue_key
+DQ_KEY = ("record_type", "record_id", "field", "issue_type")
+
+
+def prepare_data_quality_issues(raw: pd.DataFrame) -> pd.DataFrame:
+    """Validate and type data quality issue rows (last_updated defaults to now); derive the issue key"""
+    df = _require_columns(raw, DQ_REQUIRED, DQ_OPTIONAL)
+    for column in ("record_type", "record_id", "unit", "issue_type", "field", "severity"):
+        df[column] = _strip(df[column])
+    df["last_updated"] = _to_datetime(df["last_updated"])
+    df = df.dropna(subset=list(DQ_REQUIRED))
+    issue_key = df[DQ_KEY[0]].astype(str)
+    for column in DQ_KEY[1:]:
+        issue_key = issue_key + ":" + df[column].astype(str)
+    df = _with_row_hash(df.assign(issue_key=issue_key).drop_duplicates("issue_key", keep="last"))
+    # Default after hashing, so a row without last_updated hashes the same on every run
+    df["last_updated"] = df["last_updated"].fillna(pd.Timestamp.now())
+    return df
+
+
+# Extract kind -> (model, prepare function, natural key column used for upserts)
+SOURCES = {
+    "episodes": (PatientEpisode, prepare_episodes, "episode_id"),
+    "incidents": (SafetyIncident, prepare_incidents, "incident_id"),
+    "data_quality": (DataQualityIssue, prepare_data_quality_issues, "issue_key"),
+}
+
+
+# Never changed by an upsert: narrative text may have been replaced by AI
+# write-backs (risk_explanation has no separate AI column), and the AI columns
+# and created_at are not ETL data
+PRESERVED_COLUMNS = (
+    "summary", "risk_explanation", "next_best_action",
+    "summary_text", "recommendations", "ai_generated_at", "created_at",
+)
+
+
+def update_columns(columns: list, key: str) -> list:
+    """Columns an upsert of rows with these columns may overwrite on conflict"""
+    return [column for column in columns if column not in (key, "id") and column not in PRESERVED_COLUMNS]
+
+
+def _records(df: pd.DataFrame) -> list:
+    # NaN / NaT / pd.NA become None so the driver writes NULL
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+# How SQLAlchemy's SQLite DateTime type stores values
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _sqlite_rows(df: pd.DataFrame) -> list:
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_datetime64_any_dtype(column):
+            column = column.dt.strftime(SQLITE_DATETIME_FORMAT)
+        elif pd.api.types.is_bool_dtype(column):
+            column = column.astype(int)
+        columns.append(column.astype(object).where(column.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+def _upsert_statement(conn: Connection, table, columns: list, key: str):
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {conn.dialect.name}")
+    stmt = dialect_insert(table)
+    updates = update_columns(columns, key)
+    if not updates:
+        return stmt.on_conflict_do_nothing(index_elements=[key])
+    return stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={column: stmt.excluded[column] for column in updates},
+    )
+
+
+def _insert_batches(conn: Connection, model, df: pd.DataFrame, batch_size: int, key: Optional[str] = None):
+    table = model.__table__
+    columns = list(df.columns)
+    if conn.dialect.name != "sqlite":
+        stmt = _upsert_statement(conn, table, columns, key) if key else insert(table)
+        for start in range(0, len(df), batch_size):
+            conn.execute(stmt, _records(df.iloc[start:start + batch_size]))
+        return
+
+    # SQLite bulk path: positional tuples straight to the driver's executemany,
+    # skipping SQLAlchemy's per-row parameter processing. Columns the frame
+    # lacks get their scalar default on insert, as Core insert() would give them.
+    defaults = {
+        column.name: column.default.arg for column in table.columns
+        if column.name not in columns and column.default is not None and column.default.is_scalar
+    }
+    names = columns + list(defaults)
+    default_values = tuple(defaults.values())
+    sql = f"INSERT INTO {table.name} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+    if key:
+        updates = update_columns(columns, key)
+        if updates:
+            sql += f" ON CONFLICT ({key}) DO UPDATE SET " + ", ".join(f"{column} = excluded.{column}" for column in updates)
+        else:
+            sql += f" ON CONFLICT ({key}) DO NOTHING"
+    for start in range(0, len(df), batch_size):
+        rows = _sqlite_rows(df.iloc[start:start + batch_size])
+        conn.exec_driver_sql(sql, [row + default_values for row in rows] if default_values else rows)
+
+
+def _deferred_indexes(conn: Connection, model, rows: int, batch_size: int) -> list:
+    # Loading a large extract into an empty table, it is cheaper to build the
+    # secondary indexes once at the end than to maintain them row by row. The
+    # DDL runs in the caller's transaction, so a failed load restores them.
+    table = model.__table__
+    if rows <= batch_size or conn.execute(select(table.c.id).limit(1)).first() is not None:
+        return []
+    return [index for index in table.indexes if not index.unique]
+
+
+def affected_day_range(conn: Connection, model, df: pd.DataFrame, key: Optional[str] = None) -> tuple:
+    """
+    Rollup day range covered by rows about to be written, as (min_day, max_day).
+
+    With a natural key, rows that already exist may move to another day, so
+    the current days of those keys are included too.
+    """
+    day_column = ROLLUPS[model][1]
+    days = df[day_column.key]
+    low, high = days.min().date(), days.max().date()
+    if key:
+        key_column = model.__table__.c[key]
+        keys = df[key].tolist()
+        for start in range(0, len(keys), 500):
+            old_low, old_high = conn.execute(
+                select(func.min(day_column), func.max(day_column)).where(key_column.in_(keys[start:start + 500]))
+            ).one()
+            if old_low is not None:
+                low, high = min(low, old_low.date()), max(high, old_high.date())
+    return low, high
+
+
+def insert_frame(
+    conn: Connection,
+    model,
+    df: pd.DataFrame,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    key: Optional[str] = None,
+    refresh: bool = True,
+) -> int:
+    """
+    Insert prepared rows with executemany batches, then refresh the affected rollup days.
+
+    On SQLite the rows go to the driver as tuples with pre-formatted
+    datetimes; other databases get Core insert() batches.
+
+    Args:
+        conn: Connection to run on (use the caller's transaction)
+        model: PatientEpisode, SafetyIncident or DataQualityIssue
+        df: Output of the matching prepare function
+        batch_size: Rows per executemany call
+        key: Natural key column; when given, existing rows are updated in place
+        refresh: Refresh the KPI rollups (callers writing many frames may do it once at the end)
+
+    Returns:
+        Number of rows written
+    """
+    if df.empty:
+        return 0
+
+    day_range = affected_day_range(conn, model, df, key) if refresh else None
+    rebuild_indexes = _deferred_indexes(conn, model, len(df), batch_size)
+    for index in rebuild_indexes:
+        index.drop(conn)
+    _insert_batches(conn, model, df, batch_size, key)
+    for index in rebuild_indexes:
+        index.create(conn)
+
+    if day_range:
+        refresh_rollups(conn, model, *day_range)
+    return len(df)
+
+
+def bulk_load(kind: str, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Load a CSV or Parquet extract into one of the source tables.
+
+    The whole file is inserted in one transaction: rows that fail validation
+    are skipped and counted, while a database error (e.g. an episode_id that
+    already exists) rolls the load back.
+
+    Args:
+        kind: "episodes", "incidents" or "data_quality"
+        path: Extract file
+        batch_size: Rows per executemany call
+
+    Returns:
+        Dict with the rows read, inserted and rejected, and elapsed seconds
+    """
+    model, prepare, _ = SOURCES[kind]
+    start = time.perf_counter()
+    raw = read_extract(path)
+    df = prepare(raw)
+
+    with engine.begin() as conn:
+        inserted = insert_frame(conn, model, df, batch_size)
+    invalidate_caches()
+
+    return {
+        "read": len(raw),
+        "inserted": inserted,
+        "rejected": len(raw) - len(df),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load a CSV or Parquet extract")
+    parser.add_argument("kind", choices=list(SOURCES), help="Table the extract belongs to")
+    parser.add_argument("path", help="Extract file (.csv, .csv.gz or .parquet)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist")
+
+    from ..db import init_db
+    init_db()
+    stats = bulk_load(args.kind, args.path, args.batch_size)
+    print(f"✓ Loaded {stats['inserted']} {args.kind} rows in {stats['seconds']}s ({stats['rejected']} rejected)")
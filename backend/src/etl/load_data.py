@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from ..db import Base, engine, SessionLocal
 from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue
+from ..analytics.rollups import ensure_rollups
 from .synthetic_data import generate_patient_episodes, generate_safety_incidents, generate_data_quality_issues
 
 
@@ -11,7 +12,11 @@ def init_db():
 
 
 def seed_database():
-    """Seed the database with synthetic data if empty"""
+    """Seed the database with synthetic data if empty
+
+    KPI rollups are kept up to date by the session flush listeners in
+    analytics/rollups.py, so the ORM inserts below refresh them as they go.
+    """
     db = SessionLocal()
     try:
         # Check if data already exists
@@ -19,6 +24,7 @@ def seed_database():
         
         if episode_count > 0:
             print(f"✓ Database already contains {episode_count} episodes, skipping seed")
+            ensure_rollups()
             return
         
         print("Seeding database with synthetic data...")
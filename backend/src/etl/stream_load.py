@@ -0,0 +1,155 @@
+"""
+Chunked, resumable loader for extracts larger than memory.
+
+The extract is read chunk_size rows at a time. Each chunk is validated,
+transformed and upserted on its natural key in its own transaction, together
+with an IngestCheckpoint row recording how many chunks are done. Memory use
+is bounded by the chunk size, not the file size. If the load is interrupted,
+running it again on the same file skips the committed chunks and carries on.
+
+KPI rollups are refreshed once, for the whole day range the load touched,
+in the transaction that marks it completed. Until then the dashboards
+reflect the rows loaded before the run started.
+
+Usage:
+    python -m src.etl.stream_load episodes discharges.csv --chunk-size 50000
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from ..db import SessionLocal
+from ..models.db_models import IngestCheckpoint
+from ..analytics.rollups import refresh_rollups
+from ..utils.cache import invalidate_caches
+from .bulk_load import SOURCES, DEFAULT_BATCH_SIZE, iter_extract, insert_frame, affected_day_range
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def _checkpoint(db: Session, kind: str, source: str, chunk_size: int, restart: bool) -> IngestCheckpoint:
+    fingerprint = _fingerprint(source)
+    checkpoint = db.query(IngestCheckpoint).filter(
+        IngestCheckpoint.kind == kind,
+        IngestCheckpoint.source == source,
+        IngestCheckpoint.fingerprint == fingerprint,
+        IngestCheckpoint.chunk_size == chunk_size,
+    ).order_by(IngestCheckpoint.id.desc()).first()
+    if checkpoint is None or restart:
+        checkpoint = IngestCheckpoint(kind=kind, source=source, fingerprint=fingerprint, chunk_size=chunk_size)
+        db.add(checkpoint)
+        db.commit()
+    return checkpoint
+
+
+def _widen(checkpoint: IngestCheckpoint, day_range: tuple):
+    low, high = day_range
+    checkpoint.min_day = low if checkpoint.min_day is None else min(checkpoint.min_day, low)
+    checkpoint.max_day = high if checkpoint.max_day is None else max(checkpoint.max_day, high)
+
+
+def stream_load(
+    kind: str,
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    restart: bool = False,
+    max_chunks: Optional[int] = None,
+) -> dict:
+    """
+    Load an extract chunk by chunk, resuming after the last committed chunk.
+
+    Args:
+        kind: "episodes", "incidents" or "data_quality"
+        path: CSV or Parquet extract
+        chunk_size: Rows read, validated and committed together
+        batch_size: Rows per executemany call within a chunk
+        restart: Ignore any earlier checkpoint for this file and load it again
+        max_chunks: Stop after committing this many chunks in this run (leaves the load resumable)
+
+    Returns:
+        Dict with the checkpoint id, status, chunks and rows processed so far,
+        and the elapsed seconds of this run
+    """
+    model, prepare, key = SOURCES[kind]
+    source = os.path.abspath(path)
+    start = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        checkpoint = _checkpoint(db, kind, source, chunk_size, restart)
+        if checkpoint.status != "completed":
+            checkpoint.status = "running"
+            checkpoint.error = None
+            committed_this_run = 0
+            try:
+                for index, raw in enumerate(iter_extract(source, chunk_size)):
+                    if index < checkpoint.chunks_committed:
+                        continue  # Committed by an earlier run
+                    if max_chunks is not None and committed_this_run >= max_chunks:
+                        break
+                    df = prepare(raw)
+                    conn = db.connection()
+                    if not df.empty:
+                        _widen(checkpoint, affected_day_range(conn, model, df, key))
+                    checkpoint.rows_written += insert_frame(conn, model, df, batch_size, key=key, refresh=False)
+                    checkpoint.rows_read += len(raw)
+                    checkpoint.rows_rejected += len(raw) - len(df)
+                    checkpoint.chunks_committed = index + 1
+                    checkpoint.updated_at = datetime.now()
+                    # The chunk's rows and the checkpoint commit atomically
+                    db.commit()
+                    committed_this_run += 1
+                else:
+                    if checkpoint.min_day is not None:
+                        refresh_rollups(db.connection(), model, checkpoint.min_day, checkpoint.max_day)
+                    checkpoint.status = "completed"
+                    checkpoint.finished_at = checkpoint.updated_at = datetime.now()
+                    db.commit()
+            except Exception as e:
+                db.rollback()
+                checkpoint.status = "failed"
+                checkpoint.error = str(e)
+                checkpoint.updated_at = datetime.now()
+                db.commit()
+                raise
+            finally:
+                invalidate_caches()
+
+        return {
+            "checkpoint": checkpoint.id,
+            "status": checkpoint.status,
+            "chunks": checkpoint.chunks_committed,
+            "read": checkpoint.rows_read,
+            "written": checkpoint.rows_written,
+            "rejected": checkpoint.rows_rejected,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a large CSV or Parquet extract in resumable chunks")
+    parser.add_argument("kind", choices=list(SOURCES), help="Table the extract belongs to")
+    parser.add_argument("path", help="Extract file (.csv, .csv.gz or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="Load the file again from the first chunk")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist")
+
+    from ..db import init_db
+    init_db()
+    stats = stream_load(args.kind, args.path, args.chunk_size, args.batch_size, restart=args.restart)
+    print(f"✓ {stats['status'].capitalize()}: {stats['written']} {args.kind} rows in {stats['chunks']} chunks "
+          f"({stats['rejected']} rejected, {stats['seconds']}s this run)")
@@ -0,0 +1,496 @@
+"""
+Vectorized synthetic data generator for load testing at production scale.
+
+Rows are generated with NumPy a chunk of episodes at a time, together with
+the safety incidents and data quality issues that reference them, so memory
+is bounded by the chunk size whatever the total. Each chunk draws from its own
+RNG seeded by (seed, chunk number): the output depends only on the seed, the
+row counts, the chunk size, the end date and the distributions, never on how
+the chunks are consumed.
+
+Generated chunks are extract-shaped DataFrames (the columns bulk_load reads),
+and are either written to Parquet files or prepared and upserted straight
+into the database with the bulk loader.
+
+With --workers, contiguous ranges of chunks (shards) are generated in a
+process pool. Each worker writes its shard to its own Parquet files or SQLite
+database, and the shards are then merged in chunk order: row groups are copied
+into the final Parquet files, or the SQLite shards are attached to the target
+database and copied with INSERT ... SELECT. Since every chunk has its own
+seed, the output is the same whatever the number of workers.
+
+Usage:
+    python -m src.etl.synthetic_bulk --episodes 10000000 --parquet data/synthetic
+    python -m src.etl.synthetic_bulk --episodes 2000000 --db --seed 7
+    python -m src.etl.synthetic_bulk --episodes 50000000 --parquet data/synthetic --workers 8
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time as dt_time
+from typing import Iterator, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from ..db import Base, engine
+from ..analytics.rollups import rebuild_rollups
+from ..utils.cache import invalidate_caches
+from ..utils.risk import risk_levels_for_scores
+from .bulk_load import SOURCES, DEFAULT_BATCH_SIZE, insert_frame, update_columns
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Safety incidents and data quality issues per episode (seed_database uses 200 and 300 per 500)
+INCIDENTS_PER_EPISODE = 0.4
+ISSUES_PER_EPISODE = 0.6
+
+# Relative weights and distribution parameters; override any key with --distributions
+DEFAULT_DISTRIBUTIONS = {
+    "units": {
+        "General Medicine": 30, "Cardiology": 20, "Pulmonology": 15,
+        "Orthopedics": 15, "Oncology": 10, "Neurology": 10,
+    },
+    "diagnoses": {
+        "Pneumonia": 12, "Heart Failure": 11, "COPD Exacerbation": 10, "Sepsis": 9,
+        "Hip Fracture": 8, "Stroke": 8, "Acute Myocardial Infarction": 8, "Diabetes Complications": 7,
+        "Hypertension": 6, "Renal Failure": 6, "Gastroenteritis": 6, "Asthma": 5, "Chemotherapy Complications": 4,
+    },
+    "incident_categories": {"Falls": 30, "Medication Error": 25, "Pressure Injury": 15, "Infection": 15, "Other": 15},
+    "incident_severities": {"Low": 30, "Medium": 40, "High": 25, "Critical": 5},
+    "incident_statuses": {"Resolved": 40, "Under Review": 25, "Monitoring": 20, "Active": 15},
+    "issue_types": {"Missing": 40, "Invalid": 25, "Stale": 20, "Duplicate": 15},
+    "issue_severities": {"Low": 20, "Medium": 50, "High": 30},
+    "issue_fields": {
+        "Discharge Date": 1, "Primary Diagnosis": 1, "Patient Record": 1,
+        "Last Updated": 1, "LOS": 1, "Discharge Disposition": 1,
+    },
+    "admission_window_days": 365,  # Admissions spread uniformly over this many days before end_date
+    "discharged_rate": 0.8,
+    "length_of_stay_lognormal": [1.3, 0.6],  # mean and sigma of log(days)
+    "risk_score_beta": [2.0, 3.0],  # alpha and beta
+    "readmission_factor": 0.35,  # P(readmitted within 30 days) = factor * risk score
+    "linked_incident_rate": 0.7,  # Incidents tied to an episode; the rest are unit-level
+}
+
+FIRST_NAMES = np.array([
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Nancy", "Daniel", "Lisa",
+    "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Ashley",
+], dtype=object)
+LAST_NAMES = np.array([
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor",
+    "Moore", "Jackson", "Martin", "Lee", "Thompson", "White", "Harris", "Sanchez",
+    "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young", "Allen", "King",
+], dtype=object)
+
+RISK_EXPLANATIONS = {
+    "High": ("High readmission risk due to ", ", multiple comorbidities, and complex medication regimen requiring close monitoring."),
+    "Medium": ("Moderate readmission risk due to ", ", age factors, and potential for complications."),
+    "Low": ("Low readmission risk after ", ", with good response to treatment and favorable patient factors."),
+}
+NEXT_ACTIONS = {
+    "High": "Schedule follow-up appointment within 3-5 days. Medication compliance support. Care coordination with primary care.",
+    "Medium": "Follow-up appointment within 7-10 days. Medication review. Patient education on condition management.",
+    "Low": "Routine follow-up in 2-4 weeks. Complete prescribed medications. Return if symptoms worsen.",
+}
+INCIDENT_DESCRIPTIONS = {
+    "Falls": "Patient fall, assessed for injury",
+    "Medication Error": "Medication error identified, patient monitoring required",
+    "Pressure Injury": "Stage 2 pressure ulcer discovered during assessment",
+    "Infection": "Hospital-acquired infection, culture pending",
+    "Other": "Incident logged for review",
+}
+ISSUE_DESCRIPTIONS = {
+    "Invalid": "{field} value is invalid or out of range",
+    "Missing": "{field} is missing or null",
+    "Duplicate": "Duplicate record detected for {field}",
+    "Stale": "Record not updated in 90+ days",
+}
+
+SECONDS_PER_DAY = 86400
+
+
+def load_distributions(path: Optional[str] = None) -> dict:
+    """DEFAULT_DISTRIBUTIONS with the keys of a JSON file (if given) replaced"""
+    distributions = dict(DEFAULT_DISTRIBUTIONS)
+    if path:
+        with open(path) as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(DEFAULT_DISTRIBUTIONS)
+        if unknown:
+            raise ValueError(f"Unknown distribution keys: {', '.join(sorted(unknown))}")
+        distributions.update(overrides)
+    return distributions
+
+
+def _choice(rng: np.random.Generator, weights: dict, size: int) -> np.ndarray:
+    labels = np.array(list(weights), dtype=object)
+    p = np.array(list(weights.values()), dtype=float)
+    return labels[rng.choice(len(labels), size, p=p / p.sum())]
+
+
+def _ids(prefix: str, start: int, stop: int, width: int = 9) -> pd.Series:
+    return prefix + pd.Series(np.arange(start + 1, stop + 1)).astype(str).str.zfill(width)
+
+
+def _span(total: Optional[int], per_episode: float, episodes: int, start: int, stop: int) -> tuple:
+    # Row range of the chunk covering episodes [start, stop), proportional to the episode range
+    child_total = round(episodes * per_episode) if total is None else total
+    return child_total * start // episodes, child_total * stop // episodes
+
+
+def chunk_rng(seed: int, chunk: int) -> np.random.Generator:
+    """Independent, reproducible RNG for one chunk"""
+    return np.random.default_rng([seed, chunk])
+
+
+def generate_chunk(
+    chunk: int,
+    episodes: int,
+    incidents: Optional[int] = None,
+    issues: Optional[int] = None,
+    seed: int = 42,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    end_date: Optional[date] = None,
+    distributions: Optional[dict] = None,
+) -> dict:
+    """
+    Generate one chunk of episodes and the incidents and issues that reference them.
+
+    Args:
+        chunk: Chunk number; covers episodes [chunk * chunk_size, (chunk + 1) * chunk_size)
+        episodes: Total episodes across all chunks
+        incidents: Total safety incidents (default INCIDENTS_PER_EPISODE per episode)
+        issues: Total data quality issues (default ISSUES_PER_EPISODE per episode)
+        seed: Base seed; the chunk's RNG is seeded with (seed, chunk)
+        chunk_size: Episodes per chunk
+        end_date: Latest admission day (default today)
+        distributions: Output of load_distributions (default DEFAULT_DISTRIBUTIONS)
+
+    Returns:
+        Dict of extract kind ("episodes", "incidents", "data_quality") -> DataFrame
+    """
+    dist = distributions or DEFAULT_DISTRIBUTIONS
+    rng = chunk_rng(seed, chunk)
+    end = np.datetime64(datetime.combine(end_date or date.today(), dt_time.max), "s")
+    start, stop = chunk * chunk_size, min((chunk + 1) * chunk_size, episodes)
+    n = stop - start
+
+    # Episodes
+    unit = _choice(rng, dist["units"], n)
+    diagnosis = _choice(rng, dist["diagnoses"], n)
+    admit = end - rng.integers(0, dist["admission_window_days"] * SECONDS_PER_DAY, n).astype("timedelta64[s]")
+    discharged = rng.random(n) < dist["discharged_rate"]
+    los = np.round(np.clip(rng.lognormal(*dist["length_of_stay_lognormal"], n), 0.5, 90), 1)
+    stay = (los * SECONDS_PER_DAY).astype("timedelta64[s]")
+    score = np.round(rng.beta(*dist["risk_score_beta"], n), 3)
+    readmitted = discharged & (rng.random(n) < dist["readmission_factor"] * score)
+    name = pd.Series(FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n)]) + " " + LAST_NAMES[rng.integers(0, len(LAST_NAMES), n)]
+    level = pd.Series(risk_levels_for_scores(score))
+    diagnosis_series = pd.Series(diagnosis)
+
+    episode_ids = _ids("SEP", start, stop)
+    episode_frame = pd.DataFrame({
+        "episode_id": episode_ids,
+        "patient_id": _ids("SP", start, stop),
+        "patient_name": name,
+        "unit": unit,
+        "admit_date": pd.Series(admit),
+        "discharge_date": pd.Series(np.where(discharged, admit + stay, np.datetime64("NaT"))),
+        "length_of_stay": np.where(discharged, los, np.nan),
+        "primary_diagnosis": diagnosis,
+        "readmitted_30d": readmitted,
+        "readmission_risk_score": score,
+        "summary": name + ", " + diagnosis_series + ". Stable condition.",
+        "risk_explanation": (
+            level.map({k: v[0] for k, v in RISK_EXPLANATIONS.items()})
+            + diagnosis_series.str.lower()
+            + level.map({k: v[1] for k, v in RISK_EXPLANATIONS.items()})
+        ),
+        "next_best_action": level.map(NEXT_ACTIONS),
+    })
+
+    # Safety incidents, tied to episodes of this chunk so unit and date lookups are array indexing
+    first, last = _span(incidents, INCIDENTS_PER_EPISODE, episodes, start, stop)
+    m = last - first
+    episode = rng.integers(0, n, m)
+    linked = rng.random(m) < dist["linked_incident_rate"]
+    during_stay = admit[episode] + (rng.random(m) * np.maximum(los[episode], 1) * SECONDS_PER_DAY).astype("timedelta64[s]")
+    anytime = end - rng.integers(0, dist["admission_window_days"] * SECONDS_PER_DAY, m).astype("timedelta64[s]")
+    category = _choice(rng, dist["incident_categories"], m)
+    incident_frame = pd.DataFrame({
+        "incident_id": _ids("SSI", first, last),
+        "episode_id": pd.Series(episode_ids.to_numpy()[episode], dtype="string"),
+        "date": pd.Series(np.where(linked, during_stay, anytime)),
+        "unit": np.where(linked, unit[episode], _choice(rng, dist["units"], m)),
+        "category": category,
+        "severity": _choice(rng, dist["incident_severities"], m),
+        "status": _choice(rng, dist["incident_statuses"], m),
+        "description": pd.Series(category).map(INCIDENT_DESCRIPTIONS),
+    })
+    incident_frame.loc[~linked, "episode_id"] = pd.NA
+
+    # Data quality issues on this chunk's episodes
+    first, last = _span(issues, ISSUES_PER_EPISODE, episodes, start, stop)
+    k = last - first
+    record = rng.integers(0, n, k)
+    issue_type = pd.Series(_choice(rng, dist["issue_types"], k))
+    field = pd.Series(_choice(rng, dist["issue_fields"], k))
+    descriptions = {
+        f"{t}|{f}": template.format(field=f) for t, template in ISSUE_DESCRIPTIONS.items() for f in dist["issue_fields"]
+    }
+    issue_frame = pd.DataFrame({
+        "record_type": "episode",
+        "record_id": episode_ids.to_numpy()[record],
+        "unit": unit[record],
+        "issue_type": issue_type,
+        "field": field,
+        "severity": _choice(rng, dist["issue_severities"], k),
+        "description": (issue_type + "|" + field).map(descriptions),
+        "last_updated": pd.Series(end - rng.integers(SECONDS_PER_DAY, 120 * SECONDS_PER_DAY, k).astype("timedelta64[s]")),
+    })
+
+    return {"episodes": episode_frame, "incidents": incident_frame, "data_quality": issue_frame}
+
+
+def chunk_count(episodes: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    return -(-episodes // chunk_size)
+
+
+def iter_chunks(
+    episodes: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunks: Optional[range] = None,
+    **kwargs,
+) -> Iterator[dict]:
+    """Yield generate_chunk() output for every chunk (or the given range of chunks), in order"""
+    for chunk in chunks if chunks is not None else range(chunk_count(episodes, chunk_size)):
+        yield generate_chunk(chunk, episodes, chunk_size=chunk_size, **kwargs)
+
+
+def write_parquet(chunks, directory: str) -> dict:
+    """
+    Write generated chunks to episodes.parquet, incidents.parquet and data_quality.parquet.
+
+    Each chunk becomes one row group, so only one chunk is held in memory.
+    The files can be loaded with bulk_load or stream_load.
+
+    Returns:
+        Dict of extract kind -> rows written
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Writing Parquet extracts requires pyarrow: pip install pyarrow") from e
+
+    os.makedirs(directory, exist_ok=True)
+    writers, rows = {}, {kind: 0 for kind in SOURCES}
+    try:
+        for frames in chunks:
+            for kind, df in frames.items():
+                if df.empty:
+                    continue
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if kind not in writers:
+                    writers[kind] = pq.ParquetWriter(os.path.join(directory, f"{kind}.parquet"), table.schema)
+                writers[kind].write_table(table)
+                rows[kind] += len(df)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows
+
+
+def load_database(chunks, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Prepare and upsert generated chunks into the database, one transaction per chunk.
+
+    KPI rollups are rebuilt once at the end and cached responses invalidated.
+
+    Returns:
+        Dict of extract kind -> rows written
+    """
+    rows = {kind: 0 for kind in SOURCES}
+    for frames in chunks:
+        with engine.begin() as conn:
+            # Episodes first: incidents reference them
+            for kind, df in frames.items():
+                model, prepare, key = SOURCES[kind]
+                rows[kind] += insert_frame(conn, model, prepare(df), batch_size, key=key, refresh=False)
+    rebuild_rollups()
+    invalidate_caches()
+    return rows
+
+
+# ==================== Sharded generation ====================
+
+def _shards(chunks: int, workers: int) -> list:
+    # Contiguous, nearly equal chunk ranges, one per worker
+    workers = max(1, min(workers, chunks))
+    return [range(chunks * i // workers, chunks * (i + 1) // workers) for i in range(workers)]
+
+
+def _write_sqlite_shard(chunks, path: str, batch_size: int) -> dict:
+    shard_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=shard_engine)
+    rows = {kind: 0 for kind in SOURCES}
+    try:
+        for frames in chunks:
+            with shard_engine.begin() as conn:
+                # Throwaway file: no journal, no fsync
+                conn.exec_driver_sql("PRAGMA journal_mode = OFF")
+                conn.exec_driver_sql("PRAGMA synchronous = OFF")
+                for kind, df in frames.items():
+                    model, prepare, _ = SOURCES[kind]
+                    rows[kind] += insert_frame(conn, model, prepare(df), batch_size, refresh=False)
+    finally:
+        shard_engine.dispose()
+    return rows
+
+
+def _generate_shard(shard: range, path: str, fmt: str, episodes: int, batch_size: int, kwargs: dict) -> dict:
+    """Process pool task: generate one shard of chunks into its own file(s)"""
+    chunks = iter_chunks(episodes, chunks=shard, **kwargs)
+    if fmt == "parquet":
+        return write_parquet(chunks, path)
+    return _write_sqlite_shard(chunks, path, batch_size)
+
+
+def _merge_parquet(shard_paths: list, directory: str):
+    import pyarrow.parquet as pq
+
+    for kind in SOURCES:
+        parts = [os.path.join(path, f"{kind}.parquet") for path in shard_paths]
+        parts = [part for part in parts if os.path.exists(part)]
+        if not parts:
+            continue
+        with pq.ParquetWriter(os.path.join(directory, f"{kind}.parquet"), pq.read_schema(parts[0])) as writer:
+            for part in parts:
+                source = pq.ParquetFile(part)
+                for group in range(source.num_row_groups):
+                    writer.write_table(source.read_row_group(group))
+
+
+def _attach_sqlite(shard_paths: list):
+    # Copy every shard into the target database in chunk order, skipping the shard-local
+    # primary keys. SQLite cannot attach or detach inside a transaction, so each shard
+    # is copied in its own.
+    with engine.connect() as conn:
+        for path in shard_paths:
+            conn.exec_driver_sql("ATTACH DATABASE ? AS shard", (path,))
+            for kind in SOURCES:
+                model, _, key = SOURCES[kind]
+                table = model.__table__
+                columns = [c.name for c in table.columns if c.name != "id"]
+                names = ", ".join(columns)
+                updates = ", ".join(f"{c} = excluded.{c}" for c in update_columns(columns, key))
+                conn.exec_driver_sql(
+                    f"INSERT INTO main.{table.name} ({names}) SELECT {names} FROM shard.{table.name} "
+                    f"WHERE true ORDER BY id ON CONFLICT ({key}) DO UPDATE SET {updates}"
+                )
+            conn.commit()
+            conn.exec_driver_sql("DETACH DATABASE shard")
+            conn.commit()
+
+
+def generate_parallel(
+    episodes: int,
+    workers: int,
+    parquet: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> dict:
+    """
+    Generate the dataset in a process pool, then merge the shards.
+
+    Args:
+        episodes: Total episodes
+        workers: Worker processes (one shard of contiguous chunks each)
+        parquet: Directory for the merged Parquet extracts; None loads into
+            the configured database, which must be SQLite
+        batch_size: Rows per executemany call in the SQLite shards
+        chunk_size: Episodes per chunk
+        **kwargs: incidents, issues, seed, end_date, distributions (see generate_chunk)
+
+    Returns:
+        Dict of extract kind -> rows written
+    """
+    if parquet is None and engine.dialect.name != "sqlite":
+        raise ValueError("Sharded database loads attach SQLite shards; write Parquet and stream_load it instead")
+    # Resolved once so every worker uses the same day
+    kwargs["end_date"] = kwargs.get("end_date") or date.today()
+    kwargs["chunk_size"] = chunk_size
+    fmt = "parquet" if parquet else "sqlite"
+    if parquet:
+        os.makedirs(parquet, exist_ok=True)
+
+    scratch = tempfile.mkdtemp(prefix="healthsight-shards-", dir=parquet)
+    try:
+        shards = _shards(chunk_count(episodes, chunk_size), workers)
+        shard_paths = [
+            os.path.join(scratch, f"shard-{i:04d}" + ("" if parquet else ".db")) for i in range(len(shards))
+        ]
+        rows = {kind: 0 for kind in SOURCES}
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [
+                pool.submit(_generate_shard, shard, path, fmt, episodes, batch_size, kwargs)
+                for shard, path in zip(shards, shard_paths)
+            ]
+            for future in futures:
+                for kind, count in future.result().items():
+                    rows[kind] += count
+
+        if parquet:
+            _merge_parquet(shard_paths, parquet)
+        else:
+            _attach_sqlite(shard_paths)
+            rebuild_rollups()
+            invalidate_caches()
+        return rows
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic episodes, incidents and data quality issues at scale")
+    parser.add_argument("--episodes", type=int, default=1_000_000)
+    parser.add_argument("--incidents", type=int, help=f"Default: {INCIDENTS_PER_EPISODE} per episode")
+    parser.add_argument("--issues", type=int, help=f"Default: {ISSUES_PER_EPISODE} per episode")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Episodes per chunk (changes the output)")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Latest admission day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--distributions", help="JSON file overriding keys of DEFAULT_DISTRIBUTIONS")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--parquet", metavar="DIRECTORY", help="Write Parquet extracts to this directory")
+    target.add_argument("--db", action="store_true", help="Load into the configured database")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=1, help="Generate shards in this many processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    options = {
+        "incidents": args.incidents,
+        "issues": args.issues,
+        "seed": args.seed,
+        "end_date": args.end_date,
+        "distributions": load_distributions(args.distributions),
+    }
+    if not args.parquet:
+        from ..db import init_db
+        init_db()
+    if args.workers > 1:
+        rows = generate_parallel(args.episodes, args.workers, args.parquet, args.batch_size, args.chunk_size, **options)
+    elif args.parquet:
+        rows = write_parquet(iter_chunks(args.episodes, args.chunk_size, **options), args.parquet)
+    else:
+        rows = load_database(iter_chunks(args.episodes, args.chunk_size, **options), args.batch_size)
+    counts = ", ".join(f"{count} {kind}" for kind, count in rows.items())
+    print(f"✓ Generated {counts} in {time.perf_counter() - start:.1f}s")
@@ -2,6 +2,7 @@ import random
 from datetime import datetime, timedelta
 from typing import List
 from ..models.db_models import PatientEpisode, SafetyIncident, DataQualityIssue
+from ..utils.risk import risk_level_for_score
 
 
 def generate_patient_names(count: int) -> List[str]:
@@ -27,15 +28,6 @@ def generate_patient_names(count: int) -> List[str]:
     return names
 
 
-def get_risk_level(score: float) -> str:
-    if score >= 0.7:
-        return "High"
-    elif score >= 0.4:
-        return "Medium"
-    else:
-        return "Low"
-
-
 def generate_episode_summary(episode: PatientEpisode) -> str:
     diagnoses_map = {
         "Heart Failure": f"{episode.patient_name}, {episode.primary_diagnosis}. Multiple comorbidities including diabetes and renal insufficiency. Requires close monitoring.",
@@ -88,7 +80,7 @@ def generate_patient_episodes(count: int = 500) -> List[PatientEpisode]:
             discharge_date = admit_date + timedelta(days=int(los))
         
         risk_score = round(random.uniform(0.1, 0.95), 3)
-        risk_level = get_risk_level(risk_score)
+        risk_level = risk_level_for_score(risk_score)
         
         episode = PatientEpisode(
             episode_id=episode_id,
@@ -118,7 +110,8 @@ def generate_safety_incidents(episodes: List[PatientEpisode], count: int = 200)
     statuses = ["Resolved", "Under Review", "Monitoring", "Active"]
     
     incidents = []
-    episode_ids = [e.episode_id for e in episodes] if episodes else []
+    units_by_episode = {e.episode_id: e.unit for e in episodes} if episodes else {}
+    episode_ids = list(units_by_episode)
     
     for i in range(count):
         incident_id = f"SI{str(i+1).zfill(6)}"
@@ -126,8 +119,7 @@ def generate_safety_incidents(episodes: List[PatientEpisode], count: int = 200)
         
         # Get unit from episode or random
         if episode_id:
-            episode = next((e for e in episodes if e.episode_id == episode_id), None)
-            unit = episode.unit if episode else random.choice(["Cardiology", "Orthopedics", "Pulmonology", "General Medicine"])
+            unit = units_by_episode[episode_id] if episode_id in units_by_episode else random.choice(["Cardiology", "Orthopedics", "Pulmonology", "General Medicine"])
         else:
             unit = random.choice(["Cardiology", "Orthopedics", "Pulmonology", "General Medicine"])
         
@@ -0,0 +1,145 @@
+"""
+Batched insight generation: one completion covers several episodes.
+
+The per-episode generators cost three completions per episode, each repeating
+its system prompt and instructions. Here the instructions are sent once with
+several episodes' context blocks, and the model answers with a JSON array
+holding the summary, risk explanation and recommendations of every episode.
+Items that are missing or malformed are regenerated with per-episode calls.
+"""
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from langchain.prompts import ChatPromptTemplate
+from ..models.db_models import PatientEpisode
+from .llm_utils import get_llm, format_episode_context, invoke_cached
+from .summary import generate_episode_summary
+from .risk_explanation import generate_risk_explanation
+from .recommendations import generate_next_best_action
+
+logger = logging.getLogger(__name__)
+
+INSIGHT_FIELDS = ("summary", "risk_explanation", "recommendations")
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@lru_cache(maxsize=None)
+def _build_prompt() -> ChatPromptTemplate:
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are a healthcare analytics assistant writing for healthcare professionals. Use a professional, clinical tone. You answer with JSON only."),
+        ("human", """For each patient episode below, write:
+- "summary": 2-3 sentences covering the admission context and primary diagnosis, length of stay if available, key clinical details and current status (discharged or still admitted).
+- "risk_explanation": 3-4 sentences explaining why the patient is at risk of 30-day readmission given their risk level and score, considering the diagnosis and its complexity, length of stay, previous readmissions and condition-specific risk factors.
+- "recommendations": a numbered list of 3 specific, actionable next steps to reduce readmission risk (post-discharge actions, follow-up coordination, patient education, medication management, specialist referrals).
+
+Respond with a JSON array containing one object per episode, in the same order, each with the keys "episode_id", "summary", "risk_explanation" and "recommendations". Do not add any other text.
+
+{episodes}""")
+    ])
+
+    return prompt
+
+
+def _episode_block(episode: PatientEpisode) -> str:
+    risk_score = episode.readmission_risk_score or 0
+    return f"""### Episode {episode.episode_id}
+Risk Level: {episode.risk_level} (risk score: {risk_score:.2f})
+{format_episode_context(episode)}"""
+
+
+def parse_batch_response(text: str) -> Dict[str, dict]:
+    """
+    Extract well-formed per-episode insights from a batch completion.
+
+    Args:
+        text: Raw completion, optionally wrapped in a Markdown code fence
+
+    Returns:
+        {episode_id: {field: text}} for every item that has all insight fields
+        as non-empty strings; anything else is left out
+    """
+    try:
+        items = json.loads(_CODE_FENCE.sub("", text.strip()))
+    except ValueError:
+        return {}
+    if isinstance(items, dict):
+        items = items.get("episodes", [])
+    if not isinstance(items, list):
+        return {}
+
+    parsed = {}
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("episode_id"), str):
+            continue
+        insights = {field: item.get(field) for field in INSIGHT_FIELDS}
+        if all(isinstance(value, str) and value.strip() for value in insights.values()):
+            parsed[item["episode_id"]] = {field: value.strip() for field, value in insights.items()}
+    return parsed
+
+
+def _generate_single(episode: PatientEpisode) -> Optional[dict]:
+    try:
+        return {
+            "summary": generate_episode_summary(episode, use_fallback=False),
+            "risk_explanation": generate_risk_explanation(episode, use_fallback=False),
+            "recommendations": generate_next_best_action(episode, use_fallback=False),
+        }
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.warning("Insight generation failed for %s: %s", episode.episode_id, e)
+        return None
+
+
+def generate_insights_batch(
+    episodes: List[PatientEpisode],
+    fallback: Optional[Callable[[PatientEpisode], Optional[dict]]] = None,
+    invoke: Optional[Callable[[List[PatientEpisode]], str]] = None,
+) -> Dict[str, Optional[dict]]:
+    """
+    Generate all three insights for several episodes with one completion.
+
+    Args:
+        episodes: Episodes to cover in a single prompt
+        fallback: Per-episode generator used for items the batch response is
+            missing or got wrong (defaults to the three per-episode generators)
+        invoke: Callable returning the raw batch completion (defaults to the
+            cached OpenAI call); lets callers add rate limiting and retries
+
+    Returns:
+        {episode_id: {field: text}}, or None for episodes whose fallback failed
+    """
+    fallback = fallback or _generate_single
+    invoke = invoke or invoke_batch
+
+    try:
+        parsed = parse_batch_response(invoke(episodes))
+    except ValueError:
+        # Configuration errors (e.g. missing OPENAI_API_KEY) affect every call
+        raise
+    except Exception as e:
+        logger.warning("Batch insight generation failed, falling back to per-episode calls: %s", e)
+        parsed = {}
+
+    results = {}
+    for episode in episodes:
+        insights = parsed.get(episode.episode_id)
+        if insights is None:
+            insights = fallback(episode)
+        results[episode.episode_id] = insights
+    return results
+
+
+def invoke_batch(episodes: List[PatientEpisode]) -> str:
+    """Request the batch completion covering the given episodes (cached only if it covers all of them)"""
+    blocks = "\n\n".join(_episode_block(episode) for episode in episodes)
+    episode_ids = {episode.episode_id for episode in episodes}
+    return invoke_cached(
+        get_llm(),
+        _build_prompt(),
+        {"episodes": blocks},
+        validate=lambda text: episode_ids <= parse_batch_response(text).keys(),
+    )
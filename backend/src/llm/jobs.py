@@ -0,0 +1,321 @@
+"""
+Background jobs that generate AI insights for a whole cohort of episodes.
+
+A job stores its cohort filter and a checkpoint (the last episode primary key
+it committed). Episodes are processed in primary key order, one batch at a
+time: the batch fans out over a bounded thread pool, every LLM call goes
+through a shared rate limiter and is retried with exponential backoff, and the
+batch's write-backs are committed together with the new checkpoint. A job
+interrupted by a crash therefore resumes after its last committed batch.
+
+Every API worker resumes unfinished jobs on startup, so a job is claimed with
+an atomic compare-and-set UPDATE before it runs and only one worker wins it.
+The claim records the worker's id (host, pid and a per-boot token). A running
+job can be claimed again when its worker is gone: a process on the same host
+that no longer exists, an earlier boot of this process, or a job this process
+no longer runs. Jobs owned by other hosts are reclaimed once no batch has been
+committed for INSIGHT_JOB_STALE_SECONDS.
+"""
+import logging
+import os
+import socket
+import threading
+import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..db import SessionLocal
+from ..models.db_models import InsightJob, PatientEpisode
+from .summary import generate_episode_summary
+from .risk_explanation import generate_risk_explanation
+from .recommendations import generate_next_best_action
+from .batch import generate_insights_batch, invoke_batch
+
+logger = logging.getLogger(__name__)
+
+# Insight field -> generator; each generator raises on failure so it can be retried
+DEFAULT_GENERATORS: Dict[str, Callable[[PatientEpisode], str]] = {
+    "summary": lambda episode: generate_episode_summary(episode, use_fallback=False),
+    "risk_explanation": lambda episode: generate_risk_explanation(episode, use_fallback=False),
+    "recommendations": lambda episode: generate_next_best_action(episode, use_fallback=False),
+}
+
+ACTIVE_STATUSES = ("pending", "running")
+
+_running: Dict[int, threading.Thread] = {}
+_running_lock = threading.Lock()
+# Jobs claimed by run_job in this process and not yet finished
+_claimed = set()
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at most rate_per_second apart"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_limiters: Dict[float, RateLimiter] = {}
+
+
+def shared_rate_limiter() -> RateLimiter:
+    """The process-wide limiter for INSIGHT_JOB_RATE_LIMIT_PER_SECOND, shared by every job"""
+    rate = settings.INSIGHT_JOB_RATE_LIMIT_PER_SECOND
+    with _running_lock:
+        if rate not in _limiters:
+            _limiters[rate] = RateLimiter(rate)
+        return _limiters[rate]
+
+
+def _cohort_query(db: Session, job: InsightJob):
+    query = db.query(PatientEpisode)
+    if job.unit:
+        query = query.filter(PatientEpisode.unit == job.unit)
+    if job.risk_level:
+        query = query.filter(PatientEpisode.risk_level == job.risk_level)
+    if job.missing_only:
+        query = query.filter(PatientEpisode.ai_generated_at.is_(None))
+    return query
+
+
+def create_job(db: Session, unit: Optional[str] = None, risk_level: Optional[str] = None, missing_only: bool = False) -> InsightJob:
+    """Record a new pending job for the cohort matching the filter"""
+    job = InsightJob(unit=unit, risk_level=risk_level, missing_only=missing_only, status="pending")
+    job.total = _cohort_query(db, job).count()
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def job_to_dict(job: InsightJob) -> dict:
+    return {
+        "id": job.id,
+        "status": job.status,
+        "filter": {"unit": job.unit, "risk_level": job.risk_level, "missing_only": job.missing_only},
+        "total": job.total,
+        "processed": job.processed,
+        "failed": job.failed,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _with_retries(generate: Callable, arg, limiter: RateLimiter):
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            return generate(arg)
+        except ValueError:
+            # Configuration errors (e.g. missing OPENAI_API_KEY) will not go away on retry
+            raise
+        except Exception:
+            if attempt >= settings.INSIGHT_JOB_MAX_RETRIES:
+                raise
+            time.sleep(settings.INSIGHT_JOB_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+            attempt += 1
+
+
+def _generate_insights(episode: PatientEpisode, generators: dict, limiter: RateLimiter) -> Optional[dict]:
+    try:
+        return {field: _with_retries(generate, episode, limiter) for field, generate in generators.items()}
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.warning("Insight generation failed for %s: %s", episode.episode_id, e)
+        return None
+
+
+def _generate_batched(episodes: List[PatientEpisode], pool: ThreadPoolExecutor, limiter: RateLimiter) -> List[Optional[dict]]:
+    """Generate insights with one completion per INSIGHT_JOB_PROMPT_BATCH_SIZE episodes"""
+    size = settings.INSIGHT_JOB_PROMPT_BATCH_SIZE
+    chunks = [episodes[i:i + size] for i in range(0, len(episodes), size)]
+
+    def generate(chunk):
+        return generate_insights_batch(
+            chunk,
+            fallback=lambda episode: _generate_insights(episode, DEFAULT_GENERATORS, limiter),
+            invoke=lambda chunk: _with_retries(invoke_batch, chunk, limiter),
+        )
+
+    insights = {}
+    for chunk_insights in pool.map(generate, chunks):
+        insights.update(chunk_insights)
+    return [insights[episode.episode_id] for episode in episodes]
+
+
+def apply_insights(episode: PatientEpisode, insights: dict):
+    """Write generated insights ({field: text}) and their legacy mirrors onto an episode"""
+    if "summary" in insights:
+        episode.summary_text = insights["summary"]
+        episode.summary = insights["summary"]  # Legacy field
+    if "risk_explanation" in insights:
+        episode.risk_explanation = insights["risk_explanation"]
+    if "recommendations" in insights:
+        episode.recommendations = insights["recommendations"]
+        episode.next_best_action = insights["recommendations"]  # Legacy field
+    episode.ai_generated_at = datetime.now()
+
+
+def _owner_is_gone(worker_id: Optional[str], job_id: int) -> bool:
+    """Whether the process that claimed a running job can no longer be running it"""
+    if not worker_id:
+        return True
+    host, pid, _ = worker_id.rsplit(":", 2)
+    pid = int(pid)
+    if host != socket.gethostname():
+        return False
+    if worker_id == WORKER_ID:
+        with _running_lock:
+            return job_id not in _claimed
+    if pid == os.getpid():
+        # An earlier boot that reused this pid
+        return True
+    if os.name == "nt":
+        # os.kill would terminate the process rather than probe it
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass  # Alive, under another user
+    return False
+
+
+def _claim(db: Session, job_id: int) -> bool:
+    """Atomically take a pending job, or a running one whose worker is gone; False if another worker has it"""
+    job = db.get(InsightJob, job_id)
+    if job is None or job.status not in ACTIVE_STATUSES:
+        return False
+    status, worker_id, updated_at = job.status, job.worker_id, job.updated_at
+
+    if status == "running":
+        stale = datetime.now() - timedelta(seconds=settings.INSIGHT_JOB_STALE_SECONDS)
+        if not _owner_is_gone(worker_id, job_id) and not (updated_at is None or updated_at < stale):
+            return False
+
+    # Compare-and-set on what was read: of several workers claiming at once, the first changes the row
+    result = db.execute(
+        update(InsightJob)
+        .where(
+            InsightJob.id == job_id,
+            InsightJob.status == status,
+            InsightJob.worker_id.is_(None) if worker_id is None else InsightJob.worker_id == worker_id,
+            InsightJob.updated_at.is_(None) if updated_at is None else InsightJob.updated_at == updated_at,
+        )
+        .values(status="running", worker_id=WORKER_ID, updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount != 1:
+        return False
+    with _running_lock:
+        _claimed.add(job_id)
+    return True
+
+
+def run_job(job_id: int, generators: Optional[dict] = None, batch_size: Optional[int] = None):
+    """
+    Process a job from its checkpoint until the cohort is exhausted.
+
+    Args:
+        job_id: InsightJob primary key
+        generators: {field: callable(episode) -> str} overrides, e.g. a stub LLM in tests;
+            these are called per episode, bypassing multi-episode prompts
+        batch_size: Episodes per committed batch (defaults to INSIGHT_JOB_BATCH_SIZE)
+    """
+    batched_prompts = generators is None and settings.INSIGHT_JOB_PROMPT_BATCH_SIZE > 1
+    generators = generators or DEFAULT_GENERATORS
+    batch_size = batch_size or settings.INSIGHT_JOB_BATCH_SIZE
+    limiter = shared_rate_limiter()
+
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return
+        job = db.get(InsightJob, job_id)
+
+        with ThreadPoolExecutor(max_workers=settings.INSIGHT_JOB_CONCURRENCY) as pool:
+            while True:
+                batch = _cohort_query(db, job).filter(
+                    PatientEpisode.id > job.last_episode_pk
+                ).order_by(PatientEpisode.id).limit(batch_size).all()
+                if not batch:
+                    break
+
+                if batched_prompts:
+                    results = _generate_batched(batch, pool, limiter)
+                else:
+                    results = list(pool.map(lambda ep: _generate_insights(ep, generators, limiter), batch))
+                for episode, insights in zip(batch, results):
+                    if insights is None:
+                        job.failed += 1
+                    else:
+                        apply_insights(episode, insights)
+                        job.processed += 1
+
+                # Write-backs and the checkpoint commit atomically
+                job.last_episode_pk = batch[-1].id
+                job.updated_at = datetime.now()
+                db.commit()
+
+        job.status = "completed"
+        job.finished_at = job.updated_at = datetime.now()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        job = db.get(InsightJob, job_id)
+        if job is not None:
+            job.status = "failed"
+            job.error = str(e)
+            job.finished_at = job.updated_at = datetime.now()
+            db.commit()
+        logger.exception("Insight job %s failed", job_id)
+    finally:
+        db.close()
+        with _running_lock:
+            _running.pop(job_id, None)
+            _claimed.discard(job_id)
+
+
+def start_job(job_id: int, generators: Optional[dict] = None) -> bool:
+    """Run a job on a background thread unless it is already running in this process"""
+    with _running_lock:
+        if job_id in _running:
+            return False
+        thread = threading.Thread(target=run_job, args=(job_id, generators), name=f"insight-job-{job_id}", daemon=True)
+        _running[job_id] = thread
+    thread.start()
+    return True
+
+
+def resume_jobs():
+    """Restart jobs left pending, or running by a process that is gone (each runs in whichever worker claims it)"""
+    db = SessionLocal()
+    try:
+        job_ids = [job_id for (job_id,) in db.query(InsightJob.id).filter(InsightJob.status.in_(ACTIVE_STATUSES))]
+    finally:
+        db.close()
+    for job_id in job_ids:
+        start_job(job_id)
+    return job_ids
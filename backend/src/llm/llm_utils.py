@@ -1,18 +1,64 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Optional
+import httpx
+import openai
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from ..config import settings
+from .response_cache import llm_response_cache, make_key
 
+_llm = None
+_http_clients = None
+_llm_lock = threading.Lock()
 
-def get_llm():
-    """Get configured OpenAI LLM instance"""
-    if not settings.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY not set. Please set it in your .env file.")
-    
-    return ChatOpenAI(
+
+def _build_llm():
+    limits = httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    timeout = httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=5.0)
+    http_client = httpx.Client(limits=limits, timeout=timeout)
+    async_http_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+    client_params = {
+        "api_key": settings.OPENAI_API_KEY,
+        "base_url": settings.OPENAI_BASE_URL,
+        "timeout": timeout,
+    }
+    # One sync and one async client, each with its own keep-alive pool, reused by every call
+    llm = ChatOpenAI(
         model_name=settings.OPENAI_MODEL,
         temperature=settings.OPENAI_TEMPERATURE,
         openai_api_key=settings.OPENAI_API_KEY,
+        client=openai.OpenAI(http_client=http_client, **client_params).chat.completions,
+        async_client=openai.AsyncOpenAI(http_client=async_http_client, **client_params).chat.completions,
     )
+    return llm, (http_client, async_http_client)
+
+
+def get_llm():
+    """Get the process-wide OpenAI LLM instance (created on first use)"""
+    global _llm, _http_clients
+    if not settings.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY not set. Please set it in your .env file.")
+    
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                _llm, _http_clients = _build_llm()
+    return _llm
+
+
+async def close_llm():
+    """Close the shared connection pools; the next get_llm() call opens new ones"""
+    global _llm, _http_clients
+    with _llm_lock:
+        clients, _llm, _http_clients = _http_clients, None, None
+    if clients is not None:
+        http_client, async_http_client = clients
+        http_client.close()
+        await async_http_client.aclose()
 
 
 def format_episode_context(episode) -> str:
@@ -29,3 +75,119 @@ def format_episode_context(episode) -> str:
 - Previously Readmitted (30-day): {'Yes' if episode.readmitted_30d else 'No'}
 """
     return context
+
+
+def _token_usage(messages, response) -> tuple:
+    """Prompt and completion token counts, estimated (~4 chars/token) if the provider omits them"""
+    usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    prompt_tokens = usage.get("prompt_tokens") or sum(len(m.content) for m in messages) // 4
+    completion_tokens = usage.get("completion_tokens") or len(response.content) // 4
+    return prompt_tokens, completion_tokens
+
+
+def _cache_key(messages):
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    return make_key(settings.OPENAI_MODEL, settings.OPENAI_TEMPERATURE, messages)
+
+
+def invoke_cached(
+    llm,
+    prompt: ChatPromptTemplate,
+    inputs: dict,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    Render the prompt and return the completion text, from the LLM response cache when possible.
+
+    Args:
+        llm: Chat model to call on a cache miss
+        prompt: Prompt template
+        inputs: Template variables
+        validate: Only cache completions it accepts, so a malformed one is
+            requested again rather than replayed
+
+    Returns:
+        Stripped completion text
+    """
+    messages = prompt.format_messages(**inputs)
+    key = _cache_key(messages)
+    if key is not None:
+        cached = llm_response_cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = llm.invoke(messages)
+    text = response.content.strip()
+    if key is not None and (validate is None or validate(text)):
+        llm_response_cache.put(key, text, *_token_usage(messages, response))
+    return text
+
+
+async def ainvoke_cached(llm, prompt: ChatPromptTemplate, inputs: dict) -> str:
+    """Async variant of invoke_cached; the SQLite cache is read and written in a worker thread"""
+    messages = prompt.format_messages(**inputs)
+    key = _cache_key(messages)
+    if key is not None:
+        cached = await asyncio.to_thread(llm_response_cache.get, key)
+        if cached is not None:
+            return cached
+
+    response = await llm.ainvoke(messages)
+    text = response.content.strip()
+    if key is not None:
+        await asyncio.to_thread(llm_response_cache.put, key, text, *_token_usage(messages, response))
+    return text
+
+
+async def astream_cached(
+    llm,
+    prompt: ChatPromptTemplate,
+    inputs: dict,
+    fallback: Optional[Callable[[], str]] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream completion text chunks as the model produces them.
+
+    A cached completion is yielded as a single chunk. A fully streamed
+    completion is added to the cache; one abandoned by the consumer is not.
+    The SQLite cache is read and written in a worker thread.
+
+    Args:
+        llm: Chat model to stream from on a cache miss
+        prompt: Prompt template
+        inputs: Template variables
+        fallback: Produces replacement text if the call fails before any chunk arrives
+
+    Yields:
+        Completion text chunks (the concatenation is the unstripped completion)
+    """
+    messages = prompt.format_messages(**inputs)
+    key = _cache_key(messages)
+    if key is not None:
+        cached = await asyncio.to_thread(llm_response_cache.get, key)
+        if cached is not None:
+            yield cached
+            return
+
+    chunks = []
+    try:
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+    except Exception:
+        if chunks or fallback is None:
+            raise
+        yield fallback()
+        return
+
+    text = "".join(chunks)
+    if key is not None:
+        await asyncio.to_thread(
+            llm_response_cache.put,
+            key,
+            text.strip(),
+            sum(len(m.content) for m in messages) // 4,
+            len(text) // 4,
+        )
@@ -1,31 +1,13 @@
+import asyncio
+from functools import lru_cache
 from langchain.prompts import ChatPromptTemplate
+from ..config import settings
 from ..models.db_models import PatientEpisode
-from .llm_utils import get_llm, format_episode_context
+from .llm_utils import get_llm, format_episode_context, invoke_cached, ainvoke_cached, astream_cached
 
 
-def generate_next_best_action(episode: PatientEpisode) -> str:
-    """
-    Generate actionable next steps to reduce readmission risk.
-    
-    Args:
-        episode: PatientEpisode database model instance
-        
-    Returns:
-        AI-generated recommendations string
-    """
-    llm = get_llm()
-    
-    context = format_episode_context(episode)
-    
-    # Determine risk level
-    risk_score = episode.readmission_risk_score or 0
-    if risk_score >= 0.7:
-        risk_level = "High"
-    elif risk_score >= 0.4:
-        risk_level = "Medium"
-    else:
-        risk_level = "Low"
-    
+@lru_cache(maxsize=None)
+def _build_prompt() -> ChatPromptTemplate:
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a healthcare analytics assistant providing evidence-based recommendations for care transitions and readmission prevention."),
         ("human", """Provide 3 actionable next steps for this patient to reduce their risk of 30-day readmission. The patient has a {risk_level} risk level (risk score: {risk_score}).
@@ -45,18 +27,68 @@ Patient Episode Data:
 Recommendations:""")
     ])
     
-    chain = prompt | llm
+    return prompt
+
+
+def _prompt_inputs(episode: PatientEpisode) -> dict:
+    return {
+        "context": format_episode_context(episode),
+        "risk_level": episode.risk_level,
+        "risk_score": f"{episode.readmission_risk_score or 0:.2f}",
+    }
+
+
+def _fallback_recommendations(episode: PatientEpisode) -> str:
+    # Fallback recommendations if the AI call fails
+    fallback = f"1. Schedule follow-up appointment within 7-10 days for {episode.primary_diagnosis} monitoring.\n"
+    fallback += f"2. Ensure patient education on condition management and medication compliance.\n"
+    fallback += f"3. Coordinate with primary care provider for ongoing care management."
+    return fallback
+
+
+def generate_next_best_action(episode: PatientEpisode, use_fallback: bool = True) -> str:
+    """
+    Generate actionable next steps to reduce readmission risk.
+    
+    Args:
+        episode: PatientEpisode database model instance
+        use_fallback: Return standard recommendations instead of raising if the AI call fails
+        
+    Returns:
+        AI-generated recommendations string
+    """
+    llm = get_llm()
     
     try:
-        response = chain.invoke({
-            "context": context,
-            "risk_level": risk_level,
-            "risk_score": f"{risk_score:.2f}"
-        })
-        return response.content.strip()
+        return invoke_cached(llm, _build_prompt(), _prompt_inputs(episode))
     except Exception as e:
-        # Fallback recommendations if AI call fails
-        fallback = f"1. Schedule follow-up appointment within 7-10 days for {episode.primary_diagnosis} monitoring.\n"
-        fallback += f"2. Ensure patient education on condition management and medication compliance.\n"
-        fallback += f"3. Coordinate with primary care provider for ongoing care management."
-        return fallback
+        if not use_fallback:
+            raise
+        return _fallback_recommendations(episode)
+
+
+async def agenerate_next_best_action(episode: PatientEpisode) -> str:
+    """
+    Async variant of generate_next_best_action.
+    
+    Falls back to the standard recommendations if the call fails or takes
+    longer than LLM_TIMEOUT_SECONDS.
+    """
+    llm = get_llm()
+    
+    try:
+        return await asyncio.wait_for(
+            ainvoke_cached(llm, _build_prompt(), _prompt_inputs(episode)),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        return _fallback_recommendations(episode)
+
+
+async def astream_next_best_action(episode: PatientEpisode):
+    """
+    Streaming variant of generate_next_best_action; yields text chunks as they arrive.
+    """
+    chunks = astream_cached(get_llm(), _build_prompt(), _prompt_inputs(episode), fallback=lambda: _fallback_recommendations(episode))
+    async for chunk in chunks:
+        yield chunk
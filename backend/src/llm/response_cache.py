@@ -0,0 +1,137 @@
+"""
+Persistent, content-addressed cache of LLM completions.
+
+Entries are keyed on a hash of the model, temperature and fully rendered
+prompt messages (which embed the episode context), so an unchanged episode
+regenerated with an unchanged template never calls the model again. Entries
+live in a small SQLite file and are evicted least-recently-used once the
+configured entry cap is exceeded. Hits record their use time in memory; the
+times are written back in one batch every TOUCH_FLUSH_SECONDS, and always
+before an eviction, so a hit never pays for a write and commit.
+
+The methods block on SQLite; async callers run them in a worker thread.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional, Sequence
+from ..config import settings
+
+TOUCH_FLUSH_SECONDS = 30
+
+
+def make_key(model: str, temperature: float, messages: Sequence) -> str:
+    """Hash the parameters that determine a completion"""
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[message.type, message.content] for message in messages],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed LRU cache of completion text plus its token usage"""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._touched: "dict[str, float]" = {}  # key -> last use time not yet written
+        self._touches_flushed_at = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+                " completion_tokens INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " last_used_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used_at ON llm_responses (last_used_at)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response, prompt_tokens, completion_tokens FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._touched[key] = time.time()
+            if time.monotonic() - self._touches_flushed_at > TOUCH_FLUSH_SECONDS:
+                self._flush_touches(conn)
+                conn.commit()
+            self.hits += 1
+            self.saved_prompt_tokens += row[1]
+            self.saved_completion_tokens += row[2]
+            return row[0]
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        # Caller holds the lock and commits
+        if self._touched:
+            conn.executemany(
+                "UPDATE llm_responses SET last_used_at = ? WHERE key = ?",
+                [(used_at, key) for key, used_at in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touches_flushed_at = time.monotonic()
+
+    def put(self, key: str, response: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        with self._lock:
+            conn = self._connection()
+            self._flush_touches(conn)
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, response, prompt_tokens, completion_tokens, now, now),
+            )
+            # Evict least recently used entries beyond the cap
+            conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                " SELECT key FROM llm_responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._connection().execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.LLM_CACHE_ENABLED,
+                "entries": entries,
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "savedPromptTokens": self.saved_prompt_tokens,
+                "savedCompletionTokens": self.saved_completion_tokens,
+            }
+
+
+llm_response_cache = LLMResponseCache(settings.LLM_CACHE_PATH, settings.LLM_CACHE_MAX_ENTRIES)
@@ -1,31 +1,13 @@
+import asyncio
+from functools import lru_cache
 from langchain.prompts import ChatPromptTemplate
+from ..config import settings
 from ..models.db_models import PatientEpisode
-from .llm_utils import get_llm, format_episode_context
+from .llm_utils import get_llm, format_episode_context, invoke_cached, ainvoke_cached, astream_cached
 
 
-def generate_risk_explanation(episode: PatientEpisode) -> str:
-    """
-    Generate an explanation for why a patient is at risk of 30-day readmission.
-    
-    Args:
-        episode: PatientEpisode database model instance
-        
-    Returns:
-        AI-generated risk explanation string
-    """
-    llm = get_llm()
-    
-    context = format_episode_context(episode)
-    
-    # Determine risk level
-    risk_score = episode.readmission_risk_score or 0
-    if risk_score >= 0.7:
-        risk_level = "High"
-    elif risk_score >= 0.4:
-        risk_level = "Medium"
-    else:
-        risk_level = "Low"
-    
+@lru_cache(maxsize=None)
+def _build_prompt() -> ChatPromptTemplate:
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a healthcare analytics assistant specializing in readmission risk assessment. Use a professional, clinical tone suitable for healthcare professionals."),
         ("human", """Explain why this patient is at risk of 30-day readmission. The patient has a {risk_level} risk level (risk score: {risk_score}).
@@ -45,15 +27,66 @@ Patient Episode Data:
 Risk Explanation:""")
     ])
     
-    chain = prompt | llm
+    return prompt
+
+
+def _prompt_inputs(episode: PatientEpisode) -> dict:
+    return {
+        "context": format_episode_context(episode),
+        "risk_level": episode.risk_level,
+        "risk_score": f"{episode.readmission_risk_score or 0:.2f}",
+    }
+
+
+def _fallback_explanation(episode: PatientEpisode) -> str:
+    # Fallback explanation if the AI call fails
+    risk_score = episode.readmission_risk_score or 0
+    return f"This patient has a {episode.risk_level} readmission risk (score: {risk_score:.2f}) based on their {episode.primary_diagnosis} diagnosis, length of stay, and clinical characteristics. Close monitoring and follow-up care are recommended to prevent readmission."
+
+
+def generate_risk_explanation(episode: PatientEpisode, use_fallback: bool = True) -> str:
+    """
+    Generate an explanation for why a patient is at risk of 30-day readmission.
+    
+    Args:
+        episode: PatientEpisode database model instance
+        use_fallback: Return a generic explanation instead of raising if the AI call fails
+        
+    Returns:
+        AI-generated risk explanation string
+    """
+    llm = get_llm()
+    
+    try:
+        return invoke_cached(llm, _build_prompt(), _prompt_inputs(episode))
+    except Exception as e:
+        if not use_fallback:
+            raise
+        return _fallback_explanation(episode)
+
+
+async def agenerate_risk_explanation(episode: PatientEpisode) -> str:
+    """
+    Async variant of generate_risk_explanation.
+    
+    Falls back to the generic explanation if the call fails or takes longer
+    than LLM_TIMEOUT_SECONDS.
+    """
+    llm = get_llm()
     
     try:
-        response = chain.invoke({
-            "context": context,
-            "risk_level": risk_level,
-            "risk_score": f"{risk_score:.2f}"
-        })
-        return response.content.strip()
+        return await asyncio.wait_for(
+            ainvoke_cached(llm, _build_prompt(), _prompt_inputs(episode)),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
     except Exception as e:
-        # Fallback explanation if AI call fails
-        return f"This patient has a {risk_level} readmission risk (score: {risk_score:.2f}) based on their {episode.primary_diagnosis} diagnosis, length of stay, and clinical characteristics. Close monitoring and follow-up care are recommended to prevent readmission."
+        return _fallback_explanation(episode)
+
+
+async def astream_risk_explanation(episode: PatientEpisode):
+    """
+    Streaming variant of generate_risk_explanation; yields text chunks as they arrive.
+    """
+    chunks = astream_cached(get_llm(), _build_prompt(), _prompt_inputs(episode), fallback=lambda: _fallback_explanation(episode))
+    async for chunk in chunks:
+        yield chunk
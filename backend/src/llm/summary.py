@@ -1,22 +1,13 @@
+import asyncio
+from functools import lru_cache
 from langchain.prompts import ChatPromptTemplate
+from ..config import settings
 from ..models.db_models import PatientEpisode
-from .llm_utils import get_llm, format_episode_context
+from .llm_utils import get_llm, format_episode_context, invoke_cached, ainvoke_cached, astream_cached
 
 
-def generate_episode_summary(episode: PatientEpisode) -> str:
-    """
-    Generate a concise patient episode summary using AI.
-    
-    Args:
-        episode: PatientEpisode database model instance
-        
-    Returns:
-        AI-generated summary string
-    """
-    llm = get_llm()
-    
-    context = format_episode_context(episode)
-    
+@lru_cache(maxsize=None)
+def _build_prompt() -> ChatPromptTemplate:
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a healthcare analytics assistant. Your role is to provide clear, concise summaries of patient episodes for healthcare professionals."),
         ("human", """Summarize the following patient case. Include:
@@ -31,11 +22,57 @@ Patient Episode Data:
 {context}""")
     ])
     
-    chain = prompt | llm
+    return prompt
+
+
+def _fallback_summary(episode: PatientEpisode) -> str:
+    # Basic summary used if the AI call fails
+    return f"{episode.patient_name} was admitted to {episode.unit} with {episode.primary_diagnosis}. Length of stay: {episode.length_of_stay or 'Ongoing'} days."
+
+
+def generate_episode_summary(episode: PatientEpisode, use_fallback: bool = True) -> str:
+    """
+    Generate a concise patient episode summary using AI.
+    
+    Args:
+        episode: PatientEpisode database model instance
+        use_fallback: Return a basic summary instead of raising if the AI call fails
+        
+    Returns:
+        AI-generated summary string
+    """
+    llm = get_llm()
     
     try:
-        response = chain.invoke({"context": context})
-        return response.content.strip()
+        return invoke_cached(llm, _build_prompt(), {"context": format_episode_context(episode)})
     except Exception as e:
-        # Fallback to a basic summary if AI call fails
-        return f"{episode.patient_name} was admitted to {episode.unit} with {episode.primary_diagnosis}. Length of stay: {episode.length_of_stay or 'Ongoing'} days."
+        if not use_fallback:
+            raise
+        return _fallback_summary(episode)
+
+
+async def agenerate_episode_summary(episode: PatientEpisode) -> str:
+    """
+    Async variant of generate_episode_summary.
+    
+    Falls back to the basic summary if the call fails or takes longer than
+    LLM_TIMEOUT_SECONDS, so it never delays concurrent generations.
+    """
+    llm = get_llm()
+    
+    try:
+        return await asyncio.wait_for(
+            ainvoke_cached(llm, _build_prompt(), {"context": format_episode_context(episode)}),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        return _fallback_summary(episode)
+
+
+async def astream_episode_summary(episode: PatientEpisode):
+    """
+    Streaming variant of generate_episode_summary; yields text chunks as they arrive.
+    """
+    chunks = astream_cached(get_llm(), _build_prompt(), {"context": format_episode_context(episode)}, fallback=lambda: _fallback_summary(episode))
+    async for chunk in chunks:
+        yield chunk
@@ -1,12 +1,23 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from ..db import Base
+from ..utils.risk import risk_level_for_score
 from datetime import datetime
 
 
 class PatientEpisode(Base):
     __tablename__ = "patient_episodes"
+    __table_args__ = (
+        # /readmissions/list and /readmissions/high-risk: risk ordering, keyset cursor and band filters
+        Index("ix_patient_episodes_risk_score_id", "readmission_risk_score", "id"),
+        Index("ix_patient_episodes_unit_risk_score", "unit", "readmission_risk_score"),
+        Index("ix_patient_episodes_risk_level_score", "risk_level", "readmission_risk_score", "id"),
+        Index("ix_patient_episodes_unit_risk_level_score", "unit", "risk_level", "readmission_risk_score"),
+        Index("ix_patient_episodes_diagnosis_risk_score", "primary_diagnosis", "readmission_risk_score"),
+        # Admission date range filter and rollup refresh by day
+        Index("ix_patient_episodes_admit_date", "admit_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(String, unique=True, index=True, nullable=False)
@@ -19,6 +30,8 @@ class PatientEpisode(Base):
     primary_diagnosis = Column(String, nullable=False)
     readmitted_30d = Column(Boolean, default=False)
     readmission_risk_score = Column(Float, nullable=True)
+    # Band derived from readmission_risk_score (Low, Medium, High), kept in sync by _sync_risk_level
+    risk_level = Column(String, nullable=False, default="Low", server_default="Low")
     summary = Column(Text, nullable=True)  # Legacy field, kept for backward compatibility
     risk_explanation = Column(Text, nullable=True)  # Legacy field
     next_best_action = Column(Text, nullable=True)  # Legacy field
@@ -26,14 +39,24 @@ class PatientEpisode(Base):
     summary_text = Column(Text, nullable=True)  # AI-generated summary
     recommendations = Column(Text, nullable=True)  # AI-generated recommendations (alternative to next_best_action)
     ai_generated_at = Column(DateTime, nullable=True)  # Timestamp when AI content was generated
+    row_hash = Column(String, nullable=True)  # Hash of the loaded extract columns (etl/bulk_load.py)
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationships
     safety_incidents = relationship("SafetyIncident", back_populates="episode", cascade="all, delete-orphan")
 
+    @validates("readmission_risk_score")
+    def _sync_risk_level(self, key, score):
+        self.risk_level = risk_level_for_score(score)
+        return score
+
 
 class SafetyIncident(Base):
     __tablename__ = "safety_incidents"
+    __table_args__ = (
+        # /quality/incidents ordering and rollup refresh by day
+        Index("ix_safety_incidents_date_category", "date", "category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     incident_id = Column(String, unique=True, index=True, nullable=False)
@@ -44,6 +67,7 @@ class SafetyIncident(Base):
     severity = Column(String, nullable=False)  # Low, Medium, High, Critical
     status = Column(String, nullable=False)
     description = Column(Text, nullable=False)
+    row_hash = Column(String, nullable=True)  # Hash of the loaded extract columns (etl/bulk_load.py)
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationships
@@ -52,6 +76,10 @@ class SafetyIncident(Base):
 
 class DataQualityIssue(Base):
     __tablename__ = "data_quality_issues"
+    __table_args__ = (
+        # Rollup refresh by day
+        Index("ix_data_quality_issues_last_updated", "last_updated"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     record_type = Column(String, nullable=False)  # episode, patient, etc.
@@ -62,4 +90,110 @@ class DataQualityIssue(Base):
     severity = Column(String, nullable=False)  # Low, Medium, High
     description = Column(Text, nullable=False)
     last_updated = Column(DateTime, nullable=False, server_default=func.now())
+    # record_type:record_id:field:issue_type, set by the ETL loaders and used as the upsert key
+    issue_key = Column(String, unique=True, index=True, nullable=True)
+    row_hash = Column(String, nullable=True)  # Hash of the loaded extract columns (etl/bulk_load.py)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class InsightJob(Base):
+    __tablename__ = "insight_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    worker_id = Column(String, nullable=True)  # host:pid:boot of the process running the job
+    # Cohort filter
+    unit = Column(String, nullable=True)
+    risk_level = Column(String, nullable=True)
+    missing_only = Column(Boolean, nullable=False, default=False)  # Only episodes without ai_generated_at
+    # Progress; last_episode_pk is the checkpoint a resumed job continues after
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    last_episode_pk = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+# Progress of a chunked file load (etl/stream_load.py), committed with each chunk
+class IngestCheckpoint(Base):
+    __tablename__ = "ingest_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # episodes, incidents, data_quality
+    source = Column(String, nullable=False)  # Absolute path of the extract
+    fingerprint = Column(String, nullable=False)  # File size and mtime; a changed file starts over
+    chunk_size = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="running")  # running, completed, failed
+    chunks_committed = Column(Integer, nullable=False, default=0)
+    rows_read = Column(Integer, nullable=False, default=0)
+    rows_written = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    # Day range touched so far; its KPI rollups are refreshed when the load completes
+    min_day = Column(Date, nullable=True)
+    max_day = Column(Date, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_ingest_checkpoints_source", "kind", "source", "fingerprint", "chunk_size"),
+    )
+
+
+# High-water mark of an incremental load source (etl/incremental_load.py)
+class EtlWatermark(Base):
+    __tablename__ = "etl_watermarks"
+
+    source = Column(String, primary_key=True)  # Feed name, defaults to the extract kind
+    kind = Column(String, nullable=False)  # episodes, incidents, data_quality
+    # Latest change timestamp loaded; rows at or before it are skipped next time
+    high_water_mark = Column(DateTime, nullable=True)
+    rows_inserted = Column(Integer, nullable=False, default=0)  # Counts of the last run
+    rows_updated = Column(Integer, nullable=False, default=0)
+    rows_unchanged = Column(Integer, nullable=False, default=0)
+    last_run_at = Column(DateTime, nullable=True)
+
+
+# KPI rollups, maintained by analytics/rollups.py. Each row aggregates the source
+# rows sharing the same key so dashboard reads never scan the raw tables.
+class EpisodeDailyRollup(Base):
+    __tablename__ = "episode_daily_rollups"
+    __table_args__ = (
+        Index("ix_episode_daily_rollups_day", "day"),
+    )
+
+    unit = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)  # Admission day
+    risk_level = Column(String, primary_key=True)  # Low, Medium, High
+    episodes = Column(Integer, nullable=False, default=0)
+    discharged = Column(Integer, nullable=False, default=0)
+    discharged_readmitted = Column(Integer, nullable=False, default=0)
+    readmitted = Column(Integer, nullable=False, default=0)
+    los_sum = Column(Float, nullable=False, default=0)
+    los_count = Column(Integer, nullable=False, default=0)
+
+
+class IncidentDailyRollup(Base):
+    __tablename__ = "incident_daily_rollups"
+    __table_args__ = (
+        Index("ix_incident_daily_rollups_day", "day"),
+    )
+
+    unit = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)  # Incident day
+    category = Column(String, primary_key=True)
+    incidents = Column(Integer, nullable=False, default=0)
+
+
+class DataQualityDailyRollup(Base):
+    __tablename__ = "data_quality_daily_rollups"
+
+    unit = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)  # Last updated day
+    issue_type = Column(String, primary_key=True)
+    severity = Column(String, primary_key=True)
+    issues = Column(Integer, nullable=False, default=0)
@@ -81,3 +81,10 @@ class DataQualityMetrics(BaseModel):
 class ReadmissionRiskRecord(BaseModel):
     episode: PatientEpisode
     risk_level: str
+
+
+# Request Schemas
+class InsightJobCreate(BaseModel):
+    unit: Optional[str] = None
+    risk_level: Optional[str] = None
+    missing_only: bool = Field(False, description="Only episodes without AI-generated content")
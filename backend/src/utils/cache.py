@@ -0,0 +1,165 @@
+"""
+In-process LRU + TTL cache for computed dashboard responses.
+
+Entries are dropped when they expire, when the cache is full (least recently
+used first), or all at once when a transaction that changed patient episodes,
+safety incidents or data quality issues commits. Loaders that write through
+Core statements instead of the ORM call invalidate_caches() themselves.
+
+aggregate_version only moves when a change can alter the dashboard aggregates,
+i.e. not for narrative-only writes such as AI write-backs. The in-memory column
+store keys its rebuilds on it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config import settings
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None):
+        """Store a value; with a version (invalidations read before computing it), skip it if a clear happened since"""
+        with self._lock:
+            if version is not None and version != self.invalidations:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key: one caller computes, the others wait for its result"""
+
+    def __init__(self):
+        self._calls: "dict[Hashable, Future]" = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return call.result()
+
+        try:
+            call.set_result(compute())
+        except BaseException as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return call.result()
+
+
+class VersionCounter:
+    """Thread-safe counter bumped on every change of the data it stands for"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+
+response_cache = TTLCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+# Identical cache misses in flight at the same time share one computation
+response_flights = SingleFlight()
+aggregate_version = VersionCounter()
+
+
+def invalidate_caches(aggregates: bool = True):
+    """
+    Drop every cached response (call after committing data changes).
+
+    Args:
+        aggregates: Whether the change can alter the aggregates (False for narrative-only writes)
+    """
+    response_cache.clear()
+    if aggregates:
+        aggregate_version.bump()
+
+
+# ==================== Invalidation on commit ====================
+
+_INVALIDATING_TABLES = {"patient_episodes", "safety_incidents", "data_quality_issues"}
+
+
+def _touches_source_tables(objects) -> bool:
+    return any(getattr(obj, "__tablename__", None) in _INVALIDATING_TABLES for obj in objects)
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_dirty(session: Session, flush_context, instances):
+    if _touches_source_tables(list(session.new) + list(session.dirty) + list(session.deleted)):
+        session.info["invalidate_caches"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session):
+    # "aggregates_changed" is set by the rollup listeners (analytics/rollups.py),
+    # which already skip changes to columns no aggregate reads
+    aggregates = session.info.pop("aggregates_changed", False)
+    if session.info.pop("invalidate_caches", False):
+        invalidate_caches(aggregates=aggregates)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    session.info.pop("invalidate_caches", None)
+    session.info.pop("aggregates_changed", None)
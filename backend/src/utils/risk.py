@@ -0,0 +1,37 @@
+from typing import Optional
+import numpy as np
+from sqlalchemy import case
+
+# Readmission risk score thresholds for the High / Medium bands
+HIGH_RISK_THRESHOLD = 0.7
+MEDIUM_RISK_THRESHOLD = 0.4
+
+RISK_LEVELS = ("Low", "Medium", "High")
+
+
+def risk_level_for_score(score: Optional[float]) -> str:
+    """Map a readmission risk score to its band (missing scores count as Low)"""
+    if score is not None and score >= HIGH_RISK_THRESHOLD:
+        return "High"
+    elif score is not None and score >= MEDIUM_RISK_THRESHOLD:
+        return "Medium"
+    return "Low"
+
+
+def risk_levels_for_scores(scores) -> np.ndarray:
+    """Vectorized risk_level_for_score for arrays and pandas Series (NaN counts as Low)"""
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [scores >= HIGH_RISK_THRESHOLD, scores >= MEDIUM_RISK_THRESHOLD],
+        ["High", "Medium"],
+        default="Low",
+    )
+
+
+def risk_level_expression(score_column):
+    """SQL equivalent of risk_level_for_score, for set-based backfills"""
+    return case(
+        (score_column >= HIGH_RISK_THRESHOLD, "High"),
+        (score_column >= MEDIUM_RISK_THRESHOLD, "Medium"),
+        else_="Low",
+    )
@@ -0,0 +1,7 @@
+"""Point the app at a throwaway SQLite database before anything under ``src`` creates the engine."""
+import os
+import tempfile
+
+_directory = tempfile.mkdtemp(prefix="healthsight-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directory, 'test.db')}"
+os.environ["LLM_CACHE_PATH"] = os.path.join(_directory, "llm_cache.db")
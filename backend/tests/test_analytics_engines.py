@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, insert
+
+from src.analytics import columnar, kpis
+from src.analytics.rollups import rebuild_rollups
+from src.db import SessionLocal, engine, init_db
+from src.models.db_models import DataQualityIssue, PatientEpisode, SafetyIncident
+
+CUTOFF = datetime(2024, 3, 10, 12, 0)
+
+
+def _episode(n: int, admitted: datetime, **values) -> dict:
+    return {
+        "episode_id": f"ENG{n:06d}", "patient_id": f"PT{n:05d}", "patient_name": "Test Patient",
+        "unit": "Cardiology", "admit_date": admitted, "primary_diagnosis": "Heart Failure",
+        "risk_level": "Low", **values,
+    }
+
+
+def _incident(n: int, occurred: datetime, category: str) -> dict:
+    return {
+        "incident_id": f"INC{n:06d}", "date": occurred, "unit": "Cardiology", "category": category,
+        "severity": "Low", "status": "Open", "description": "Test incident",
+    }
+
+
+def _issue(n: int, unit: str, issue_type: str, severity: str) -> dict:
+    return {
+        "record_type": "episode", "record_id": f"ENG{n:06d}", "unit": unit, "issue_type": issue_type,
+        "field": "LOS", "severity": severity, "description": "Test issue", "last_updated": CUTOFF,
+    }
+
+
+@pytest.fixture(autouse=True)
+def dataset(monkeypatch):
+    init_db()
+    discharged = {"discharge_date": datetime(2024, 3, 20), "length_of_stay": 4.0}
+    with engine.begin() as conn:
+        for model in (SafetyIncident, DataQualityIssue, PatientEpisode):
+            conn.execute(delete(model))
+        conn.execute(insert(PatientEpisode), [
+            _episode(1, datetime(2024, 2, 20, 9), risk_level="High", readmitted_30d=True, **discharged),
+            # Same day as the cutoff but before it: outside the window
+            _episode(2, datetime(2024, 3, 10, 8), risk_level="Medium", readmitted_30d=True),
+            _episode(3, datetime(2024, 3, 10, 14), readmitted_30d=False, **discharged),
+            _episode(4, datetime(2024, 3, 15, 10), risk_level="High", readmitted_30d=True, **discharged),
+        ])
+        conn.execute(insert(SafetyIncident), [
+            _incident(1, datetime(2024, 3, 10, 8), "Fall"),
+            _incident(2, datetime(2024, 3, 10, 9), "Infection"),
+            _incident(3, datetime(2024, 3, 10, 15), "Infection"),
+            _incident(4, datetime(2024, 3, 12, 10), "Medication Error"),
+        ])
+        conn.execute(insert(DataQualityIssue), [
+            _issue(1, "Cardiology", "Missing", "High"),
+            _issue(2, "Cardiology", "Invalid", "Low"),
+            _issue(3, "Oncology", "Stale", "Medium"),
+        ])
+        rebuild_rollups(conn)
+    # Rebuild the column store on every query
+    monkeypatch.setattr(columnar, "column_store", columnar.ColumnStore(max_age=0))
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+def test_incident_kpis_match_and_use_the_exact_cutoff(dataset):
+    sql, column = kpis.incident_kpis(dataset, CUTOFF), columnar.incident_kpis(dataset, CUTOFF)
+
+    assert sql == column
+    assert sql["by_category"] == {"Infection": 1, "Medication Error": 1}
+
+
+def test_monthly_trends_match_and_use_the_exact_cutoff(dataset):
+    sql, column = kpis.monthly_trends(dataset, CUTOFF), columnar.monthly_trends(dataset, CUTOFF)
+
+    assert [tuple(row) for row in sql] == column
+    assert column == [("2024-03", 2, 1)]
+
+
+def test_episode_kpis_match(dataset):
+    sql, column = kpis.episode_kpis(dataset), columnar.episode_kpis(dataset)
+
+    assert column == {**sql, "avg_los": pytest.approx(sql["avg_los"])}
+
+
+def test_data_quality_kpis_match(dataset):
+    sql, column = kpis.data_quality_kpis(dataset), columnar.data_quality_kpis(dataset)
+
+    by_name = lambda result: sorted(result["by_unit"], key=lambda unit: unit["name"])
+    assert by_name(sql) == by_name(column)
+    assert {**sql, "by_unit": None} == {**column, "by_unit": None}
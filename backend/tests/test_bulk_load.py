@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+from sqlalchemy import select, update
+
+from src.db import engine, init_db
+from src.etl.bulk_load import insert_frame, prepare_episodes
+from src.models.db_models import PatientEpisode
+
+EPISODE = {
+    "episode_id": "EPT000001",
+    "patient_id": "PT00001",
+    "patient_name": "Test Patient",
+    "unit": "Cardiology",
+    "admit_date": "2024-03-01T08:00:00",
+    "primary_diagnosis": "Heart Failure",
+}
+
+
+@pytest.fixture(autouse=True)
+def clean_episodes():
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(PatientEpisode.__table__.delete())
+    yield
+
+
+def _load(rows: list):
+    with engine.begin() as conn:
+        insert_frame(conn, PatientEpisode, prepare_episodes(pd.DataFrame(rows, dtype=str)), key="episode_id")
+
+
+def _stored(*columns):
+    with engine.connect() as conn:
+        return conn.execute(select(*columns).where(PatientEpisode.episode_id == EPISODE["episode_id"])).one()
+
+
+def test_reload_without_optional_columns_keeps_enriched_values():
+    _load([{
+        **EPISODE,
+        "discharge_date": "2024-03-05T08:00:00",
+        "readmitted_30d": "true",
+        "readmission_risk_score": "0.8",
+        "summary": "Extract summary",
+        "risk_explanation": "Extract explanation",
+        "next_best_action": "Extract action",
+    }])
+    # AI write-back
+    with engine.begin() as conn:
+        conn.execute(
+            update(PatientEpisode)
+            .where(PatientEpisode.episode_id == EPISODE["episode_id"])
+            .values(risk_explanation="AI explanation", summary_text="AI summary", recommendations="AI action")
+        )
+
+    _load([{**EPISODE, "unit": "Oncology"}])
+
+    row = _stored(
+        PatientEpisode.unit, PatientEpisode.discharge_date, PatientEpisode.readmitted_30d,
+        PatientEpisode.readmission_risk_score, PatientEpisode.risk_level, PatientEpisode.summary,
+        PatientEpisode.risk_explanation, PatientEpisode.next_best_action,
+        PatientEpisode.summary_text, PatientEpisode.recommendations,
+    )
+    assert row.unit == "Oncology"
+    assert row.discharge_date is not None
+    assert row.readmitted_30d is True
+    assert row.readmission_risk_score == 0.8
+    assert row.risk_level == "High"
+    assert row.summary == "Extract summary"
+    assert row.risk_explanation == "AI explanation"
+    assert row.next_best_action == "Extract action"
+    assert row.summary_text == "AI summary"
+    assert row.recommendations == "AI action"
+
+
+def test_reload_with_narrative_columns_does_not_overwrite_them():
+    _load([{**EPISODE, "risk_explanation": "Extract explanation"}])
+    with engine.begin() as conn:
+        conn.execute(
+            update(PatientEpisode)
+            .where(PatientEpisode.episode_id == EPISODE["episode_id"])
+            .values(risk_explanation="AI explanation")
+        )
+
+    _load([{**EPISODE, "risk_explanation": "Newer extract explanation"}])
+
+    assert _stored(PatientEpisode.risk_explanation).risk_explanation == "AI explanation"
+
+
+def test_new_rows_without_readmitted_column_default_to_false():
+    _load([EPISODE])
+
+    assert _stored(PatientEpisode.readmitted_30d).readmitted_30d is False
+
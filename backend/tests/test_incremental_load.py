@@ -0,0 +1,56 @@
+import pandas as pd
+from sqlalchemy import delete
+
+from src.db import engine, init_db
+from src.etl.bulk_load import prepare_data_quality_issues
+from src.etl.incremental_load import incremental_load
+from src.models.db_models import DataQualityIssue, EtlWatermark
+
+ISSUE = {
+    "record_type": "episode", "record_id": "EPT000001", "unit": "Cardiology", "issue_type": "Missing",
+    "field": "LOS", "severity": "High", "description": "Missing length of stay",
+}
+
+
+def _reset():
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(delete(DataQualityIssue))
+        conn.execute(delete(EtlWatermark))
+
+
+def test_row_hash_ignores_defaulted_last_updated():
+    raw = pd.DataFrame([ISSUE], dtype=str)
+
+    first, second = prepare_data_quality_issues(raw), prepare_data_quality_issues(raw)
+
+    assert first["row_hash"].tolist() == second["row_hash"].tolist()
+    assert first["last_updated"].notna().all()
+
+
+def test_rows_without_last_updated_are_not_rewritten(tmp_path):
+    _reset()
+    path = tmp_path / "issues.csv"
+    pd.DataFrame([ISSUE]).to_csv(path, index=False)
+
+    first = incremental_load("data_quality", str(path))
+    second = incremental_load("data_quality", str(path))
+
+    assert first["inserted"] == 1
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (0, 0, 1)
+
+
+def test_rows_at_the_high_water_mark_are_still_loaded(tmp_path):
+    _reset()
+    stamp = "2024-03-01T08:00:00"
+    first_path, second_path = tmp_path / "first.csv", tmp_path / "second.csv"
+    pd.DataFrame([{**ISSUE, "last_updated": stamp}]).to_csv(first_path, index=False)
+    pd.DataFrame([
+        {**ISSUE, "last_updated": stamp},
+        {**ISSUE, "record_id": "EPT000002", "last_updated": stamp},
+    ]).to_csv(second_path, index=False)
+
+    incremental_load("data_quality", str(first_path))
+    stats = incremental_load("data_quality", str(second_path))
+
+    assert (stats["skipped"], stats["inserted"], stats["unchanged"]) == (0, 1, 1)
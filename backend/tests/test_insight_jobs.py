@@ -0,0 +1,98 @@
+import os
+import socket
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, update
+
+from src.config import settings
+from src.db import SessionLocal, engine, init_db
+from src.llm import jobs
+from src.models.db_models import InsightJob, PatientEpisode
+
+UNIT = "Insight Job Test"
+
+
+class Crash(BaseException):
+    """Escapes every handler, like the process dying mid-job"""
+
+
+@pytest.fixture(autouse=True)
+def cohort(monkeypatch):
+    monkeypatch.setattr(settings, "INSIGHT_JOB_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(settings, "INSIGHT_JOB_RETRY_BACKOFF_SECONDS", 0)
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(delete(InsightJob))
+        conn.execute(delete(PatientEpisode).where(PatientEpisode.unit == UNIT))
+    db = SessionLocal()
+    db.add_all(
+        PatientEpisode(
+            episode_id=f"JOB{i:06d}", patient_id=f"PT{i:05d}", patient_name="Test Patient",
+            unit=UNIT, admit_date=datetime(2024, 3, 1, 8), primary_diagnosis="Heart Failure",
+        )
+        for i in range(10)
+    )
+    db.commit()
+    job_id = jobs.create_job(db, unit=UNIT).id
+    db.close()
+    yield job_id
+
+
+def _generators(calls: list, crash_after: int = None):
+    def generate(episode):
+        if crash_after is not None and len(calls) >= crash_after:
+            raise Crash()
+        calls.append(episode.episode_id)
+        return f"stub for {episode.episode_id}"
+    return {field: generate for field in jobs.DEFAULT_GENERATORS}
+
+
+def _job(job_id: int) -> InsightJob:
+    db = SessionLocal()
+    try:
+        return db.get(InsightJob, job_id)
+    finally:
+        db.close()
+
+
+def _interrupt(job_id: int):
+    with pytest.raises(Crash):
+        jobs.run_job(job_id, _generators([], crash_after=9), batch_size=2)
+    job = _job(job_id)
+    assert (job.status, job.processed) == ("running", 2)
+
+
+def test_interrupted_job_resumes_immediately(cohort):
+    _interrupt(cohort)
+
+    calls = []
+    jobs.run_job(cohort, _generators(calls), batch_size=2)
+
+    job = _job(cohort)
+    assert (job.status, job.processed, job.failed) == ("completed", 10, 0)
+    # Episodes committed before the crash are not generated again
+    assert len(calls) == 8 * len(jobs.DEFAULT_GENERATORS)
+
+
+def test_job_of_an_earlier_boot_is_reclaimed(cohort, monkeypatch):
+    _interrupt(cohort)
+    monkeypatch.setattr(jobs, "WORKER_ID", f"{socket.gethostname()}:{os.getpid()}:restarted")
+
+    jobs.run_job(cohort, _generators([]), batch_size=2)
+
+    assert _job(cohort).status == "completed"
+
+
+def test_job_of_a_live_worker_is_left_alone(cohort):
+    live_worker = f"{socket.gethostname()}:{os.getppid()}:other"
+    with engine.begin() as conn:
+        conn.execute(update(InsightJob).where(InsightJob.id == cohort).values(
+            status="running", worker_id=live_worker, updated_at=datetime.now(),
+        ))
+
+    calls = []
+    jobs.run_job(cohort, _generators(calls), batch_size=2)
+
+    job = _job(cohort)
+    assert (job.status, job.worker_id, calls) == ("running", live_worker, [])
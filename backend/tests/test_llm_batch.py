@@ -0,0 +1,110 @@
+import json
+from datetime import datetime
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.config import settings
+from src.llm import batch
+from src.models.db_models import PatientEpisode
+
+
+class RecordingChatModel(FakeListChatModel):
+    """Fake chat model that answers with the given responses in turn and records every prompt"""
+
+    prompts: list = []
+
+    def _call(self, messages, *args, **kwargs):
+        self.prompts.append(messages[-1].content)
+        return super()._call(messages, *args, **kwargs)
+
+
+def _episode(episode_id: str) -> PatientEpisode:
+    return PatientEpisode(
+        episode_id=episode_id, patient_id="PT00001", patient_name="Test Patient", unit="Cardiology",
+        admit_date=datetime(2024, 3, 1, 8), primary_diagnosis="Heart Failure",
+        risk_level="High", readmission_risk_score=0.8,
+    )
+
+
+def _item(episode_id: str, **overrides) -> dict:
+    return {
+        "episode_id": episode_id,
+        "summary": f"Summary of {episode_id}",
+        "risk_explanation": f"Risk of {episode_id}",
+        "recommendations": f"1. Follow up {episode_id}",
+        **overrides,
+    }
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    def use(*responses):
+        model = RecordingChatModel(responses=list(responses))
+        monkeypatch.setattr(batch, "get_llm", lambda: model)
+        return model
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    return use
+
+
+def _fallback(calls: list):
+    def generate(episode):
+        calls.append(episode.episode_id)
+        return {field: f"fallback {field}" for field in batch.INSIGHT_FIELDS}
+    return generate
+
+
+def test_each_episode_gets_its_own_section(llm):
+    episodes = [_episode("EP000001"), _episode("EP000002")]
+    # Out of order and fenced: items are matched by episode_id
+    model = llm("```json\n" + json.dumps([_item("EP000002"), _item("EP000001")]) + "\n```")
+    fallback_calls = []
+
+    results = batch.generate_insights_batch(episodes, fallback=_fallback(fallback_calls))
+
+    assert len(model.prompts) == 1
+    assert "### Episode EP000001" in model.prompts[0] and "### Episode EP000002" in model.prompts[0]
+    assert fallback_calls == []
+    for episode_id in ("EP000001", "EP000002"):
+        assert results[episode_id] == {
+            "summary": f"Summary of {episode_id}",
+            "risk_explanation": f"Risk of {episode_id}",
+            "recommendations": f"1. Follow up {episode_id}",
+        }
+
+
+def test_missing_and_malformed_sections_fall_back_per_episode(llm):
+    episodes = [_episode("EP000001"), _episode("EP000002"), _episode("EP000003")]
+    llm(json.dumps([_item("EP000001"), _item("EP000002", recommendations="")]))
+    fallback_calls = []
+
+    results = batch.generate_insights_batch(episodes, fallback=_fallback(fallback_calls))
+
+    assert fallback_calls == ["EP000002", "EP000003"]
+    assert results["EP000001"]["summary"] == "Summary of EP000001"
+    assert results["EP000002"]["summary"] == results["EP000003"]["summary"] == "fallback summary"
+
+
+def test_unparseable_response_falls_back_for_every_episode(llm):
+    episodes = [_episode("EP000001"), _episode("EP000002")]
+    llm("Sorry, I cannot help with that.")
+    fallback_calls = []
+
+    batch.generate_insights_batch(episodes, fallback=_fallback(fallback_calls))
+
+    assert fallback_calls == ["EP000001", "EP000002"]
+
+
+def test_incomplete_completion_is_not_cached(llm, monkeypatch):
+    episodes = [_episode("EP000101"), _episode("EP000102")]
+    model = llm(json.dumps([_item("EP000101")]), json.dumps([_item("EP000101"), _item("EP000102")]))
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+
+    first = batch.parse_batch_response(batch.invoke_batch(episodes))
+    second = batch.parse_batch_response(batch.invoke_batch(episodes))
+    third = batch.parse_batch_response(batch.invoke_batch(episodes))
+
+    assert set(first) == {"EP000101"}
+    assert set(second) == set(third) == {"EP000101", "EP000102"}
+    # The complete completion is replayed from the cache
+    assert len(model.prompts) == 2
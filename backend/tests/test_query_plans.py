@@ -0,0 +1,110 @@
+"""EXPLAIN QUERY PLAN every query the read endpoints issue; a plain SCAN of a source table fails."""
+import contextlib
+import io
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event
+
+from src.analytics.rollups import rebuild_rollups
+from src.api.main import app
+from src.db import engine, init_db
+from src.etl.load_data import seed_database
+from src.models.db_models import DataQualityIssue, PatientEpisode, SafetyIncident
+from src.utils.cache import invalidate_caches
+
+SOURCE_TABLES = {"patient_episodes", "safety_incidents", "data_quality_issues"}
+
+# Queries that must read every row of a table by design, with the reason
+ALLOWED_SCANS = {
+    # Lists every issue, ordered by a severity rank expression no index can serve
+    ("/data-quality/issues", "data_quality_issues"),
+    ("/pages/data-quality", "data_quality_issues"),
+}
+
+REQUESTS = [
+    "/overview-metrics",
+    "/risk-distribution",
+    "/health-trends",
+    "/quality/incidents/summary",
+    "/data-quality/metrics",
+    "/readmissions/list",
+    "/readmissions/list?unit=Cardiology",
+    "/readmissions/list?risk_level=High",
+    "/readmissions/list?unit=Cardiology&risk_level=Medium",
+    "/readmissions/list?diagnosis=Stroke",
+    "/readmissions/list?admitted_from=2024-01-01&admitted_to=2024-02-01",
+    "/readmissions/high-risk",
+    "/readmissions/EP000001",
+    "/quality/incidents",
+    "/data-quality/issues",
+    "/pages/overview",
+    "/pages/quality-safety",
+    "/pages/data-quality",
+]
+
+SCAN_PATTERN = re.compile(r"^SCAN (\w+)(?! USING (?:COVERING )?INDEX)")
+
+
+@pytest.fixture(scope="module")
+def client():
+    init_db()
+    with engine.begin() as conn:
+        for model in (SafetyIncident, DataQualityIssue, PatientEpisode):
+            conn.execute(delete(model))
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database()
+    rebuild_rollups()
+    # Every request must reach the database, not the response cache
+    invalidate_caches()
+    return TestClient(app)
+
+
+def _statements(client: TestClient, path: str):
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    assert response.status_code == 200, response.text
+    return response, statements
+
+
+def _full_scans(statement, parameters):
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [
+        match.group(1)
+        for match in (SCAN_PATTERN.match(row[-1]) for row in plan)
+        if match and match.group(1) in SOURCE_TABLES
+    ]
+
+
+def _assert_no_full_scans(client: TestClient, path: str):
+    _, statements = _statements(client, path)
+    endpoint = path.split("?")[0]
+    scans = [
+        f"{table}: {' '.join(statement.split())}"
+        for statement, parameters in statements
+        for table in _full_scans(statement, parameters)
+        if (endpoint, table) not in ALLOWED_SCANS
+    ]
+    assert not scans, f"full table scans in {path}:\n" + "\n".join(scans)
+
+
+@pytest.mark.parametrize("path", REQUESTS)
+def test_endpoint_queries_use_indexes(client, path):
+    _assert_no_full_scans(client, path)
+
+
+def test_next_page_query_uses_indexes(client):
+    first_page, _ = _statements(client, "/readmissions/list?limit=5")
+
+    _assert_no_full_scans(client, f"/readmissions/list?limit=5&cursor={first_page.headers['x-next-cursor']}")
@@ -4,11 +4,7 @@ import KpiCard from '@/components/common/KpiCard'
 import SectionCard from '@/components/common/SectionCard'
 import DataTable, { Column } from '@/components/common/DataTable'
 import BarChart from '@/components/charts/BarChart'
-import {
-  fetchDataQualityMetrics,
-  fetchDataQualityRecords,
-  fetchDataQualityByUnit,
-} from '@/services/apiClient'
+import { fetchDataQualityPage } from '@/services/apiClient'
 import { KPIMetric, DataQualityIssue, ChartDataPoint } from '@/types'
 import { format } from 'date-fns'
 
@@ -22,17 +18,13 @@ export default function DataQualityPage() {
     const loadData = async () => {
       setLoading(true)
       try {
-        const [kpiData, issueData, unitDataResult] = await Promise.all([
-          fetchDataQualityMetrics(),
-          fetchDataQualityRecords(),
-          fetchDataQualityByUnit(),
-        ])
-        setKpis(kpiData)
-        setIssues(issueData.sort((a, b) => {
+        const page = await fetchDataQualityPage()
+        setKpis(page.kpis)
+        setIssues(page.issues.sort((a, b) => {
           const severityOrder = { High: 3, Medium: 2, Low: 1 }
           return severityOrder[b.severity] - severityOrder[a.severity]
         }))
-        setUnitData(unitDataResult)
+        setUnitData(page.byUnit)
       } catch (error) {
         console.error('Error loading data quality data:', error)
       } finally {
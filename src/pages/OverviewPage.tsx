@@ -4,11 +4,7 @@ import KpiCard from '@/components/common/KpiCard'
 import SectionCard from '@/components/common/SectionCard'
 import BarChart from '@/components/charts/BarChart'
 import LineChart from '@/components/charts/LineChart'
-import {
-  fetchOverviewMetrics,
-  fetchRiskDistributionChart,
-  fetchHealthTrendData,
-} from '@/services/apiClient'
+import { fetchOverviewPage } from '@/services/apiClient'
 import { KPIMetric, ChartDataPoint } from '@/types'
 
 export default function OverviewPage() {
@@ -21,14 +17,10 @@ export default function OverviewPage() {
     const loadData = async () => {
       setLoading(true)
       try {
-        const [metricsData, riskData, trendData] = await Promise.all([
-          fetchOverviewMetrics(),
-          fetchRiskDistributionChart(),
-          fetchHealthTrendData(),
-        ])
-        setMetrics(metricsData)
-        setRiskDistribution(riskData)
-        setHealthTrend(trendData)
+        const page = await fetchOverviewPage()
+        setMetrics(page.metrics)
+        setRiskDistribution(page.riskDistribution)
+        setHealthTrend(page.healthTrends)
       } catch (error) {
         console.error('Error loading overview data:', error)
       } finally {
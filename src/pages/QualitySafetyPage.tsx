@@ -4,11 +4,7 @@ import KpiCard from '@/components/common/KpiCard'
 import SectionCard from '@/components/common/SectionCard'
 import DataTable, { Column } from '@/components/common/DataTable'
 import { PieChart, Pie, Cell, ResponsiveContainer, Tooltip, Legend } from 'recharts'
-import {
-  fetchSafetyKPIs,
-  fetchSafetyIncidents,
-  fetchIncidentCategoryData,
-} from '@/services/apiClient'
+import { fetchQualitySafetyPage } from '@/services/apiClient'
 import { KPIMetric, SafetyIncident, ChartDataPoint } from '@/types'
 
 export default function QualitySafetyPage() {
@@ -21,14 +17,10 @@ export default function QualitySafetyPage() {
     const loadData = async () => {
       setLoading(true)
       try {
-        const [kpiData, incidentData, categoryDataResult] = await Promise.all([
-          fetchSafetyKPIs(),
-          fetchSafetyIncidents(),
-          fetchIncidentCategoryData(),
-        ])
-        setKpis(kpiData)
-        setIncidents(incidentData.filter((i) => i.severity === 'High' || i.severity === 'Critical'))
-        setCategoryData(categoryDataResult)
+        const page = await fetchQualitySafetyPage()
+        setKpis(page.kpis)
+        setIncidents(page.incidents)
+        setCategoryData(page.categoryData)
       } catch (error) {
         console.error('Error loading safety data:', error)
       } finally {
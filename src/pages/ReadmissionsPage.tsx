@@ -16,6 +16,8 @@ export default function ReadmissionsPage() {
   const [unitFilter, setUnitFilter] = useState<string>('All')
   const [riskFilter, setRiskFilter] = useState<string>('All')
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [aiLoading, setAiLoading] = useState(false)
   const [aiError, setAiError] = useState<string | null>(null)
 
@@ -25,9 +27,10 @@ export default function ReadmissionsPage() {
       try {
         const unit = unitFilter !== 'All' ? unitFilter : undefined
         const riskLevel = riskFilter !== 'All' ? riskFilter : undefined
-        const data = await fetchReadmissionRisks(unit, riskLevel)
-        setEpisodes(data)
-        setFilteredEpisodes(data)
+        const page = await fetchReadmissionRisks(unit, riskLevel)
+        setEpisodes(page.episodes)
+        setFilteredEpisodes(page.episodes)
+        setNextCursor(page.nextCursor)
       } catch (error) {
         console.error('Error loading readmission data:', error)
       } finally {
@@ -37,6 +40,23 @@ export default function ReadmissionsPage() {
     loadData()
   }, [unitFilter, riskFilter])
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const unit = unitFilter !== 'All' ? unitFilter : undefined
+      const riskLevel = riskFilter !== 'All' ? riskFilter : undefined
+      const page = await fetchReadmissionRisks(unit, riskLevel, nextCursor)
+      setEpisodes((current) => [...current, ...page.episodes])
+      setFilteredEpisodes((current) => [...current, ...page.episodes])
+      setNextCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Error loading more episodes:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleRowClick = async (episode: PatientEpisode) => {
     // Load episode data
     const fullEpisode = await fetchPatientEpisodeById(episode.id)
@@ -150,6 +170,13 @@ export default function ReadmissionsPage() {
               </FormControl>
             </Box>
             <DataTable columns={columns} rows={filteredEpisodes} onRowClick={handleRowClick} />
+            {nextCursor && (
+              <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                <Button variant="outlined" onClick={handleLoadMore} disabled={loadingMore}>
+                  {loadingMore ? <CircularProgress size={20} /> : 'Load more'}
+                </Button>
+              </Box>
+            )}
           </SectionCard>
         </Grid>
       </Grid>
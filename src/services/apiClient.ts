@@ -29,13 +29,16 @@ export const fetchRiskDistribution = async (): Promise<RiskDistribution[]> => {
   }))
 }
 
-export const fetchRiskDistributionChart = async (): Promise<ChartDataPoint[]> => {
-  const res = await api.get('/risk-distribution')
-  return res.data.map((item: { name: string; value: number; color: string }) => ({
+const toRiskChartData = (items: { name: string; value: number; color: string }[]): ChartDataPoint[] =>
+  items.map((item) => ({
     name: item.name,
     value: item.value,
     color: item.color,
   }))
+
+export const fetchRiskDistributionChart = async (): Promise<ChartDataPoint[]> => {
+  const res = await api.get('/risk-distribution')
+  return toRiskChartData(res.data)
 }
 
 export const fetchHealthTrendData = async (): Promise<ChartDataPoint[]> => {
@@ -43,13 +46,24 @@ export const fetchHealthTrendData = async (): Promise<ChartDataPoint[]> => {
   return res.data
 }
 
-export const fetchReadmissionRisks = async (unit?: string, riskLevel?: string): Promise<PatientEpisode[]> => {
+export interface ReadmissionRisksPage {
+  episodes: PatientEpisode[]
+  // Pass back as `cursor` to fetch the next page; null on the last page
+  nextCursor: string | null
+}
+
+export const fetchReadmissionRisks = async (
+  unit?: string,
+  riskLevel?: string,
+  cursor?: string,
+): Promise<ReadmissionRisksPage> => {
   const params: Record<string, string> = {}
   if (unit) params.unit = unit
   if (riskLevel) params.risk_level = riskLevel
+  if (cursor) params.cursor = cursor
   
   const res = await api.get('/readmissions/list', { params })
-  return res.data.map((ep: any) => ({
+  const episodes = res.data.map((ep: any) => ({
     id: ep.id,
     patientId: ep.patientId,
     patientName: ep.patientName,
@@ -63,19 +77,22 @@ export const fetchReadmissionRisks = async (unit?: string, riskLevel?: string):
     riskExplanation: ep.riskExplanation,
     nextBestAction: ep.nextBestAction,
   }))
+  return { episodes, nextCursor: res.headers['x-next-cursor'] ?? null }
 }
 
+const toSafetyIncident = (inc: any): SafetyIncident => ({
+  id: inc.id,
+  date: inc.date,
+  category: inc.category,
+  severity: inc.severity as 'Low' | 'Medium' | 'High' | 'Critical',
+  description: inc.description,
+  unit: inc.unit,
+  status: inc.status,
+})
+
 export const fetchSafetyIncidents = async (): Promise<SafetyIncident[]> => {
   const res = await api.get('/quality/incidents')
-  return res.data.map((inc: any) => ({
-    id: inc.id,
-    date: inc.date,
-    category: inc.category,
-    severity: inc.severity as 'Low' | 'Medium' | 'High' | 'Critical',
-    description: inc.description,
-    unit: inc.unit,
-    status: inc.status,
-  }))
+  return res.data.map(toSafetyIncident)
 }
 
 export const fetchSafetyKPIs = async (): Promise<Record<string, KPIMetric>> => {
@@ -93,18 +110,20 @@ export const fetchDataQualityMetrics = async (): Promise<Record<string, KPIMetri
   return res.data.kpis
 }
 
+const toDataQualityIssue = (iss: any): DataQualityIssue => ({
+  id: iss.id,
+  recordId: iss.recordId,
+  unit: iss.unit,
+  issueType: iss.issueType as 'Invalid' | 'Missing' | 'Duplicate' | 'Stale',
+  field: iss.field,
+  description: iss.description,
+  severity: iss.severity as 'Low' | 'Medium' | 'High',
+  lastUpdated: iss.lastUpdated,
+})
+
 export const fetchDataQualityRecords = async (): Promise<DataQualityIssue[]> => {
   const res = await api.get('/data-quality/issues')
-  return res.data.map((iss: any) => ({
-    id: iss.id,
-    recordId: iss.recordId,
-    unit: iss.unit,
-    issueType: iss.issueType as 'Invalid' | 'Missing' | 'Duplicate' | 'Stale',
-    field: iss.field,
-    description: iss.description,
-    severity: iss.severity as 'Low' | 'Medium' | 'High',
-    lastUpdated: iss.lastUpdated,
-  }))
+  return res.data.map(toDataQualityIssue)
 }
 
 export const fetchDataQualityByUnit = async (): Promise<ChartDataPoint[]> => {
@@ -112,6 +131,53 @@ export const fetchDataQualityByUnit = async (): Promise<ChartDataPoint[]> => {
   return res.data.byUnit
 }
 
+// Page endpoints: every panel of a dashboard page in one request
+
+export interface OverviewPageData {
+  metrics: Record<string, KPIMetric>
+  riskDistribution: ChartDataPoint[]
+  healthTrends: ChartDataPoint[]
+}
+
+export const fetchOverviewPage = async (): Promise<OverviewPageData> => {
+  const res = await api.get('/pages/overview')
+  return {
+    metrics: res.data.metrics,
+    riskDistribution: toRiskChartData(res.data.riskDistribution),
+    healthTrends: res.data.healthTrends,
+  }
+}
+
+export interface QualitySafetyPageData {
+  kpis: Record<string, KPIMetric>
+  categoryData: ChartDataPoint[]
+  incidents: SafetyIncident[] // High and Critical severity only
+}
+
+export const fetchQualitySafetyPage = async (): Promise<QualitySafetyPageData> => {
+  const res = await api.get('/pages/quality-safety')
+  return {
+    kpis: res.data.kpis,
+    categoryData: res.data.categoryData,
+    incidents: res.data.incidents.map(toSafetyIncident),
+  }
+}
+
+export interface DataQualityPageData {
+  kpis: Record<string, KPIMetric>
+  byUnit: ChartDataPoint[]
+  issues: DataQualityIssue[]
+}
+
+export const fetchDataQualityPage = async (): Promise<DataQualityPageData> => {
+  const res = await api.get('/pages/data-quality')
+  return {
+    kpis: res.data.kpis,
+    byUnit: res.data.byUnit,
+    issues: res.data.issues.map(toDataQualityIssue),
+  }
+}
+
 export const fetchPatientEpisodeById = async (id: string): Promise<PatientEpisode | null> => {
   try {
     const res = await api.get(`/readmissions/${id}`)